@@ -0,0 +1,51 @@
+"""Punto de entrada ASGI: `uvicorn asgi:app` o gunicorn con UvicornWorker.
+
+Es solo un cambio de servidor: la misma app Flask de `main` (mismos
+blueprints, handlers síncronos) servida con `a2wsgi.WSGIMiddleware`, que
+corre cada petición en un pool de `ASGI_THREADS` hilos. No es más rápido que
+gunicorn con hilos (`gunicorn -w N --threads M main:app`); sirve para que los
+comandos con uvicorn del Dockerfile y el README funcionen.
+"""
+import asyncio
+import logging
+
+from a2wsgi import WSGIMiddleware
+
+from config import settings
+from main import app as flask_app, db
+from routes import report_jobs_route
+from views.generate_dashboard.generate_dashboard import shutdown_render_pool
+
+logger = logging.getLogger(__name__)
+
+_wsgi = WSGIMiddleware(flask_app, workers=settings.ASGI_THREADS)
+
+
+def _startup() -> None:
+    # si falla, la app arranca igual: el pool reintenta en la primera consulta
+    db.connect()
+    logger.info(f"🚀 API ASGI iniciada ({settings.ASGI_THREADS} hilos)")
+
+
+def _shutdown() -> None:
+    if report_jobs_route._service is not None:
+        report_jobs_route._service.shutdown(wait=False)
+    shutdown_render_pool()
+    db.disconnect()
+    logger.info("API ASGI detenida")
+
+
+async def app(scope, receive, send):
+    if scope["type"] != "lifespan":
+        return await _wsgi(scope, receive, send)
+    # WSGIMiddleware acepta lifespan pero no ejecuta hooks: se atiende aquí
+    while True:
+        message = await receive()
+        loop = asyncio.get_running_loop()
+        if message["type"] == "lifespan.startup":
+            await loop.run_in_executor(_wsgi.executor, _startup)
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            await loop.run_in_executor(_wsgi.executor, _shutdown)
+            await send({"type": "lifespan.shutdown.complete"})
+            return
@@ -0,0 +1,140 @@
+"""Benchmarks de DataAnalysisService.
+
+Compara las versiones fila por fila (apply) con las vectorizadas de
+find_programados_del_dia y get_promedio_tiempo_despacho.
+Uso: python -m benchmarks.bench_data_analysis [filas ...]
+"""
+import sys
+import time
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from services.data_analysis_service import DataAnalysisService
+
+FECHA = date(2025, 10, 1)
+
+
+def _datos(filas: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    fechas = np.array([FECHA, date(2025, 10, 2), None], dtype=object)
+    agencias = np.array([None, "", "SHALOM", "MARVISUR"], dtype=object)
+    motivos = np.array(
+        ["VENTA", "Recojo en planta", "TRASLADO INT. ALMACEN", "CONSIGNACION", None],
+        dtype=object,
+    )
+    return pd.DataFrame({
+        "doc_fec_ent_gr": fechas[rng.integers(0, 3, filas)],
+        "doc_ag_trans": agencias[rng.integers(0, 4, filas)],
+        "doc_mot": motivos[rng.integers(0, 5, filas)],
+    })
+
+
+def _legacy(df: pd.DataFrame, date_programen: date) -> pd.DataFrame:
+    """Implementación anterior (apply por fila)"""
+    df_filter = df[
+        df["doc_fec_ent_gr"].notna() & (df["doc_fec_ent_gr"] == date_programen)
+    ].copy()
+    df_filter["type_doc"] = df_filter["doc_ag_trans"].apply(
+        lambda x: "Agencia" if pd.notna(x) and str(x).strip() != "" else "Lima"
+    )
+    df_lima = df_filter[df_filter["type_doc"] == "Lima"].copy()
+
+    def classify(row):
+        mot = str(row["doc_mot"]).strip().lower()
+        if mot == "recojo en planta":
+            return "Planta"
+        elif mot == "venta":
+            return "Lima"
+        elif mot == "traslado int. almacen":
+            return "Traslado"
+        return "Otros"
+
+    df_lima["type_doc"] = df_lima.apply(classify, axis=1)
+    return df_lima
+
+
+def _datos_despacho(filas: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    condiciones = np.array(
+        [*DataAnalysisService.CONDICIONES_PAGO, "OTRA", None], dtype=object
+    )
+    crea = pd.Timestamp("2025-01-01") + pd.to_timedelta(
+        rng.integers(0, 10**7, filas), unit="s"
+    )
+    salida = crea + pd.to_timedelta(rng.integers(0, 10**6, filas), unit="s")
+    return pd.DataFrame({
+        "doc_fec_crea": crea,
+        "rd_hora_sal": salida.where(rng.random(filas) > 0.1),
+        "doc_con_pag": condiciones[rng.integers(0, len(condiciones), filas)],
+    })
+
+
+def _legacy_promedio(df: pd.DataFrame) -> pd.DataFrame:
+    """Pasos fila por fila de la implementación anterior"""
+    condiciones_map = dict(DataAnalysisService.CONDICIONES_PAGO)
+    df = df.dropna(subset=["rd_hora_sal"]).copy()
+    df["tiempo"] = df["rd_hora_sal"] - df["doc_fec_crea"]
+    df["condicion_categoria"] = df["doc_con_pag"].apply(
+        lambda x: x if x in condiciones_map else "Otros"
+    )
+    df["plazo_hrs"] = df["condicion_categoria"].map(condiciones_map).fillna(0)
+    grouped = df.groupby("condicion_categoria").agg(
+        cantidad_registros=("plazo_hrs", "size"),
+        promedio_plazo_hrs=("plazo_hrs", "mean"),
+        promedio_tiempo_despacho=("tiempo", "mean"),
+    )
+
+    def format_td(x):
+        if pd.isna(x):
+            return "00 Días 00 Hrs 00 Mins"
+        return f"{x.days:02d} Días {x.seconds // 3600:02d} Hrs {(x.seconds % 3600) // 60:02d} Mins"
+
+    grouped["promedio_tiempo_despacho"] = grouped["promedio_tiempo_despacho"].apply(format_td)
+    return grouped
+
+
+def _medir(fn, *args, repeticiones: int = 3) -> float:
+    mejor = float("inf")
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        fn(*args)
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor
+
+
+def main(tamanos) -> None:
+    service = DataAnalysisService()
+    print("find_programados_del_dia")
+    for filas in tamanos:
+        df = _datos(filas)
+        esperado = _legacy(df, FECHA)
+        obtenido = service.find_programados_del_dia(df, FECHA)
+        assert esperado["type_doc"].tolist() == obtenido["type_doc"].tolist()
+
+        t_legacy = _medir(_legacy, df, FECHA)
+        t_nuevo = _medir(service.find_programados_del_dia, df, FECHA)
+        print(
+            f"{filas:>9,} filas | apply: {t_legacy * 1000:9.1f} ms | "
+            f"vectorizado: {t_nuevo * 1000:8.1f} ms | x{t_legacy / t_nuevo:.1f}"
+        )
+
+
+    print("get_promedio_tiempo_despacho")
+    for filas in tamanos:
+        df = _datos_despacho(filas)
+        esperado = _legacy_promedio(df)["promedio_tiempo_despacho"].tolist()
+        obtenido = service.get_promedio_tiempo_despacho(df)
+        assert esperado == obtenido["promedio_tiempo_despacho"].tolist()
+
+        t_legacy = _medir(_legacy_promedio, df)
+        t_nuevo = _medir(service.get_promedio_tiempo_despacho, df)
+        print(
+            f"{filas:>9,} filas | apply: {t_legacy * 1000:9.1f} ms | "
+            f"vectorizado: {t_nuevo * 1000:8.1f} ms | x{t_legacy / t_nuevo:.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main([int(n) for n in sys.argv[1:]] or [100_000, 1_000_000])
@@ -0,0 +1,106 @@
+"""Prueba de carga HTTP para comparar despliegues (p.ej. WSGI vs ASGI).
+
+Lanza `--requests` peticiones con `--concurrency` clientes simultáneos contra
+cada destino y reporta throughput y latencias. Solo usa la biblioteca
+estándar.
+
+Uso (main:app es WSGI: se sirve con gunicorn; uvicorn solo sirve asgi:app):
+    gunicorn -w 1 --threads 16 -b 127.0.0.1:8001 main:app &   # WSGI
+    uvicorn asgi:app --port 8002 &                            # ASGI (a2wsgi, 16 hilos)
+    python -m benchmarks.load_test \\
+        --target wsgi=http://127.0.0.1:8001/report/jobs/noexiste \\
+        --target asgi=http://127.0.0.1:8002/report/jobs/noexiste \\
+        --requests 1000 --concurrency 32
+
+Resultados (1 CPU, Python 3.11, sin MariaDB, 1000 peticiones, 32 clientes;
+dos corridas alternando el orden, se muestra el rango):
+
+    ruta                    servidor   req/s      p95 ms
+    GET /                   wsgi       648-661    68-70
+    GET /                   asgi       413-452    92-95
+    GET /report/jobs/<id>   wsgi       432-447    98-110
+    GET /report/jobs/<id>   asgi       304-324    117-149
+
+`/report/jobs/<id>` consulta el store SQLite de trabajos. Las rutas con
+MariaDB no se midieron aquí. Los handlers son síncronos en ambos casos, así
+que asgi:app no agrega concurrencia: el puente WSGI->ASGI cuesta ~30% de
+throughput frente a gunicorn con hilos.
+"""
+import argparse
+import json
+import statistics
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
+
+
+def _request(url: str, method: str, body: Optional[bytes], timeout: float) -> Tuple[float, int]:
+    req = urllib.request.Request(url, data=body, method=method)
+    if body is not None:
+        req.add_header("Content-Type", "application/json")
+    inicio = time.perf_counter()
+    try:
+        with urllib.request.urlopen(req, timeout=timeout) as response:
+            response.read()
+            status = response.status
+    except urllib.error.HTTPError as e:
+        e.read()
+        status = e.code
+    except Exception:
+        status = 0
+    return time.perf_counter() - inicio, status
+
+
+def _percentil(valores: List[float], p: float) -> float:
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(round(p / 100 * (len(ordenados) - 1))))]
+
+
+def run(url: str, requests: int, concurrency: int, method: str = "GET",
+        body: Optional[bytes] = None, timeout: float = 60) -> dict:
+    # calentamiento: conexiones, cachés y pools del servidor
+    _request(url, method, body, timeout)
+
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        resultados = list(pool.map(lambda _: _request(url, method, body, timeout), range(requests)))
+    total = time.perf_counter() - inicio
+
+    latencias = [lat * 1000 for lat, _ in resultados]
+    estados = [status for _, status in resultados]
+    return {
+        "rps": requests / total,
+        "p50_ms": statistics.median(latencias),
+        "p95_ms": _percentil(latencias, 95),
+        "p99_ms": _percentil(latencias, 99),
+        "errores": sum(1 for s in estados if s == 0 or s >= 500),
+        "estados": {str(s): estados.count(s) for s in sorted(set(estados))},
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--target", action="append", required=True,
+                        help="etiqueta=url (repetible)")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--method", default="GET")
+    parser.add_argument("--json", help="cuerpo JSON para POST")
+    parser.add_argument("--timeout", type=float, default=60)
+    args = parser.parse_args()
+
+    body = json.dumps(json.loads(args.json)).encode() if args.json else None
+    print(f"{'destino':<10} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errores':>8}  estados")
+    for target in args.target:
+        label, _, url = target.partition("=")
+        r = run(url, args.requests, args.concurrency, args.method.upper(), body, args.timeout)
+        print(
+            f"{label:<10} {r['rps']:>9.1f} {r['p50_ms']:>9.1f} {r['p95_ms']:>9.1f} "
+            f"{r['p99_ms']:>9.1f} {r['errores']:>8}  {r['estados']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
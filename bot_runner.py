@@ -3,10 +3,10 @@ import asyncio
 from database.mariadb_connection import MariaDBConnection
 from config import settings
 from stores.telegram_authorization_sql_store import TelegramAuthorizationSqlStore
+from stores.telegram_authorization_cached_store import TelegramAuthorizationCachedStore
 from services.telegram_bot_service import TelegramBotService
-from views.generate_dashboard.generate_dashboard import GenerateDashboard
-from services.documento_query_service import DocumentoQueryService
-from services.data_analysis_service import DataAnalysisService
+from services.report_render_service import ReportRenderService
+from services.report_scheduler import ReportScheduler
 
 
 logging.basicConfig(
@@ -15,42 +15,56 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+def build_report_service(db: MariaDBConnection) -> ReportRenderService:
+    return ReportRenderService(
+        db_connection=db,
+        dashboard_render_workers=settings.DASHBOARD_RENDER_WORKERS,
+    )
+
+
 async def run_bot():
     logger.info("Iniciando Bot de Telegram en modo polling...")
     db = MariaDBConnection()
-    auth_store = TelegramAuthorizationSqlStore(db)
+    auth_store = TelegramAuthorizationCachedStore(
+        TelegramAuthorizationSqlStore(db),
+        ttl=settings.TELEGRAM_AUTH_CACHE_TTL,
+    )
+    report_service = build_report_service(db)
 
     telegram_service = TelegramBotService(
         token=settings.TELEGRAM_BOT_TOKEN,
         admin_id=int(settings.TELEGRAM_ADMIN_ID),
         auth_store=auth_store,
         db_connection=db,
+        concurrent_updates=settings.TELEGRAM_CONCURRENT_UPDATES,
+        report_workers=settings.TELEGRAM_REPORT_WORKERS,
+        reports_per_user=settings.TELEGRAM_REPORTS_PER_USER,
+        report_service=report_service,
     )
 
+    # Pre-cálculo de los reportes del día, en el mismo loop que el bot
+    # (con su propio hilo: no ocupa el pool de reportes de los usuarios)
+    scheduler = ReportScheduler(
+        report_service,
+        times=settings.REPORT_PRECOMPUTE_TIMES,
+    )
+    scheduler.start()
+
     logger.info("Iniciando Bot de Telegram en modo polling...")
-    await telegram_service.run()
+    try:
+        await telegram_service.run()
+    finally:
+        scheduler.stop()
 
 
 async def test_generate_dashboard():
     db = MariaDBConnection()
-    query_service = DocumentoQueryService(db)
-    data_analysis_service = DataAnalysisService()
-    df_response = query_service.get_delivery_documents_by_date_range(
+    build_report_service(db).build_dashboard(
         start_date="2025-01-01",
         end_date="2025-01-15",
+        fecha_programados="2025-01-01",
+        ruta_salida="dashboard_1920x1080.png",
     )
-    promedio_tiempo_despacho = data_analysis_service.get_promedio_tiempo_despacho(
-        df_response
-    )
-    r = GenerateDashboard()
-    r.init(
-        data_tiempo_promedio=promedio_tiempo_despacho,
-        data_exceptions=data_analysis_service.find_exceptions(df_response),
-        data_programados_del_dia=data_analysis_service.find_programados_del_dia(
-            df_response, "2025-01-01"
-        ),
-    )
-
 
 if __name__ == "__main__":
     asyncio.run(test_generate_dashboard())
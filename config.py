@@ -1,5 +1,6 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from typing import Optional
+from datetime import time
+from typing import Dict, List, Optional
 
 class Settings(BaseSettings):
     # Database settings
@@ -8,16 +9,65 @@ class Settings(BaseSettings):
     DB_NAME: str 
     DB_USER: str 
     DB_PASSWORD: str 
+
+    # Connection pool settings
+    DB_POOL_MIN_SIZE: int = 1
+    DB_POOL_MAX_SIZE: int = 10
+    DB_POOL_MAX_IDLE_TIME: float = 300      # segundos ociosa antes de cerrarse
+    DB_POOL_MAX_LIFETIME: float = 3600      # segundos de vida máxima por conexión
+    DB_POOL_HEALTH_CHECK_INTERVAL: float = 30  # ping en checkout si lleva más de N s sin uso
+    DB_POOL_TIMEOUT: float = 30             # espera máxima por una conexión libre
     
+    # Guías: tamaño de bloque (commit por bloque) en actualizaciones masivas
+    GUIA_UPDATE_CHUNK_SIZE: int = 500
+
+    # Clasificación de programados del día: doc_mot -> type_doc (JSON en .env).
+    # Se suma a DataAnalysisService.MOTIVO_TIPO_DOC (y redefine sus claves)
+    MOTIVO_TIPO_DOC: Dict[str, str] = {}
+
+    # Dashboard: procesos para dibujar paneles en paralelo (0 = en serie)
+    DASHBOARD_RENDER_WORKERS: int = 0
+
+    # Horas a las que se pre-calcula la tabla de rutas del día (JSON en .env,
+    # p.ej. ["06:30", "12:00"]; [] = desactivado)
+    REPORT_PRECOMPUTE_TIMES: List[time] = [time(6, 30)]
+
+    # Trabajos de reportes en segundo plano (/report/jobs)
+    REPORT_JOBS_DB_PATH: str = "report_jobs.sqlite3"
+    REPORT_JOB_WORKERS: int = 2
+    # Segundos sin latido tras los que un trabajo `running` vuelve a la cola
+    REPORT_JOB_STALE_AFTER: float = 60
+    # Segundos en caché de las consultas de días pasados. La caché es por
+    # proceso: tras una edición (p.ej. actualizar_guias_varios) los otros
+    # workers de gunicorn y el bot sirven el resultado anterior hasta este TTL
+    QUERY_CACHE_TTL_PASADO: float = 5 * 60
+
+    # Segundos que se conservan los trabajos terminados y sus artefactos
+    REPORT_JOB_RETENTION: float = 24 * 60 * 60
+
     # Telegram Bot settings
     TELEGRAM_BOT_TOKEN: str
     TELEGRAM_CHAT_ID: str
     TELEGRAM_ADMIN_ID: str
+    # Updates atendidos en paralelo por el bot (PTB los procesa en serie por defecto)
+    TELEGRAM_CONCURRENT_UPDATES: int = 32
+    # Hilos para consultas SQL y renders de reportes fuera del event loop
+    TELEGRAM_REPORT_WORKERS: int = 4
+    # Reportes simultáneos por usuario
+    TELEGRAM_REPORTS_PER_USER: int = 1
+    # Segundos entre recargas de la lista de usuarios autorizados
+    TELEGRAM_AUTH_CACHE_TTL: float = 300
 
     # Security settings
     API_KEY_HEADER: str 
     
+    # Respuestas HTTP comprimidas (gzip/br) a partir de este tamaño en bytes
+    HTTP_COMPRESS_MIN_SIZE: int = 1024
+    HTTP_COMPRESS_LEVEL: int = 6
+
     # Application settings
+    # Hilos de a2wsgi que atienden peticiones en el servidor ASGI (asgi.py)
+    ASGI_THREADS: int = 16
     APP_HOST: str
     APP_PORT: int
     DEBUG: bool
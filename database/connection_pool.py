@@ -0,0 +1,233 @@
+import logging
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, Iterator, Optional
+
+from pymysql.constants import SERVER_STATUS
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _PooledConnection:
+    """Conexión administrada por el pool junto con sus marcas de tiempo"""
+
+    connection: Any
+    created_at: float = field(default_factory=time.monotonic)
+    last_used: float = field(default_factory=time.monotonic)
+
+
+class PoolTimeoutError(ConnectionError):
+    """No se liberó ninguna conexión dentro del tiempo de espera"""
+
+
+class ConnectionPool:
+    """Pool de conexiones acotado y thread-safe.
+
+    - ``min_size`` conexiones se mantienen abiertas aunque estén ociosas.
+    - Nunca se abren más de ``max_size`` conexiones a la vez; si todas están
+      en uso, ``acquire`` espera hasta ``timeout`` segundos.
+    - Las conexiones ociosas más de ``max_idle_time`` segundos o con más de
+      ``max_lifetime`` segundos de vida se cierran y se reemplazan.
+    - Al hacer checkout se valida la conexión con ``ping`` si no se usó en
+      los últimos ``health_check_interval`` segundos.
+    """
+
+    def __init__(
+        self,
+        connection_factory: Callable[[], Any],
+        min_size: int = 1,
+        max_size: int = 10,
+        max_idle_time: float = 300,
+        max_lifetime: float = 3600,
+        health_check_interval: float = 30,
+        timeout: float = 30,
+    ):
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError("Se requiere 0 <= min_size <= max_size y max_size >= 1")
+
+        self._factory = connection_factory
+        self.min_size = min_size
+        self.max_size = max_size
+        self.max_idle_time = max_idle_time
+        self.max_lifetime = max_lifetime
+        self.health_check_interval = health_check_interval
+        self.timeout = timeout
+
+        self._cond = threading.Condition()
+        self._idle: Deque[_PooledConnection] = deque()
+        self._in_use: Dict[int, _PooledConnection] = {}
+        self._size = 0
+        self._closed = False
+        self._pid = os.getpid()
+
+    @property
+    def size(self) -> int:
+        """Conexiones abiertas (ociosas + en uso)"""
+        return self._size
+
+    @property
+    def idle_count(self) -> int:
+        return len(self._idle)
+
+    def fill(self) -> None:
+        """Abre conexiones hasta alcanzar ``min_size``"""
+        while True:
+            with self._cond:
+                self._check_fork()
+                if self._closed or self._size >= self.min_size:
+                    return
+                self._size += 1
+            try:
+                pooled = _PooledConnection(self._factory())
+            except Exception:
+                with self._cond:
+                    self._size -= 1
+                    self._cond.notify()
+                raise
+            with self._cond:
+                self._idle.append(pooled)
+                self._cond.notify()
+
+    def acquire(self) -> Any:
+        """Obtiene una conexión sana del pool (checkout)"""
+        deadline = time.monotonic() + self.timeout
+        while True:
+            pooled = None
+            with self._cond:
+                self._check_fork()
+                if self._closed:
+                    raise ConnectionError("El pool de conexiones está cerrado")
+                while not self._idle and self._size >= self.max_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise PoolTimeoutError(
+                            f"No hay conexiones libres tras {self.timeout}s "
+                            f"(max_size={self.max_size})"
+                        )
+                    self._cond.wait(remaining)
+                if self._idle:
+                    # LIFO: reutiliza la conexión más reciente, las demás envejecen
+                    pooled = self._idle.pop()
+                else:
+                    self._size += 1
+
+            if pooled is None:
+                try:
+                    pooled = _PooledConnection(self._factory())
+                except Exception:
+                    self._discard(None)
+                    raise
+            elif not self._is_usable(pooled):
+                self._discard(pooled)
+                continue
+
+            pooled.last_used = time.monotonic()
+            with self._cond:
+                self._in_use[id(pooled.connection)] = pooled
+            return pooled.connection
+
+    def release(self, connection: Any) -> None:
+        """Devuelve una conexión al pool (checkin)"""
+        with self._cond:
+            pooled = self._in_use.pop(id(connection), None)
+        if pooled is None:
+            logger.warning("Se intentó devolver una conexión ajena al pool")
+            return
+
+        try:
+            # No dejar transacciones abiertas para el siguiente usuario
+            if connection.open and connection.server_status & SERVER_STATUS.SERVER_STATUS_IN_TRANS:
+                connection.rollback()
+        except Exception as e:
+            logger.warning(f"Descartando conexión tras error en rollback: {e}")
+            self._discard(pooled)
+            return
+
+        now = time.monotonic()
+        if (
+            self._closed
+            or not connection.open
+            or now - pooled.created_at > self.max_lifetime
+        ):
+            self._discard(pooled)
+            return
+
+        pooled.last_used = now
+        with self._cond:
+            self._idle.append(pooled)
+            self._cond.notify()
+        self._prune_idle()
+
+    @contextmanager
+    def connection(self) -> Iterator[Any]:
+        """Context manager de checkout/checkin"""
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def close(self) -> None:
+        """Cierra las conexiones ociosas; las que están en uso se cierran al devolverse"""
+        with self._cond:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._cond.notify_all()
+        for pooled in idle:
+            self._discard(pooled)
+
+    def _is_usable(self, pooled: _PooledConnection) -> bool:
+        now = time.monotonic()
+        if now - pooled.created_at > self.max_lifetime:
+            return False
+        if now - pooled.last_used > self.max_idle_time:
+            return False
+        if now - pooled.last_used < self.health_check_interval:
+            return pooled.connection.open
+        try:
+            pooled.connection.ping(reconnect=False)
+            return True
+        except Exception as e:
+            logger.warning(f"Conexión del pool no responde al ping: {e}")
+            return False
+
+    def _prune_idle(self) -> None:
+        """Cierra conexiones ociosas vencidas por encima de ``min_size``"""
+        now = time.monotonic()
+        expired = []
+        with self._cond:
+            # las más antiguas quedan al inicio de la cola
+            while self._idle and self._size - len(expired) > self.min_size:
+                oldest = self._idle[0]
+                if (
+                    now - oldest.last_used <= self.max_idle_time
+                    and now - oldest.created_at <= self.max_lifetime
+                ):
+                    break
+                expired.append(self._idle.popleft())
+        for pooled in expired:
+            self._discard(pooled)
+
+    def _discard(self, pooled: Optional[_PooledConnection]) -> None:
+        if pooled is not None:
+            try:
+                pooled.connection.close()
+            except Exception:
+                pass
+        with self._cond:
+            self._size -= 1
+            self._cond.notify()
+
+    def _check_fork(self) -> None:
+        """Tras un fork (p.ej. workers de gunicorn) no se comparten sockets del padre"""
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._idle.clear()
+            self._in_use.clear()
+            self._size = 0
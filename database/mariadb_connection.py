@@ -1,28 +1,38 @@
 import pymysql
+import threading
 import pandas as pd
 import logging
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterator, Optional
 from contextlib import contextmanager
 from config import settings
+from database.connection_pool import ConnectionPool
+from database.result_decoder import rows_to_dataframe
 from interfaces.database_interface import IDatabaseConnection
 
 logger = logging.getLogger(__name__)
 
 
 class MariaDBConnection(IDatabaseConnection):
-    """Implementación Singleton para conexión a MariaDB"""
+    """Implementación Singleton para conexión a MariaDB.
+
+    La instancia es compartida por todo el proceso, pero cada consulta toma
+    su propia conexión de un ``ConnectionPool`` acotado y la devuelve al
+    terminar, de modo que las peticiones concurrentes no comparten socket.
+    """
 
     _instance = None
+    _instance_lock = threading.Lock()
 
     def __new__(cls, *args, **kwargs):
         if cls._instance is None:
-            cls._instance = super(MariaDBConnection, cls).__new__(cls)
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = super(MariaDBConnection, cls).__new__(cls)
         return cls._instance
 
     def __init__(self):
         
-        if not hasattr(self, "connection"):
-            self.connection: Optional[pymysql.Connection] = None
+        if not hasattr(self, "pool"):
             logger.info(f"===={settings.DB_NAME}===={settings.DB_USER}====")
             self.connection_config = {
                 "host": settings.DB_HOST or "127.0.0.1",
@@ -33,13 +43,25 @@ class MariaDBConnection(IDatabaseConnection):
                 "charset": "utf8mb4",
                 "autocommit": True,
             }
+            self.pool = self._create_pool()
+
+    def _create_pool(self) -> ConnectionPool:
+        return ConnectionPool(
+            connection_factory=lambda: pymysql.connect(**self.connection_config),
+            min_size=settings.DB_POOL_MIN_SIZE,
+            max_size=settings.DB_POOL_MAX_SIZE,
+            max_idle_time=settings.DB_POOL_MAX_IDLE_TIME,
+            max_lifetime=settings.DB_POOL_MAX_LIFETIME,
+            health_check_interval=settings.DB_POOL_HEALTH_CHECK_INTERVAL,
+            timeout=settings.DB_POOL_TIMEOUT,
+        )
 
     def connect(self) -> bool:
-        """Establece conexión con MariaDB"""
+        """Abre las conexiones mínimas del pool"""
         try:
-            if self.connection and self.connection.open:
-                return True
-            self.connection = pymysql.connect(**self.connection_config)
+            if self.pool is None:
+                self.pool = self._create_pool()
+            self.pool.fill()
             logger.info("✅ Conexión a MariaDB establecida exitosamente")
             return True
         except Exception as e:
@@ -47,26 +69,42 @@ class MariaDBConnection(IDatabaseConnection):
             return False
 
     def disconnect(self) -> None:
-        """Cierra la conexión a MariaDB"""
-        if self.connection:
-            self.connection.close()
-            self.connection = None
+        """Cierra el pool de conexiones a MariaDB (solo al apagar el proceso)"""
+        if self.pool:
+            self.pool.close()
+            self.pool = None
             logger.info("🔌 Conexión a MariaDB cerrada")
 
     @contextmanager
-    def get_cursor(self):
-        """Context manager para manejo seguro de cursores"""
-        if not self.connection or not self.connection.open:
-            if not self.connect():
-                raise ConnectionError(
-                    "No se pudo establecer conexión a la base de datos"
-                )
-
-        cursor = self.connection.cursor(pymysql.cursors.DictCursor)
+    def get_connection(self):
+        """Context manager que toma una conexión del pool y la devuelve al salir"""
+        if self.pool is None:
+            self.pool = self._create_pool()
         try:
-            yield cursor
+            conn = self.pool.acquire()
+        except Exception as e:
+            logger.error(f"❌ Error conectando a MariaDB: {e}")
+            raise ConnectionError(
+                "No se pudo establecer conexión a la base de datos"
+            ) from e
+        try:
+            yield conn
         finally:
-            cursor.close()
+            self.pool.release(conn)
+
+    @contextmanager
+    def get_cursor(self):
+        """Context manager para manejo seguro de cursores.
+
+        El cursor usa una conexión propia del pool; para manejar transacciones
+        usar ``cursor.connection``.
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor(pymysql.cursors.DictCursor)
+            try:
+                yield cursor
+            finally:
+                cursor.close()
 
     def execute_query(
         self, query: str, params: Optional[List[Any]] = None
@@ -87,21 +125,55 @@ class MariaDBConnection(IDatabaseConnection):
     def execute_query_dataframe(
         self, query: str, 
         params: Optional[List[Any]] = None,
+        dtypes: Optional[Dict[str, str]] = None,
     ) -> pd.DataFrame:
-        """Ejecuta query y retorna resultados como DataFrame de pandas"""
+        """Ejecuta query y retorna resultados como DataFrame de pandas.
+
+        Las filas se leen como tuplas y se decodifican por columna según
+        ``dtypes`` (ver ``rows_to_dataframe``).
+        """
         try:
-            if not self.connection or not self.connection.open:
-                if not self.connect():
-                    raise ConnectionError(
-                        "No se pudo establecer conexión a la base de datos"
-                    )
-
-            if params:
-                df = pd.read_sql(query, self.connection, params=params)
-            else:
-                df = pd.read_sql(query, self.connection)
+            with self.get_connection() as conn:
+                with conn.cursor(pymysql.cursors.Cursor) as cursor:
+                    cursor.execute(query, params or ())
+                    columns = [col[0] for col in cursor.description]
+                    rows = cursor.fetchall()
+            df = rows_to_dataframe(rows, columns, dtypes)
             logger.info(f"✅ DataFrame creado exitosamente. Shape: {df.shape}")
             return df
         except Exception as e:
             logger.error(f"🛑 Error creando DataFrame: {e}")
             raise
+
+    def execute_query_dataframe_chunks(
+        self,
+        query: str,
+        params: Optional[List[Any]] = None,
+        chunksize: int = 10000,
+        dtypes: Optional[Dict[str, str]] = None,
+    ) -> Iterator[pd.DataFrame]:
+        """Ejecuta query con cursor del lado del servidor (SSCursor) y produce
+        DataFrames de a lo sumo ``chunksize`` filas.
+
+        El resultado no se materializa completo en memoria. La conexión queda
+        ocupada hasta agotar (o cerrar) el iterador.
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor(pymysql.cursors.SSCursor)
+            try:
+                cursor.execute(query, params or ())
+                columns = [col[0] for col in cursor.description]
+                total = 0
+                while True:
+                    rows = cursor.fetchmany(chunksize)
+                    if not rows:
+                        break
+                    total += len(rows)
+                    yield rows_to_dataframe(rows, columns, dtypes)
+                logger.info(f"✅ Query en bloques completada. Filas: {total}")
+            except Exception as e:
+                logger.error(f"🛑 Error leyendo query en bloques: {e}")
+                raise
+            finally:
+                # consume lo pendiente para dejar la conexión reutilizable
+                cursor.close()
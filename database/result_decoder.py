@@ -0,0 +1,57 @@
+import decimal
+
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, List, Optional, Sequence
+
+
+def _decode_column(values: Sequence[Any], dtype: Optional[str]):
+    """Convierte los valores de una columna directamente a un arreglo tipado"""
+    if dtype is None:
+        first = next((v for v in values if v is not None), None)
+        if isinstance(first, decimal.Decimal):
+            # DECIMAL -> float64, como pd.read_sql(coerce_float=True)
+            dtype = "float64"
+        else:
+            # misma inferencia que pd.DataFrame.from_records (int con nulos -> float64, ...)
+            return pd.Series(np.array(values, dtype=object), copy=False).infer_objects()
+    if dtype == "category":
+        return pd.Categorical(values)
+    if dtype.startswith("datetime64"):
+        try:
+            return np.array(values, dtype=dtype)
+        except (TypeError, ValueError):
+            # fechas inválidas ('0000-00-00') llegan como str desde pymysql
+            return pd.to_datetime(
+                pd.Series(values, dtype=object), errors="coerce", format="mixed"
+            ).to_numpy(dtype)
+    try:
+        return np.array(values, dtype=dtype)
+    except (TypeError, ValueError):
+        return pd.to_numeric(pd.Series(values, dtype=object), errors="coerce").to_numpy(dtype)
+
+
+def rows_to_dataframe(
+    rows: Sequence[Sequence[Any]],
+    columns: List[str],
+    dtypes: Optional[Dict[str, str]] = None,
+) -> pd.DataFrame:
+    """Convierte filas en tuplas (cursor sin DictCursor) a DataFrame.
+
+    Las filas se transponen una sola vez y cada columna se decodifica a su
+    arreglo de NumPy según ``dtypes`` (p.ej. ``datetime64[ns]``, ``float64``
+    o ``category``), sin crear un dict por fila ni reparsear después. Las
+    columnas sin tipo declarado se infieren como en ``pd.read_sql``
+    (``DECIMAL`` pasa a ``float64``).
+    """
+    dtypes = dtypes or {}
+    if not rows:
+        df = pd.DataFrame(columns=columns)
+        present = {col: dtype for col, dtype in dtypes.items() if col in df.columns}
+        return df.astype(present) if present else df
+
+    data = {
+        name: _decode_column(values, dtypes.get(name))
+        for name, values in zip(columns, zip(*rows))
+    }
+    return pd.DataFrame(data, columns=columns, copy=False)
@@ -1,14 +1,12 @@
 from abc import ABC, abstractmethod
 from collections.abc import Generator
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterator, Optional
 import pandas as pd
 import pymysql
 
 class IDatabaseConnection(ABC):
     """Interface para conexión a base de datos"""
     
-    connection: pymysql.Connection
-    
     @abstractmethod
     def connect(self) -> bool:
         pass
@@ -22,13 +20,22 @@ class IDatabaseConnection(ABC):
         pass
     
     @abstractmethod
-    def execute_query_dataframe(self, query: str, params: Optional[Dict] = None) -> pd.DataFrame:
+    def execute_query_dataframe(self, query: str, params: Optional[Dict] = None, dtypes: Optional[Dict[str, str]] = None) -> pd.DataFrame:
         pass
     
     @abstractmethod
     def get_cursor(self, query: str, params: Optional[Dict] = None) -> Generator[pymysql.cursors.DictCursor, Any, None]:
         pass
 
+    def execute_query_dataframe_chunks(
+        self, query: str, params: Optional[Dict] = None, chunksize: int = 10000, dtypes: Optional[Dict[str, str]] = None
+    ) -> Iterator[pd.DataFrame]:
+        """Versión por bloques de execute_query_dataframe. Por defecto divide el
+        resultado completo; las implementaciones pueden hacer streaming real."""
+        df = self.execute_query_dataframe(query, params, dtypes=dtypes)
+        for start in range(0, len(df), chunksize):
+            yield df.iloc[start:start + chunksize]
+
 class IAuthService(ABC):
     """Interface para servicio de autenticación"""
     
@@ -0,0 +1,32 @@
+import hashlib
+import json
+import re
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional
+
+
+class IQueryCache(ABC):
+    """Interface para caché de resultados de consultas"""
+
+    @staticmethod
+    def make_key(query: str, params: Optional[Dict[str, Any]] = None) -> str:
+        """Clave estable: SQL normalizado (espacios colapsados) + params ordenados"""
+        normalized = re.sub(r"\s+", " ", query).strip()
+        params_json = json.dumps(sorted((params or {}).items()), default=str)
+        return hashlib.sha256(f"{normalized}|{params_json}".encode("utf-8")).hexdigest()
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Any]:
+        pass
+
+    @abstractmethod
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        pass
+
+    @abstractmethod
+    def invalidate(self) -> None:
+        pass
+
+    def version(self, key: str) -> Optional[str]:
+        """Huella del contenido vigente en `key` (None si no hay entrada)"""
+        return None
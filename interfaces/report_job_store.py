@@ -0,0 +1,47 @@
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional
+from models.report_job import ReportJob
+
+
+class IReportJobStore(ABC):
+    """Interface para la cola persistente de trabajos de reportes"""
+
+    @abstractmethod
+    def enqueue(self, tipo: str, params: Dict[str, Any]) -> ReportJob:
+        pass
+
+    @abstractmethod
+    def get(self, job_id: str) -> Optional[ReportJob]:
+        pass
+
+    @abstractmethod
+    def claim_next(self, worker: Optional[str] = None) -> Optional[ReportJob]:
+        """Toma el trabajo en cola más antiguo y lo marca como `running` por `worker`"""
+        pass
+
+    @abstractmethod
+    def heartbeat(self, worker: str) -> int:
+        """Renueva `updated_at` de los trabajos `running` de `worker`"""
+        pass
+
+    @abstractmethod
+    def complete(self, job_id: str, artifacts: List[bytes], mimetype: str) -> None:
+        pass
+
+    @abstractmethod
+    def fail(self, job_id: str, error: str) -> None:
+        pass
+
+    @abstractmethod
+    def get_artifact(self, job_id: str, index: int = 0) -> Optional[bytes]:
+        pass
+
+    @abstractmethod
+    def requeue_stale(self, older_than: float) -> int:
+        """Devuelve a la cola los trabajos `running` sin latido hace más de `older_than` segundos"""
+        pass
+
+    @abstractmethod
+    def purge(self, older_than: float) -> int:
+        """Elimina trabajos terminados hace más de `older_than` segundos"""
+        pass
@@ -2,8 +2,11 @@ from flask import Flask, jsonify
 from flask_cors import CORS
 import logging
 
+from config import settings
 from database.mariadb_connection import MariaDBConnection
-from routes import guia_route, promedio_tiempo_despacho_x_cond_pago
+from utils.http_cache import init_http_cache
+from utils.json_response import FastJSONProvider
+from routes import guia_route, promedio_tiempo_despacho_x_cond_pago, report_jobs_route
 
 # Configuración de logging
 logging.basicConfig(
@@ -12,6 +15,8 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 app = Flask(__name__)
+# jsonify con orjson (si está instalado) y DataFrames serializados por columna
+app.json = FastJSONProvider(app)
 db = MariaDBConnection()
 
 # Middleware CORS
@@ -26,9 +31,17 @@ CORS(
     },
 )
 
+# ETag/304 y compresión gzip/br (después de CORS: el 304 lleva sus cabeceras)
+init_http_cache(
+    app,
+    min_size=settings.HTTP_COMPRESS_MIN_SIZE,
+    compress_level=settings.HTTP_COMPRESS_LEVEL,
+)
+
 # Registrar rutas
 app.register_blueprint(promedio_tiempo_despacho_x_cond_pago.bp)
 app.register_blueprint(guia_route.bp)
+app.register_blueprint(report_jobs_route.bp)
 
 
 # Ruta raíz
@@ -0,0 +1,39 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+
+class ReportJobStatus:
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+
+@dataclass
+class ReportJob:
+    id: str
+    tipo: str
+    params: Dict[str, Any] = field(default_factory=dict)
+    status: str = ReportJobStatus.QUEUED
+    error: Optional[str] = None
+    mimetype: Optional[str] = None
+    artifact_count: int = 0
+    created_at: float = 0.0
+    updated_at: float = 0.0
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (ReportJobStatus.DONE, ReportJobStatus.FAILED)
+
+    def to_json(self):
+        return {
+            "job_id": self.id,
+            "tipo": self.tipo,
+            "params": self.params,
+            "status": self.status,
+            "error": self.error,
+            "mimetype": self.mimetype,
+            "artifact_count": self.artifact_count,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+        }
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field, field_validator
-from typing import Optional, Any
+from typing import Optional, Any, Dict
 from datetime import date
 
 
@@ -59,3 +59,18 @@ class DataResponse(BaseModel):
 
 class ProgradosHoyRequest(BaseModel):
     date_programen: date = Field(..., description="Fecha (YYYY-MM-DD)")
+
+
+class ReportJobRequest(BaseModel):
+    tipo: str = Field(..., description="Tipo de reporte: programados_del_dia, dashboard")
+    params: Dict[str, Any] = Field(default_factory=dict, description="Parámetros del reporte")
+
+
+class ProgramadosDelDiaJobParams(BaseModel):
+    fecha: Optional[date] = Field(default=None, description="Fecha (YYYY-MM-DD), hoy si se omite")
+
+
+class DashboardJobParams(DateRangeRequest):
+    fecha_programados: Optional[date] = Field(
+        default=None, description="Fecha de los programados (YYYY-MM-DD)"
+    )
@@ -8,3 +8,4 @@ class TiempoDespachoResumen:
     promedio_tiempo_despacho: str
     porcentaje: float
     suma_porcentaje_plazo: float
+    promedio_tiempo_despacho_seg: float = 0.0
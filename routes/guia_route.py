@@ -6,16 +6,28 @@ from models.requests import DataResponse, ProgradosHoyRequest
 from services.guia_service import GuiaService
 from datetime import datetime, date
 
+from config import settings
 from database.mariadb_connection import MariaDBConnection
 from services.documento_query_service import DocumentoQueryService
 from services.data_analysis_service import DataAnalysisService
 from utils.telegram_utils import send_image_to_telegram, send_message_to_telegram
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, jsonify, request, send_file
 
 bp = Blueprint("guia", __name__)
 logger = logging.getLogger(__name__)
 
 
+def _int_arg(name: str, default: int) -> int:
+    """Entero de la query string; ValueError si viene pero no es un entero"""
+    value = request.args.get(name)
+    if value is None:
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f"{name} debe ser un entero: {value!r}") from None
+
+
 @bp.route("/data/actualizar_guias_varios", methods=["POST"])
 def update_guia_many():
     # _: bool = Depends(validate_request_auth),
@@ -23,11 +35,25 @@ def update_guia_many():
 
     try:
         requestList = [GuiaUpdateRequest(**item) for item in request.get_json()]
+        # ?chunk_size=N commit cada N guías; ?desde=I reanuda tras un bloque fallido
+        try:
+            chunk_size = _int_arg("chunk_size", settings.GUIA_UPDATE_CHUNK_SIZE)
+            desde = _int_arg("desde", 0)
+            GuiaService.validar_bloques(len(requestList), chunk_size, desde)
+        except ValueError as e:
+            return jsonify(
+                DataResponse(success=False, rows_count=0, message=str(e)).to_json()
+            ), 400
+
         db = MariaDBConnection()
         db.connect()
 
         query_service = GuiaService(db)
-        updated_response = query_service.update_multiple_guias(requests=requestList)
+        updated_response = query_service.update_multiple_guias(
+            requests=requestList,
+            chunk_size=chunk_size,
+            desde=desde,
+        )
         return jsonify(updated_response), 200
     except Exception as e:
         respose = DataResponse(
@@ -42,42 +68,58 @@ def update_guia_many():
 
 @bp.route("/report/programados_del_dia")
 def programados_hoy():
+    """Reporte de programados como PNG (?fecha=YYYY-MM-DD&pagina=N), sin pasar por disco"""
+    pagina = request.args.get("pagina", default=1, type=int)
+    try:
+        fecha_arg = request.args.get("fecha")
+        fecha = date.fromisoformat(fecha_arg) if fecha_arg else date.today()
+    except ValueError as e:
+        return jsonify(
+            DataResponse(success=False, rows_count=0, message=str(e)).to_json()
+        ), 400
+
     try:
         db = MariaDBConnection()
         db.connect()
 
-        query_service = GuiaService(db)
-        programados = query_service.get_guias_by_fecha_programada(filters={})
-    #         if  programados.empty:
-    #             return DataResponse(
-    #                 success=True,
-    #                 data=None,
-    #                 rows_count=0,
-    #                 message="No hay datos para la fecha proporcionada.",
-    #             )
-    #         data_analysis_service = DataAnalysisService()
-    #         image_path = data_analysis_service.generar_reporte_imagen(
-    #             df=programados,
-    #             ruta_salida="reporte_programados_hoy.png",
-    #             date_programen=request.date_programen
-    #             )
-
-    #         # send_message_to_telegram(image_path)
-    #         date_value = request.date_programen
-    #         if isinstance(date_value, str):
-    #             date_obj = datetime.strptime(date_value, "%d/%m/%Y").date()
-    #         elif isinstance(date_value, date):
-    #             date_obj = date_value.strftime("%d/%m/%y")
-    #         send = send_image_to_telegram(image_path, f"Programacion de despacho del dia {date_obj}")
-    #         print(send)
-    #         return DataResponse(
-    #             success=True,
-    #             data=None,
-    #             rows_count=len(programados),
-    #             message="Consulta realizada con éxito!",
-    #         )
-    except Exception as e:
-        logger.error(f"Error en date-range: {e}")
+        query_service = DocumentoQueryService(db)
+        programados = query_service.get_programados_del_dia(fecha)
+        if programados.empty:
+            return jsonify(
+                DataResponse(
+                    success=False,
+                    data=None,
+                    rows_count=0,
+                    message="No hay datos para la fecha proporcionada.",
+                ).to_json()
+            ), 404
 
+        paginas = DataAnalysisService().despachados_del_dia_paginas(
+            df=programados, date_programen=fecha
+        )
+        if not 1 <= pagina <= len(paginas):
+            return jsonify(
+                DataResponse(
+                    success=False,
+                    data=None,
+                    rows_count=len(programados),
+                    message=f"La página debe estar entre 1 y {len(paginas)}",
+                ).to_json()
+            ), 404
 
-#         raise HTTPException(status_code=500, detail=str(e))
+        response = send_file(
+            paginas[pagina - 1],
+            mimetype="image/png",
+            download_name=f"programados_{fecha}_{pagina}.png",
+        )
+        response.headers["X-Total-Paginas"] = str(len(paginas))
+        return response
+    except Exception as e:
+        error_response = DataResponse(
+            success=False,
+            data=None,
+            rows_count=0,
+            message=str(e),
+        ).to_json()
+        logger.error(f"Error en programados del día: {error_response}")
+        return jsonify(error_response), 500
@@ -1,18 +1,36 @@
 import logging
+from pydantic import ValidationError
 from models.requests import DateRangeRequest, DataResponse
 from services.documento_query_service import DocumentoQueryService
 from services.data_analysis_service import DataAnalysisService
 
 from database.mariadb_connection import MariaDBConnection
 from flask import Blueprint, jsonify, request
+from utils import http_cache
+from utils.json_response import request_formato
 
 bp = Blueprint("promedio_tiempo_despacho_x_cond_pago", __name__)
 logger = logging.getLogger(__name__)
 
 
-@bp.route("/data/promedio_tiempo_despacho_x_cond_pago", methods=["POST"])
+def _etag(data: DateRangeRequest, data_version: str) -> str:
+    return http_cache.etag_for(
+        request.path, data.start_date, data.end_date, request_formato(), data_version
+    )
+
+
+# GET (?start_date=&end_date=) admite If-None-Match -> 304; POST se mantiene
+@bp.route("/data/promedio_tiempo_despacho_x_cond_pago", methods=["GET", "POST"])
 def get_promedio_tiempo_despacho_x_cond_pago():
-    data = DateRangeRequest(**request.get_json())
+    try:
+        if request.method == "GET":
+            data = DateRangeRequest(**request.args.to_dict())
+        else:
+            data = DateRangeRequest(**(request.get_json(silent=True) or {}))
+    except ValidationError as e:
+        return jsonify(
+            DataResponse(success=False, data=None, rows_count=0, message=str(e)).to_json()
+        ), 400
     # print(request)
 
     try:
@@ -21,11 +39,25 @@ def get_promedio_tiempo_despacho_x_cond_pago():
 
         query_service = DocumentoQueryService(db)
         data_analysis_service = DataAnalysisService()
+        columns = DataAnalysisService.COLUMNAS_PROMEDIO_TIEMPO_DESPACHO
+
+        # si los datos en caché no cambiaron y el cliente ya los tiene: 304
+        # sin copiar el DataFrame, analizar ni serializar
+        data_version = query_service.delivery_documents_version(
+            data.start_date, data.end_date, columns
+        )
+        if data_version:
+            response = http_cache.not_modified(_etag(data, data_version))
+            if response is not None:
+                return response
 
         df_response = query_service.get_delivery_documents_by_date_range(
             start_date=data.start_date,
             end_date=data.end_date,
+            columns=columns,
         )
+        if query_service.last_data_version:
+            http_cache.use_etag(_etag(data, query_service.last_data_version))
         # si df_response es vacio, retornar error
         if df_response.empty:
             return jsonify(
@@ -45,7 +77,8 @@ def get_promedio_tiempo_despacho_x_cond_pago():
         response_data = DataResponse(
             success=True,
             data={
-                "promedio_tiempo_despacho": promedio_tiempo_despacho.to_dict(orient="records"),
+                # el DataFrame se serializa directo (?formato=columnar para filas compactas)
+                "promedio_tiempo_despacho": promedio_tiempo_despacho,
             },
             rows_count=len(df_response),
             message="Consulta realizada con éxito!",
@@ -0,0 +1,117 @@
+import io
+import logging
+import threading
+from typing import Optional
+from pydantic import ValidationError
+from flask import Blueprint, jsonify, request, send_file, url_for
+
+from config import settings
+from database.mariadb_connection import MariaDBConnection
+from models.report_job import ReportJobStatus
+from models.requests import DataResponse, ReportJobRequest
+from services.report_job_service import ReportJobService, report_job_renderers
+from services.report_render_service import ReportRenderService
+from stores.report_job_sqlite_store import ReportJobSqliteStore
+
+bp = Blueprint("report_jobs", __name__)
+logger = logging.getLogger(__name__)
+
+_service: Optional[ReportJobService] = None
+_service_lock = threading.Lock()
+
+
+def get_report_job_service() -> ReportJobService:
+    """Servicio de trabajos del proceso (se crea en el primer uso)"""
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                report_service = ReportRenderService(
+                    db_connection=MariaDBConnection(),
+                    dashboard_render_workers=settings.DASHBOARD_RENDER_WORKERS,
+                )
+                _service = ReportJobService(
+                    store=ReportJobSqliteStore(settings.REPORT_JOBS_DB_PATH),
+                    renderers=report_job_renderers(report_service),
+                    max_workers=settings.REPORT_JOB_WORKERS,
+                    stale_after=settings.REPORT_JOB_STALE_AFTER,
+                    retention=settings.REPORT_JOB_RETENTION,
+                )
+    return _service
+
+
+def _error(message: str, status: int):
+    return jsonify(
+        DataResponse(success=False, data=None, rows_count=0, message=message).to_json()
+    ), status
+
+
+def _job_json(job):
+    data = job.to_json()
+    data["status_url"] = url_for("report_jobs.get_job", job_id=job.id)
+    if job.status == ReportJobStatus.DONE:
+        data["artifacts"] = [
+            url_for("report_jobs.get_job_artifact", job_id=job.id, pagina=i + 1)
+            for i in range(job.artifact_count)
+        ]
+    return data
+
+
+@bp.route("/report/jobs", methods=["POST"])
+def create_job():
+    """Encola un reporte y retorna de inmediato el id del trabajo (202)"""
+    try:
+        data = ReportJobRequest(**(request.get_json(silent=True) or {}))
+        job = get_report_job_service().submit(data.tipo, data.params)
+    except (ValidationError, ValueError) as e:
+        return _error(str(e), 400)
+    except Exception as e:
+        logger.error(f"Error encolando reporte: {e}")
+        return _error(str(e), 500)
+
+    response = jsonify(
+        DataResponse(
+            success=True, data=_job_json(job), rows_count=0, message="Reporte encolado"
+        ).to_json()
+    )
+    response.status_code = 202
+    response.headers["Location"] = url_for("report_jobs.get_job", job_id=job.id)
+    return response
+
+
+@bp.route("/report/jobs/<job_id>")
+def get_job(job_id: str):
+    job = get_report_job_service().get(job_id)
+    if job is None:
+        return _error(f"Trabajo {job_id} no encontrado", 404)
+    return jsonify(
+        DataResponse(
+            success=job.status != ReportJobStatus.FAILED,
+            data=_job_json(job),
+            rows_count=job.artifact_count,
+            message=job.error or job.status,
+        ).to_json()
+    ), 200
+
+
+@bp.route("/report/jobs/<job_id>/artifact")
+def get_job_artifact(job_id: str):
+    """Artefacto del trabajo terminado (?pagina=N para reportes de varias páginas)"""
+    service = get_report_job_service()
+    job = service.get(job_id)
+    if job is None:
+        return _error(f"Trabajo {job_id} no encontrado", 404)
+    if job.status != ReportJobStatus.DONE:
+        return _error(f"El trabajo {job_id} está en estado {job.status}", 409)
+
+    pagina = request.args.get("pagina", default=1, type=int)
+    data = service.get_artifact(job_id, pagina - 1) if pagina >= 1 else None
+    if data is None:
+        return _error(f"La página debe estar entre 1 y {job.artifact_count}", 404)
+    response = send_file(
+        io.BytesIO(data),
+        mimetype=job.mimetype,
+        download_name=f"{job.tipo}_{job_id}_{pagina}.png",
+    )
+    response.headers["X-Total-Paginas"] = str(job.artifact_count)
+    return response
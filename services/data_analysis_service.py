@@ -1,9 +1,14 @@
+import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
 from datetime import date
+from typing import Dict, Iterable, List, Optional, Union
 import logging
 import os
+from io import BytesIO
+from PIL import Image
 from models.tiempo_despacho_resumen import TiempoDespachoResumen
+from views.generate_dashboard.image_buffer import encode_image
+from views.generate_dashboard.r_report_table import ReportTable, RowKind, RReportTable
 
 logger = logging.getLogger(__name__)
 
@@ -11,59 +16,131 @@ logger = logging.getLogger(__name__)
 class DataAnalysisService:
     """Servicio para análisis de datos usando pandas y numpy"""
 
-    def get_promedio_tiempo_despacho(self, data: pd.DataFrame) -> pd.DataFrame:
-        """Obtiene estadísticas resumidas del DataFrame"""
-
-        condicones_pago = [
-            "Contado contra entrega;24",
-            "CERC;24",
-            "PADEL;24",
-            "FACT 90 - 1;24",
-            "FACT 90 - 2;24",
-            "LETRAS 365 - 1;24",
-            "LETRAS 365 - 3;24",
-            "Pago Adelantado;24",
-            "ACUADEL;24",
-            "FACT 90 - 3;48",
-            "FACT 90 - 4;48",
-            "FACT 90 - 5;48",
-            "LETRAS 365 - 5;48",
-            "PA72;48",
-            "PA5050;72",
-            "PADEL 96;72",
-        ]
+    # Columnas que lee cada análisis (para proyectar la consulta)
+    COLUMNAS_PROMEDIO_TIEMPO_DESPACHO = ["doc_fec_crea", "rd_hora_sal", "doc_con_pag"]
+    COLUMNAS_EXCEPCIONES = ["doc_excep"]
+    COLUMNAS_PROGRAMADOS_DEL_DIA = ["doc_fec_ent_gr", "doc_ag_trans", "doc_mot"]
+
+    # Condición de pago -> plazo en horas
+    CONDICIONES_PAGO = {
+        "Contado contra entrega": 24,
+        "CERC": 24,
+        "PADEL": 24,
+        "FACT 90 - 1": 24,
+        "FACT 90 - 2": 24,
+        "LETRAS 365 - 1": 24,
+        "LETRAS 365 - 3": 24,
+        "Pago Adelantado": 24,
+        "ACUADEL": 24,
+        "FACT 90 - 3": 48,
+        "FACT 90 - 4": 48,
+        "FACT 90 - 5": 48,
+        "LETRAS 365 - 5": 48,
+        "PA72": 48,
+        "PA5050": 72,
+        "PADEL 96": 72,
+    }
+    CONDICION_OTROS = "Otros"
+    # Tabla precompilada: categorías ordenadas (mismo orden que groupby sobre
+    # texto) y plazo por código de categoría
+    _CATEGORIA_CONDICION = pd.CategoricalDtype(
+        sorted([*CONDICIONES_PAGO, CONDICION_OTROS])
+    )
+    _PLAZO_POR_CODIGO = (
+        pd.Series(CONDICIONES_PAGO, dtype="float64")
+        .reindex(_CATEGORIA_CONDICION.categories, fill_value=0)
+        .to_numpy()
+    )
+
+    # doc_mot (sin espacios extremos, en minúsculas) -> type_doc. La
+    # configuración (settings.MOTIVO_TIPO_DOC) agrega motivos o redefine estos
+    MOTIVO_TIPO_DOC = {
+        "recojo en planta": "Planta",
+        "venta": "Lima",
+        "traslado int. almacen": "Traslado",
+    }
+    TIPO_DOC_DEFAULT = "Otros"
+
+    # Reporte detallado de despachados
+    COLUMNAS_DESPACHADOS = [
+        "Placa",
+        "Chofer",
+        "Num Factura",
+        "Razón Social",
+        "Peso Total",
+        "Cantidad Bultos",
+    ]
+    FILAS_POR_PAGINA = 40
+
+    def __init__(self, motivo_tipo_doc: Optional[Dict[str, str]] = None):
+        """`motivo_tipo_doc` extiende `MOTIVO_TIPO_DOC` (por defecto, con
+        settings.MOTIVO_TIPO_DOC)"""
+        if motivo_tipo_doc is None:
+            motivo_tipo_doc = self._motivo_tipo_doc_configurado()
+        self.motivo_tipo_doc = {
+            str(k).strip().lower(): v
+            for mapping in (self.MOTIVO_TIPO_DOC, motivo_tipo_doc)
+            for k, v in mapping.items()
+        }
+
+    @staticmethod
+    def _motivo_tipo_doc_configurado() -> Dict[str, str]:
+        """settings.MOTIVO_TIPO_DOC, o vacío si no hay configuración (p.ej. en tests)"""
         try:
-            data = data.dropna(subset=["rd_hora_sal"]).copy()
-            data["rd_hora_sal"] = pd.to_datetime(data["rd_hora_sal"])
-            data["doc_fec_crea"] = pd.to_datetime(data["doc_fec_crea"])
-            data["tiempo_despacho"] = data["rd_hora_sal"] - data["doc_fec_crea"]
-
-            condiciones_map = {}
-            for item in condicones_pago:
-                key, value = item.split(";")
-                condiciones_map[key] = int(value)
-
-            data["condicion_categoria"] = data["doc_con_pag"].apply(
-                lambda x: x if x in condiciones_map else "Otros"
-            )
+            from config import settings
+        except Exception as e:
+            logger.debug(f"Sin configuración de MOTIVO_TIPO_DOC: {e}")
+            return {}
+        return settings.MOTIVO_TIPO_DOC
+
+    @staticmethod
+    def _as_chunks(data: Union[pd.DataFrame, Iterable[pd.DataFrame]]) -> Iterable[pd.DataFrame]:
+        """Acepta un DataFrame o un iterador de bloques (ver `query_documents(chunksize=...)`)"""
+        if isinstance(data, pd.DataFrame):
+            return (data,)
+        return data
+
+    def get_promedio_tiempo_despacho(
+        self, data: Union[pd.DataFrame, Iterable[pd.DataFrame]]
+    ) -> pd.DataFrame:
+        """Obtiene estadísticas resumidas del DataFrame.
 
-            # Asignar horas según condición, default para Otros = 0
-            data["plazo_hrs"] = (
-                data["condicion_categoria"].map(condiciones_map).fillna(0)
-            )
+        `data` puede ser un iterador de bloques: cada bloque se reduce a sumas
+        parciales por condición de pago y al final se combinan, así la memoria
+        no depende del tamaño total del rango de fechas.
+        """
 
-            grouped_data = (
-                data.groupby("condicion_categoria")
-                .agg(
-                    cantidad_registros=("doc_con_pag", "size"),
-                    promedio_plazo_hrs=("plazo_hrs", "mean"),
-                    promedio_tiempo_despacho=("tiempo_despacho", "mean"),
+        try:
+            parciales = [
+                self._parcial_tiempo_despacho(chunk)
+                for chunk in self._as_chunks(data)
+            ]
+            if parciales:
+                totales = (
+                    pd.concat(parciales).groupby(level=0, observed=True).sum()
+                )
+            else:
+                totales = self._parcial_tiempo_despacho(
+                    pd.DataFrame(columns=self.COLUMNAS_PROMEDIO_TIEMPO_DESPACHO)
                 )
-                .reset_index()
-                .rename(columns={"condicion_categoria": "doc_con_pag"})
+            totales.index = totales.index.astype(str)
+
+            grouped_data = pd.DataFrame(
+                {
+                    "cantidad_registros": totales["cantidad_registros"],
+                    "promedio_plazo_hrs": totales["suma_plazo_hrs"]
+                    / totales["cantidad_registros"],
+                    "promedio_tiempo_despacho": pd.to_timedelta(
+                        totales["suma_tiempo_seg"]
+                        / totales["cantidad_tiempo"].where(totales["cantidad_tiempo"] > 0),
+                        unit="s",
+                    ),
+                }
             )
+            grouped_data.index.name = "doc_con_pag"
+            grouped_data = grouped_data.reset_index()
 
-            total_registros = data.shape[0]
+            total_registros = grouped_data["cantidad_registros"].sum()
             grouped_data["porcentaje"] = (
                 grouped_data["cantidad_registros"] / total_registros
             ) * 100
@@ -71,32 +148,87 @@ class DataAnalysisService:
                 "promedio_plazo_hrs"
             )["porcentaje"].transform("sum")
 
-            # Format the timedelta to the desired string format for promedio_tiempo_despacho
-            grouped_data["promedio_tiempo_despacho"] = grouped_data[
-                "promedio_tiempo_despacho"
-            ].fillna(pd.Timedelta(0))
-
-            def format_td(x):
-                if pd.isna(x):
-                    return "00 Días 00 Hrs 00 Mins"
-                return f"{x.days:02d} Días {x.seconds // 3600:02d} Hrs {(x.seconds % 3600) // 60:02d} Mins"
-
-            grouped_data["promedio_tiempo_despacho"] = grouped_data[
-                "promedio_tiempo_despacho"
-            ].apply(format_td)
+            promedio = grouped_data["promedio_tiempo_despacho"].fillna(pd.Timedelta(0))
+            grouped_data["promedio_tiempo_despacho"] = self._formatear_timedelta(promedio)
+            grouped_data["promedio_tiempo_despacho_seg"] = promedio.dt.total_seconds()
             return grouped_data
 
         except Exception as e:
             logger.error(f"Error calculando estadísticas: {e}")
             raise
 
-    def find_exceptions(self, df: pd.DataFrame) -> pd.DataFrame:
+    @classmethod
+    def _parcial_tiempo_despacho(cls, data: pd.DataFrame) -> pd.DataFrame:
+        """Sumas parciales por condición de pago de un bloque"""
+        data = data.dropna(subset=["rd_hora_sal"])
+        tiempo_seg = (
+            cls._as_datetime(data["rd_hora_sal"]) - cls._as_datetime(data["doc_fec_crea"])
+        ).dt.total_seconds()
+
+        # Las condiciones fuera de la tabla (o nulas) quedan como "Otros"
+        condicion = data["doc_con_pag"]
+        condicion_categoria = pd.Categorical(
+            condicion.where(condicion.isin(cls._CATEGORIA_CONDICION.categories)),
+            dtype=cls._CATEGORIA_CONDICION,
+        ).fillna(cls.CONDICION_OTROS)
+        # Horas según la posición de la categoría, Otros = 0
+        plazo_hrs = cls._PLAZO_POR_CODIGO[condicion_categoria.codes]
+
+        return (
+            pd.DataFrame(
+                {
+                    "condicion_categoria": condicion_categoria,
+                    "plazo_hrs": plazo_hrs,
+                    "tiempo_seg": tiempo_seg.to_numpy(),
+                }
+            )
+            .groupby("condicion_categoria", observed=True)
+            .agg(
+                cantidad_registros=("plazo_hrs", "size"),
+                suma_plazo_hrs=("plazo_hrs", "sum"),
+                suma_tiempo_seg=("tiempo_seg", "sum"),
+                cantidad_tiempo=("tiempo_seg", "count"),
+            )
+        )
+
+    @staticmethod
+    def _as_datetime(col: pd.Series) -> pd.Series:
+        """Evita reparsear columnas que ya llegan como datetime64 desde la consulta"""
+        if pd.api.types.is_datetime64_any_dtype(col):
+            return col
+        return pd.to_datetime(col)
+
+    @staticmethod
+    def _formatear_timedelta(td: pd.Series) -> pd.Series:
+        """Formatea timedeltas como "DD Días HH Hrs MM Mins" sobre columnas enteras"""
+        comp = td.dt.components
+
+        def dos_digitos(col: pd.Series) -> pd.Series:
+            return col.astype("int64").astype(str).str.zfill(2)
+
+        return (
+            dos_digitos(comp["days"]) + " Días "
+            + dos_digitos(comp["hours"]) + " Hrs "
+            + dos_digitos(comp["minutes"]) + " Mins"
+        )
+
+    def find_exceptions(
+        self, df: Union[pd.DataFrame, Iterable[pd.DataFrame]]
+    ) -> pd.DataFrame:
         # filtrar de df solo los que tiene valor en "doc_excep"
         # luego agrupar por doc_excep y contar cuantas veces se repite
-        df_filter = df[df["doc_excep"].notna() & (df["doc_excep"] != "")]
+        # (acepta también un iterador de bloques: se suman los conteos)
+        conteos = []
+        for chunk in self._as_chunks(df):
+            df_filter = chunk[chunk["doc_excep"].notna() & (chunk["doc_excep"] != "")]
+            conteos.append(df_filter.groupby("doc_excep", observed=True).size())
+        if not conteos:
+            conteos.append(pd.Series(dtype="int64", index=pd.Index([], name="doc_excep")))
         return (
-            df_filter.groupby("doc_excep")
-            .size()
+            pd.concat(conteos)
+            .groupby(level=0)
+            .sum()
+            .rename_axis("doc_excep")
             .reset_index(name="count")
             .sort_values(by="count", ascending=False)
             .reset_index(drop=True)
@@ -108,166 +240,141 @@ class DataAnalysisService:
         # Filtrar fecha válida
         df_filter = df[
             df["doc_fec_ent_gr"].notna() & (df["doc_fec_ent_gr"] == date_programen)
-        ].copy()
-        # si tiene valor en "doc_ag_trans" asignar "Agencia"
-        # Determina Agencia o Lima según doc_ag_trans
-        df_filter["type_doc"] = df_filter["doc_ag_trans"].apply(
-            lambda x: "Agencia" if pd.notna(x) and str(x).strip() != "" else "Lima"
-        )
-
-        # Solo procesar los que inicialmente fueron "Lima"
-        df_lima = df_filter[df_filter["type_doc"] == "Lima"].copy()
+        ]
+        # si tiene valor en "doc_ag_trans" es "Agencia"; solo se procesan los
+        # que inicialmente fueron "Lima"
+        codes, agencias = pd.factorize(df_filter["doc_ag_trans"])
+        con_valor = np.array([str(a).strip() != "" for a in agencias] + [False])
+        es_agencia = con_valor[codes]
+        df_lima = df_filter[~es_agencia].copy()
 
         # Clasificar según doc_mot
-        def classify(row):
-            mot = str(row["doc_mot"]).strip().lower()
-            if mot == "recojo en planta":
-                return "Planta"
-            elif mot == "venta":
-                return "Lima"
-            elif mot == "traslado int. almacen":
-                return "Traslado"
-            else:
-                return "Otros"
-
-        df_lima["type_doc"] = df_lima.apply(classify, axis=1)
-        print(df_lima.to_dict(orient="records"))
+        df_lima["type_doc"] = self._clasificar_motivos(df_lima["doc_mot"])
+        logger.info(f"Programados del día {date_programen}: {len(df_lima)} documentos")
         return df_lima
 
-    def despachados_del_dia_detallado(
+    def _clasificar_motivos(self, motivos: pd.Series) -> np.ndarray:
+        """Asigna type_doc según `motivo_tipo_doc` sin recorrer fila por fila.
+
+        Se factoriza la columna: la normalización y búsqueda en la tabla se
+        hacen una vez por valor distinto y el resultado se expande con los
+        códigos (los nulos, código -1, caen en el valor por defecto).
+        """
+        codes, uniques = pd.factorize(motivos)
+        tipos = [
+            self.motivo_tipo_doc.get(str(m).strip().lower(), self.TIPO_DOC_DEFAULT)
+            for m in uniques
+        ]
+        lookup = np.array(tipos + [self.TIPO_DOC_DEFAULT], dtype=object)
+        return lookup[codes]
+
+    def despachados_del_dia_paginas(
         self,
         df: pd.DataFrame,
         date_programen: date,
-        ruta_salida="reporte.png",
-    ):
+        filas_por_pagina: Optional[int] = None,
+    ) -> List[BytesIO]:
         """
-        Recibe un DataFrame con la data de la query
-        y genera una tabla estilo el ejemplo en formato imagen.
+        Genera el reporte de despachados en memoria: un PNG codificado por
+        página, sin tocar disco. Es lo que usan el bot y la API.
         """
+        paginas = self._render_despachados(df, filas_por_pagina)
+        logger.info(
+            f"Reporte de {date_programen}: {len(df)} documentos en {len(paginas)} páginas"
+        )
+        return [encode_image(pagina) for pagina in paginas]
 
-        # Agrupar por placa y chofer
-        grupos = df.groupby(["veh_placa"])
-        total_peso = 0
-        total_bult = 0
-
-        fig, ax = plt.subplots(
-            figsize=(14, len(df) * 0.35)
-        )  # ancho mayor y alto dinámico
-        # fig.suptitle(
-        #     f"Pogramacion de despacho del dia {date_programen}",
-        #     fontsize=14,
-        #     fontweight="bold",
-        #     color="#333333",
-        #     y=0.98,
-        # )
-        ax.axis("off")  # quitar ejes
-
-        # lista para armar tabla matplotlib
-        tabla_datos = []
-        tabla_cols = [
-            "Placa",
-            "Chofer",
-            "Num Factura",
-            "Razón Social",
-            "Peso Total",
-            "Cantidad Bultos",
-        ]
-
-        # construir filas
-        subtotal_rows = []
-        for placa, datos in grupos:
-            subtotal_peso = datos["doc_peso_tot"].sum()
-            subtotal_bult = datos["doc_cant_bult"].sum()
-            total_peso += subtotal_peso
-            total_bult += subtotal_bult
-
-            # detalle
-            for _, row in datos.iterrows():
-                tabla_datos.append(
-                    [
-                        f"{'✓' if row['rut_fec_ini'] else '◔'} {row['veh_placa']}",
-                        row["chofer_nom_comp"],
-                        row["doc_num_fac"],
-                        f"{'✓✓' if row['rd_hora_sal'] else ''} {row['doc_raz_soc']}",
-                        f"{row['doc_peso_tot']:.2f}",
-                        f"{row['doc_cant_bult']:.2f}",
-                    ]
-                )
-
-            # subtotal (guardar índice para resaltar luego)
-            tabla_datos.append(
-                [
-                    f"Total {placa[0]}",
-                    "",
-                    "",
-                    "",
-                    f"{subtotal_peso:.2f}",
-                    f"{subtotal_bult:.2f}",
-                ]
-            )
-            subtotal_idx = len(tabla_datos)
-            subtotal_rows.append(subtotal_idx)
-            tabla_datos.append([""] * len(tabla_cols))  # fila en blanco separadora
-
-        tabla_datos.append(
-            [
-                "Total General",
-                "",
-                "",
-                "",
-                f"{total_peso:.2f}",
-                f"{total_bult:.2f}",
-            ]
+    def despachados_del_dia_detallado(
+        self,
+        df: pd.DataFrame,
+        date_programen: date,
+        ruta_salida: str,
+        filas_por_pagina: Optional[int] = None,
+    ) -> List[str]:
+        """
+        Recibe un DataFrame con la data de la query y genera la tabla del
+        reporte como imágenes PNG de a lo más `filas_por_pagina` filas.
+        Retorna las rutas absolutas, una por página (`reporte.png`,
+        `reporte_2.png`, ...). Para no pasar por disco usar
+        `despachados_del_dia_paginas`.
+        """
+        paginas = self._render_despachados(df, filas_por_pagina)
+
+        base, ext = os.path.splitext(ruta_salida)
+        rutas = []
+        for numero, pagina in enumerate(paginas, start=1):
+            ruta = ruta_salida if numero == 1 else f"{base}_{numero}{ext}"
+            pagina.save(ruta)
+            rutas.append(os.path.abspath(ruta))
+        logger.info(
+            f"Reporte de {date_programen}: {len(df)} documentos en {len(rutas)} páginas"
         )
-        # crear tabla matplotlib
-        table = ax.table(
-            cellText=tabla_datos, colLabels=tabla_cols, cellLoc="center", loc="center"
+        return rutas
+
+    def _render_despachados(
+        self, df: pd.DataFrame, filas_por_pagina: Optional[int]
+    ) -> List[Image.Image]:
+        tabla = self._tabla_despachados(df)
+        renderer = RReportTable(rows_per_page=filas_por_pagina or self.FILAS_POR_PAGINA)
+        return renderer.render(tabla)
+
+    @classmethod
+    def _tabla_despachados(cls, df: pd.DataFrame) -> ReportTable:
+        """Arma las filas del reporte por placa a partir de columnas completas"""
+        datos = df[df["veh_placa"].notna()].sort_values("veh_placa", kind="stable")
+        placa = datos["veh_placa"].astype(str)
+        peso = datos["doc_peso_tot"].to_numpy(dtype="float64")
+        bult = datos["doc_cant_bult"].to_numpy(dtype="float64")
+
+        columnas = [
+            np.where(cls._marcado(datos["rut_fec_ini"]), "✓ ", "◔ ") + placa,
+            datos["chofer_nom_comp"].fillna("").astype(str),
+            datos["doc_num_fac"].fillna("").astype(str),
+            np.where(datos["rd_hora_sal"].notna(), "✓✓ ", " ")
+            + datos["doc_raz_soc"].fillna("").astype(str),
+            pd.Series(np.char.mod("%.2f", peso), index=datos.index),
+            pd.Series(np.char.mod("%.2f", bult), index=datos.index),
+        ]
+        detalle = list(zip(*(col.tolist() for col in columnas)))
+
+        # grupos contiguos de placa (datos ya ordenados)
+        placas = placa.to_numpy()
+        inicios = np.flatnonzero(np.r_[True, placas[1:] != placas[:-1]]) if len(placas) else []
+        fines = list(inicios[1:]) + [len(placas)]
+        subtotal_peso = np.add.reduceat(np.nan_to_num(peso), inicios) if len(placas) else []
+        subtotal_bult = np.add.reduceat(np.nan_to_num(bult), inicios) if len(placas) else []
+
+        filas, tipos = [], []
+        for inicio, fin, sub_peso, sub_bult in zip(inicios, fines, subtotal_peso, subtotal_bult):
+            filas.extend(detalle[inicio:fin])
+            tipos.extend([RowKind.DETALLE] * (fin - inicio))
+            filas.append((f"Total {placas[inicio]}", "", "", "", f"{sub_peso:.2f}", f"{sub_bult:.2f}"))
+            tipos.append(RowKind.SUBTOTAL)
+            filas.append(("",) * len(cls.COLUMNAS_DESPACHADOS))  # fila en blanco separadora
+            tipos.append(RowKind.SEPARADOR)
+
+        filas.append((
+            "Total General",
+            "",
+            "",
+            "",
+            f"{np.nansum(peso):.2f}",
+            f"{np.nansum(bult):.2f}",
+        ))
+        tipos.append(RowKind.TOTAL)
+
+        return ReportTable(
+            columns=cls.COLUMNAS_DESPACHADOS,
+            rows=filas,
+            kinds=tipos,
+            # Razón Social a la izquierda, Peso y Bultos a la derecha
+            align=["left", "left", "left", "left", "right", "right"],
+            header_align=["center", "center", "center", "left", "right", "right"],
         )
 
-        # estilo
-        table.auto_set_font_size(False)
-        table.set_fontsize(8)
-        table.scale(1.2, 1.2)
-
-        # Alinear Razón Social a la izquierda, Peso y Bultos a la derecha
-        nrows = len(tabla_datos) + 1  # +1 por encabezado
-        for row in range(1, nrows):
-            table[row, 0].set_text_props(ha="left")
-            table[row, 1].set_text_props(ha="left")
-            table[row, 2].set_text_props(ha="left")
-            table[row, 3].set_text_props(ha="left")
-            table[row, 4].set_text_props(ha="right")
-            table[row, 5].set_text_props(ha="right")
-
-        # resaltar encabezado y bordes
-        for (row, col), cell in table.get_celld().items():
-            cell.set_linewidth(0.7)
-            cell.set_edgecolor("#e0e0e0")
-            if row == 0:
-                cell.set_facecolor("#3b3b3b")
-                cell.set_text_props(color="white", weight="bold")
-
-            # Encabezado Razón Social a la izquierda
-            if row == 0 and col == 3:
-                cell.set_text_props(ha="left")
-
-            # Encabezado Peso y Bultos a la derecha
-            if row == 0 and col in (4, 5):
-                cell.set_text_props(ha="right")
-
-            # Subtotal: fondo gris claro y negrita
-            if row in subtotal_rows or row == nrows - 1:
-                cell.set_facecolor("#e0e0e0")
-                cell.set_text_props(weight="bold")
-
-            # if row == nrows - 1:  # Última fila (Total General)
-            #     cell.set_facecolor("#e0e0e0")
-            #     cell.set_text_props(weight="bold")
-
-        # Ajustar ancho de columna Razón Social
-        table.auto_set_column_width([0, 1, 2, 3, 4, 5])
-
-        plt.savefig(ruta_salida, bbox_inches="tight", dpi=200)
-        ruta_completa = os.path.abspath(ruta_salida)
-        plt.close()
-        return ruta_completa
+    @staticmethod
+    def _marcado(col: pd.Series) -> np.ndarray:
+        """True en booleanos/números distintos de 0; no nulo en fechas y texto"""
+        if pd.api.types.is_bool_dtype(col) or pd.api.types.is_numeric_dtype(col):
+            return col.fillna(0).astype(bool).to_numpy()
+        return col.notna().to_numpy()
@@ -1,9 +1,13 @@
 import pandas as pd
 import logging
+import re
 
-from datetime import date, datetime as dt
+from datetime import date, datetime as dt, timedelta
+from typing import Iterator, Optional, Union
 
 from interfaces.database_interface import IDatabaseConnection
+from interfaces.query_cache_interface import IQueryCache
+from stores.lru_query_cache import default_query_cache
 
 logger = logging.getLogger(__name__)
 
@@ -11,58 +15,130 @@ logger = logging.getLogger(__name__)
 class DocumentoQueryService:
     """Servicio para ejecutar consultas seguras predefinidas"""
 
-    def __init__(self, db_connection: IDatabaseConnection):
+    # TTL de la caché de resultados: los días pasados cambian poco, hoy sí.
+    # La caché es por proceso: invalidate_cache solo limpia la del proceso que
+    # editó, los demás (workers, bot) ven el cambio al vencer el TTL
+    # (settings.QUERY_CACHE_TTL_PASADO)
+    CACHE_TTL_PASADO = 5 * 60
+    CACHE_TTL_HOY = 60
+
+    def __init__(
+        self,
+        db_connection: IDatabaseConnection,
+        cache: Optional[IQueryCache] = None,
+        cache_ttl_pasado: Optional[float] = None,
+    ):
         self.db_connection = db_connection
+        self.cache = cache if cache is not None else default_query_cache
+        self.cache_ttl_pasado = (
+            self._cache_ttl_pasado_configurado() if cache_ttl_pasado is None else cache_ttl_pasado
+        )
+        # versión (huella) de los datos de la última consulta no fragmentada
+        self.last_data_version: Optional[str] = None
+
+    # Columnas lógicas de salida: alias -> expresión SQL. El orden es el del
+    # SELECT completo cuando no se pide una proyección.
+    _select_columns = {
+        "doc_id": "d.id",
+        "doc_emp": "d.Empresa",
+        "doc_num_gr": "CONCAT(d.SerieGR, '-', d.NumeroGR)",
+        "doc_num_fac": "CONCAT(d.SerieFactura, '-', d.NumeroFactura)",
+        "doc_fec_crea": "d.createAt",  # formato DATETIME nativo
+        "doc_fec_ent_gr": "DATE(d.FechaEntregaGR)",  # formato DATE
+        "doc_fec_prog_gr": "DATE(d.FechaProgramadaGR)",
+        "doc_raz_soc": "d.RazonSocial",
+        "doc_con_pag": "d.CondicionPago",
+        "doc_ag_trans": "d.AgenciaTransporte",
+        "doc_vend": "d.Vendedor",
+        "doc_imp_me": "d.ImporteME",
+        "doc_peso_tot": "d.PesoTotal",
+        "doc_excep": "d.Excepcion",
+        "doc_mot": "d.Motivo",
+        "doc_cant_bult": "d.CantidadBultos",
+
+        "rd_hora_lleg": "rd.horaLlegada",
+        "rd_hora_sal": "rd.horaSalida",
+        "rd_fec_prog": "DATE(rd.fechaProgramada)",
+
+        "rut_id": "r.id",
+        "rut_fec_ini": "r.fechaInicio",
+        "rut_fec_ret": "r.fechaRetorno",
+        "rut_lugar_sal": "r.lugar_salida",
+        "rut_fec_prog": "DATE(r.fechaProgramada)",
+
+        "veh_placa": "v.placa",
+
+        "est_desc": "estado.descripcion",
+
+        "chofer_nom_comp": "CONCAT(chofer.displayName, ' ', chofer.lastName)",
+    }
+
+    # Esquema de tipos por alias: las filas se decodifican directo a estos
+    # tipos (sin reparsear con pd.to_datetime después) y todos los bloques de
+    # una lectura por bloques comparten el mismo esquema
+    _column_dtypes = {
+        "doc_fec_crea": "datetime64[ns]",
+        "rd_hora_lleg": "datetime64[ns]",
+        "rd_hora_sal": "datetime64[ns]",
+        "doc_peso_tot": "float64",
+        "doc_imp_me": "float64",
+        "doc_cant_bult": "float64",
+        "doc_con_pag": "category",
+        "doc_mot": "category",
+        "doc_excep": "category",
+    }
+
+    # alias de tabla -> (JOIN, alias del que depende). El orden importa.
+    _joins = {
+        "rd": ("LEFT JOIN ruta_detalle AS rd ON rd.docId = d.id", None),
+        "r": ("LEFT JOIN ruta AS r ON r.id = rd.rutaId", "rd"),
+        "chofer": ("LEFT JOIN users AS chofer ON chofer.id = r.choferId", "r"),
+        "estado": ("LEFT JOIN enum_estado_pedido AS estado ON estado.id = rd.estadoId", "rd"),
+        "v": ("LEFT JOIN vehiculos AS v ON v.id = r.vehiculosId", "r"),
+    }
+
+    # ruta_detalle puede tener varias filas por documento: quitarlo cambiaría
+    # la cantidad de filas, así que siempre se une. El resto son búsquedas por
+    # clave primaria (a lo sumo una fila) y se omiten si no se usan.
+    _always_joined = ("rd",)
+
+    _table_alias_re = re.compile(r"\b([A-Za-z_]\w*)\.")
+
+    @classmethod
+    def _build_query(cls, columns: list = None, where_clauses: list = None) -> str:
+        """Arma el SELECT con solo las columnas pedidas y los JOINs que estas
+        (y las condiciones del WHERE) necesitan."""
+        columns = list(dict.fromkeys(columns)) if columns else list(cls._select_columns)
+        unknown = [c for c in columns if c not in cls._select_columns]
+        if unknown:
+            raise ValueError(f"Columnas desconocidas: {unknown}")
+
+        select_exprs = [f"{cls._select_columns[c]} AS {c}" for c in columns]
+        referenced = " ".join([cls._select_columns[c] for c in columns] + list(where_clauses or []))
+
+        needed = set(cls._always_joined)
+        for alias in cls._table_alias_re.findall(referenced):
+            while alias in cls._joins and alias not in needed:
+                needed.add(alias)
+                alias = cls._joins[alias][1]
+        joins = [join for alias, (join, _) in cls._joins.items() if alias in needed]
+
+        query = "SELECT\n    " + ",\n    ".join(select_exprs) + "\nFROM documentos AS d"
+        if joins:
+            query += "\n" + "\n".join(joins)
+        if where_clauses:
+            query += "\nWHERE\n    " + "\n    AND ".join(where_clauses)
+        return query + "\n"
+
+    @staticmethod
+    def _as_date(value) -> date:
+        """Normaliza str 'YYYY-MM-DD', date o datetime a date"""
+        if isinstance(value, dt):
+            return value.date()
+        if isinstance(value, date):
+            return value
+        return date.fromisoformat(str(value)[:10])
 
-    _query_base = """
-           SELECT
-                    d.id AS doc_id,
-                    d.Empresa AS doc_emp,
-                    CONCAT(d.SerieGR, '-', d.NumeroGR) AS doc_num_gr,
-                    CONCAT(d.SerieFactura, '-', d.NumeroFactura) AS doc_num_fac,
-                    d.createAt AS doc_fec_crea, -- formato DATETIME nativo
-                    DATE(d.FechaEntregaGR) AS doc_fec_ent_gr, -- formato DATE
-                    DATE(d.FechaProgramadaGR) AS doc_fec_prog_gr,
-                    d.RazonSocial AS doc_raz_soc,
-                    d.CondicionPago AS doc_con_pag,
-                    d.AgenciaTransporte AS doc_ag_trans,
-                    d.Vendedor AS doc_vend,
-                    d.ImporteME AS doc_imp_me,
-                    d.PesoTotal AS doc_peso_tot,
-                    d.Excepcion AS doc_excep,
-                    d.Motivo AS doc_mot,
-                    d.CantidadBultos AS doc_cant_bult,
-                    
-                    rd.horaLlegada AS rd_hora_lleg,
-                    rd.horaSalida AS rd_hora_sal,
-                    DATE(rd.fechaProgramada) AS rd_fec_prog,
-                    
-                    r.id AS rut_id,
-                    r.fechaInicio AS rut_fec_ini,
-                    r.fechaRetorno AS rut_fec_ret,
-                    r.lugar_salida AS rut_lugar_sal,
-                    DATE(r.fechaProgramada) AS rut_fec_prog,
-                    
-                    v.placa AS veh_placa,
-                    
-                    estado.descripcion AS est_desc,
-                    
-                    CONCAT(chofer.displayName, ' ', chofer.lastName) AS chofer_nom_comp
-                    
-            FROM documentos AS d
-            LEFT JOIN ruta_detalle AS rd
-                ON rd.docId = d.id
-            LEFT JOIN ruta AS r
-                ON r.id = rd.rutaId
-            LEFT JOIN users AS chofer
-                ON chofer.id = r.choferId
-            LEFT JOIN enum_estado_pedido AS estado
-                ON estado.id = rd.estadoId
-            LEFT JOIN vehiculos AS v
-                ON v.id = r.vehiculosId
-            
-        """
-    
     # Construir WHERE dinámico a partir de filters (seguro, parametrizado)
     @staticmethod
     def _build_where(base_conditions: list, filters: dict)-> tuple[list, dict]:
@@ -72,6 +148,10 @@ class DocumentoQueryService:
             - __in : lista -> columna IN %(param)s
             - __like: patrón -> columna LIKE %(param)s
             - __gt, __lt, __gte, __lte : comparadores
+            - __between_dates: (inicio, fin) o una sola fecha -> rango semiabierto
+              columna >= inicio AND columna < fin + 1 día. A diferencia de
+              DATE(columna) = ..., no envuelve la columna en una función y
+              MariaDB puede usar su índice (range scan).
             - sin sufijo: igualdad
         """ 
         where_clauses = list(base_conditions) if base_conditions else []
@@ -106,6 +186,18 @@ class DocumentoQueryService:
 
                 placeholders_str = ', '.join(placeholders)
                 where_clauses.append(f"{col} IN ({placeholders_str})")
+            elif op == 'between_dates':
+                if isinstance(value, (list, tuple)):
+                    start, end = value
+                else:
+                    start = end = value
+                start_name = f"{param_base}_start"
+                end_name = f"{param_base}_end"
+                where_clauses.append(
+                    f"{col} >= %({start_name})s AND {col} < %({end_name})s"
+                )
+                params[start_name] = DocumentoQueryService._as_date(start)
+                params[end_name] = DocumentoQueryService._as_date(end) + timedelta(days=1)
             elif op == 'like':
                 name = param_base
                 where_clauses.append(f"{col} LIKE %({name})s")
@@ -132,43 +224,104 @@ class DocumentoQueryService:
         self,
         base_conditions: list = None,
         conditions: dict = None,
-    ) -> pd.DataFrame:
+        columns: list = None,
+        chunksize: int = None,
+        cache_ttl: float = None,
+    ) -> Union[pd.DataFrame, Iterator[pd.DataFrame]]:
         """Consulta documentos con condiciones dinámicas (genérica).
 
         Parámetros
         ----------
+        columns: list, opcional
+            Columnas lógicas de salida (p.ej. ['doc_fec_crea', 'rd_hora_sal']).
+            Solo se seleccionan esas columnas y se unen las tablas que
+            necesitan. Por defecto se devuelven todas.
+        chunksize: int, opcional
+            Si se indica, devuelve un iterador de DataFrames de a lo sumo
+            `chunksize` filas leídos en streaming (como `pd.read_sql`), en vez
+            de un único DataFrame. La lectura por bloques no usa la caché.
+        cache_ttl: float, opcional
+            Segundos que el resultado queda en la caché (clave: SQL
+            normalizado + params). Por defecto `CACHE_TTL_HOY`; usar
+            `cache_ttl_for` para rangos de fechas.
         conditions: dict, opcional
             Diccionario con condiciones/ filtros. Puede incluir una clave
             especial `date_programs` para filtrar por la fecha programada
             de la ruta (equivalente a DATE(r.fechaProgramada) = ...).
             Otras claves deben usar columnas SQL y pueden llevar sufijos:
-              - __in, __like, __gt, __lt, __gte, __lte
+              - __in, __like, __gt, __lt, __gte, __lte, __between_dates
 
         Ejemplo rápido
         --------------
         conditions = {
-            'date_programs': date(2025,10,20),
+            'r.fechaProgramada__between_dates': date(2025,10,20),
             'd.Motivo__in': ['VENTA'],
             'v.placa__like': '%ABC%'
         }
-        svc.query_documents(conditions)
+        svc.query_documents(conditions=conditions, columns=['doc_num_fac', 'veh_placa'])
         """
 
         # Preparar condiciones
         conditions = conditions or {}
        
         where_clauses, extra_params = self._build_where(base_conditions, conditions)
-
-        # unir todas las cláusulas WHERE: la base (fecha) + dinámicas
-        all_where = ' AND '.join(where_clauses)
-
-        # Cortamos query_base hasta WHERE y añadimos la nueva cláusula
-        query_pre_where = self._query_base.split('WHERE')[0]
-        query = query_pre_where + 'WHERE\n                ' + all_where + '\n'
+        query = self._build_query(columns, where_clauses)
 
         logger.info(f"==>Query documentos con condiciones: {list(conditions.keys())}")
         logger.info(f"==>Params: {extra_params}")
-        return self.db_connection.execute_query_dataframe(query, extra_params)
+        if chunksize:
+            return self.db_connection.execute_query_dataframe_chunks(
+                query, extra_params, chunksize=chunksize, dtypes=self._column_dtypes
+            )
+
+        cache_key = self.cache.make_key(query, extra_params)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            logger.info("==>Resultado servido desde caché")
+            self.last_data_version = self.cache.version(cache_key)
+            return cached.copy()
+
+        df = self.db_connection.execute_query_dataframe(
+            query, extra_params, dtypes=self._column_dtypes
+        )
+        self.cache.set(
+            cache_key, df, ttl=self.CACHE_TTL_HOY if cache_ttl is None else cache_ttl
+        )
+        self.last_data_version = self.cache.version(cache_key)
+        return df.copy()
+
+    def data_version(
+        self,
+        base_conditions: list = None,
+        conditions: dict = None,
+        columns: list = None,
+    ) -> Optional[str]:
+        """Versión de los datos en caché para esta consulta, sin consultar la
+        DB ni copiar el resultado. None si no está en caché (o expiró)."""
+        where_clauses, extra_params = self._build_where(base_conditions, conditions or {})
+        query = self._build_query(columns, where_clauses)
+        return self.cache.version(self.cache.make_key(query, extra_params))
+
+    @classmethod
+    def _cache_ttl_pasado_configurado(cls) -> float:
+        """settings.QUERY_CACHE_TTL_PASADO, o el valor por defecto sin configuración (p.ej. en tests)"""
+        try:
+            from config import settings
+        except Exception as e:
+            logger.debug(f"Sin configuración de QUERY_CACHE_TTL_PASADO: {e}")
+            return cls.CACHE_TTL_PASADO
+        return settings.QUERY_CACHE_TTL_PASADO
+
+    def cache_ttl_for(self, *dates) -> float:
+        """TTL largo si todas las fechas consultadas ya pasaron, corto si no"""
+        today = date.today()
+        if dates and all(self._as_date(d) < today for d in dates):
+            return self.cache_ttl_pasado
+        return self.CACHE_TTL_HOY
+
+    def invalidate_cache(self) -> None:
+        """Hook de invalidación: llamar tras modificar documentos (solo este proceso)"""
+        self.cache.invalidate()
 
 
 
@@ -178,43 +331,60 @@ class DocumentoQueryService:
         start_date: date,
         end_date: date,
         # motivos_list: List[str]
-    ) -> pd.DataFrame:
+        columns: list = None,
+        chunksize: int = None,
+    ) -> Union[pd.DataFrame, Iterator[pd.DataFrame]]:
         """
         Obtiene documentos de entrega y detalles de ruta filtrados por rango de fecha de entrega.
+        `columns` limita las columnas devueltas y `chunksize` activa la lectura
+        por bloques (ver `query_documents`).
         """
 
-        # Asegurar que siempre sean strings YYYY-MM-DD
-        if isinstance(start_date, (date, dt)):
-            start_date = start_date.isoformat()
-        if isinstance(end_date, (date, dt)):
-            end_date = end_date.isoformat()
+        conditions = self._delivery_conditions(start_date, end_date)
+
+        logger.info(
+            f"==>Obteniendo documentos de entrega del {start_date} al {end_date}"
+        )
+        return self.query_documents(
+            conditions=conditions,
+            columns=columns,
+            chunksize=chunksize,
+            cache_ttl=self.cache_ttl_for(start_date, end_date),
+        )
+
+    def delivery_documents_version(
+        self, start_date: date, end_date: date, columns: list = None
+    ) -> Optional[str]:
+        """Versión en caché de `get_delivery_documents_by_date_range`"""
+        return self.data_version(
+            conditions=self._delivery_conditions(start_date, end_date), columns=columns
+        )
 
-        
+    @staticmethod
+    def _delivery_conditions(start_date: date, end_date: date) -> dict:
         motivos = ["VENTA", "VENTA TRANSITO", "TRASLADO E/ESTABLECIMIENTOS"]
-        conditions = {
-            # Filtro de rango de fecha (se asume que _build_where traduce esto a >= y <=)
-            # Si la columna d.createAt ya está disponible, la puedes usar
-            'DATE(d.createAt)__gte': start_date, # Fecha de creación (mayor o igual)
-            'DATE(d.createAt)__lte': end_date,   # Fecha de creación (menor o igual)
-            
+        return {
+            # Rango de fecha de creación, ambos días incluidos:
+            # d.createAt >= start_date AND d.createAt < end_date + 1 día
+            'd.createAt__between_dates': (start_date, end_date),
+
             # Filtro IN para Motivo
             'd.Motivo__in': motivos,
         }
 
-        logger.info(
-            f"==>Obteniendo documentos de entrega del {start_date} al {end_date}"
-        )
-        return self.query_documents(conditions=conditions)
-
     # Compatibilidad: wrapper con el nombre antiguo
     def get_programados_del_dia(self, date_programs: date = None, filters: dict = None) -> pd.DataFrame:
-        """Compatibilidad: pasa `filters` directamente a `query_documents`.
+        """Documentos de las rutas programadas el día `date_programs` (hoy si se omite).
 
-        Nota: `date_programs` ya no se trata como condición especial. Si quieres
-        filtrar por fecha, incluye la condición correspondiente en `filters`,
-        por ejemplo: {"DATE(r.fechaProgramada)": "2025-10-20"} o
-        {"DATE(r.fechaProgramada)__eq": "2025-10-20"}.
+        Filtra por el rango semiabierto r.fechaProgramada >= día AND
+        r.fechaProgramada < día + 1 (usa el índice de la columna). `filters`
+        agrega condiciones con la misma sintaxis de `query_documents`, p.ej.
+        {"d.Motivo__in": ["VENTA"]}.
         """
-        conditions = {"DATE(r.fechaProgramada)__eq": date_programs}
+        if date_programs is None:
+            date_programs = date.today()
+        conditions = {**(filters or {}), "r.fechaProgramada__between_dates": date_programs}
         logger.info(f"==>Obteniendo documentos programados del {conditions}")
-        return self.query_documents(conditions=conditions)
+        return self.query_documents(
+            conditions=conditions, cache_ttl=self.cache_ttl_for(date_programs)
+        )
@@ -1,8 +1,9 @@
 import logging
 
 from interfaces.database_interface import IDatabaseConnection
+from interfaces.query_cache_interface import IQueryCache
 from models.guia_model import GuiaUpdateRequest
-from typing import List
+from typing import Any, Dict, List, Optional, Tuple
 
 from models.requests import DataResponse
 from services.documento_query_service import DocumentoQueryService
@@ -13,130 +14,278 @@ logger = logging.getLogger(__name__)
 class GuiaService:
     """Servicio para manejo de guías"""
 
-    def __init__(self, db_connection: IDatabaseConnection):
+    def __init__(
+        self,
+        db_connection: IDatabaseConnection,
+        cache: Optional[IQueryCache] = None,
+    ):
         self.db_connection = db_connection
         self.doc_query_service: DocumentoQueryService = DocumentoQueryService(
-            db_connection
+            db_connection, cache=cache
         )
 
-    def update_multiple_guias(self, requests: List[GuiaUpdateRequest]) -> DataResponse:
+    # columna de `documentos` -> campo de GuiaUpdateRequest que la actualiza
+    _campos_actualizables = {
+        "NumeroGR": "guia_num",
+        "SerieGR": "guia_serie",
+        "FechaEmisionGR": "guia_fecha",
+        "FechaEntregaGR": "guia_program_fecha",
+        "FechaProgramadaGR": "guia_program_fecha",
+        "AgenciaTransporte": "guia_agencia",
+        "DireccionEnvio": "guia_env_direcion",
+        "DistritoEnvio": "guia_env_distrito",
+        "ProvinciaEnvio": "guia_env_provincia",
+        "DepartamentoEnvio": "guia_env_departamento",
+    }
+
+    _tabla_temporal = "tmp_guias_update"
+
+    @classmethod
+    def _valores_a_actualizar(cls, doc: GuiaUpdateRequest) -> Dict[str, Any]:
+        """Columnas con valor en el request (las None no se tocan)"""
+        valores = {}
+        for columna, campo in cls._campos_actualizables.items():
+            valor = getattr(doc, campo, None)
+            if valor is not None:
+                valores[columna] = valor
+        return valores
+
+    @classmethod
+    def _agrupar_por_campos(
+        cls, requests: List[GuiaUpdateRequest]
+    ) -> Dict[Tuple[str, ...], List[Tuple[GuiaUpdateRequest, Dict[str, Any]]]]:
+        """Agrupa los requests según qué columnas actualizan (mismo SET)"""
+        grupos: Dict[Tuple[str, ...], list] = {}
+        for doc in requests:
+            valores = cls._valores_a_actualizar(doc)
+            # Si no hay campos a actualizar, saltar
+            if not valores:
+                continue
+            grupos.setdefault(tuple(valores), []).append((doc, valores))
+        return grupos
+
+    @staticmethod
+    def validar_bloques(total: int, chunk_size: Optional[int], desde: int) -> None:
+        """ValueError si `chunk_size`/`desde` no describen un rango válido del payload"""
+        if chunk_size is not None and chunk_size < 1:
+            raise ValueError("chunk_size debe ser mayor o igual a 1")
+        if desde < 0:
+            raise ValueError("desde no puede ser negativo")
+        if total and desde >= total:
+            raise ValueError(f"desde ({desde}) está fuera del payload ({total} guías)")
+
+    def update_multiple_guias(
+        self,
+        requests: List[GuiaUpdateRequest],
+        bulk: bool = True,
+        chunk_size: Optional[int] = None,
+        desde: int = 0,
+    ) -> DataResponse:
         """
         Actualiza múltiples guías en la base de datos usando fact_num y fact_serie como condición.
         Retorna la cantidad de filas actualizadas.
+
+        Con `bulk=True` los requests se agrupan por las columnas que actualizan
+        y cada grupo se aplica con un único UPDATE ... JOIN contra una tabla
+        temporal cargada con executemany; si no, se envía un UPDATE por guía.
+
+        Con `chunk_size` el payload se procesa en bloques de ese tamaño con un
+        commit por bloque, para no retener locks sobre `documentos` durante
+        toda la carga. Si un bloque falla se revierte solo ese bloque y se
+        detiene el proceso; `data["reanudar_desde"]` indica el índice del
+        payload desde el que reintentar (pasarlo como `desde`).
         """
         updated_count = 0
         errors = []
         avisos = []
+        bloques = []
+        reanudar_desde = None
+        requests = list(requests)
+        self.validar_bloques(len(requests), chunk_size, desde)
+        chunk_size = chunk_size or max(len(requests) - desde, 1)
+
         try:
             with self.db_connection.get_cursor() as cursor:
-                for doc in requests:
+                for inicio in range(desde, len(requests), chunk_size):
+                    bloque = requests[inicio:inicio + chunk_size]
+                    bloque_avisos = []
+                    bloque_errores = []
+                    # La conexión es propia de esta petición (pool): transacción explícita
+                    cursor.connection.begin()
                     try:
-                        set_clauses = []
-                        params = {}
-                        if doc.guia_num is not None:
-                            set_clauses.append("NumeroGR = %(guia_num)s")
-                            params["guia_num"] = doc.guia_num
-                        if doc.guia_serie is not None:
-                            set_clauses.append("SerieGR = %(guia_serie)s")
-                            params["guia_serie"] = doc.guia_serie
-                        if hasattr(doc, "guia_fecha") and doc.guia_fecha is not None:
-                            set_clauses.append("FechaEmisionGR = %(guia_fecha)s")
-                            params["guia_fecha"] = doc.guia_fecha
-                        if (
-                            hasattr(doc, "guia_program_fecha")
-                            and doc.guia_program_fecha is not None
-                        ):
-                            set_clauses.append(
-                                "FechaEntregaGR = %(guia_program_fecha)s"
-                            )
-
-                        if (
-                            hasattr(doc, "guia_program_fecha")
-                            and doc.guia_program_fecha is not None
-                        ):
-                            set_clauses.append(
-                                "FechaProgramadaGR = %(guia_program_fecha)s"
-                            )
-                            params["guia_program_fecha"] = doc.guia_program_fecha
-                            
-                        if doc.guia_agencia is not None:
-                            set_clauses.append("AgenciaTransporte = %(guia_agencia)s")
-                            params["guia_agencia"] = doc.guia_agencia
-                            
-                        if doc.guia_env_direcion is not None:
-                            set_clauses.append("DireccionEnvio = %(guia_env_direcion)s")
-                            params["guia_env_direcion"] = doc.guia_env_direcion
-                            
-                        if doc.guia_env_distrito is not None:
-                            set_clauses.append("DistritoEnvio = %(guia_env_distrito)s")
-                            params["guia_env_distrito"] = doc.guia_env_distrito
-                            
-                        if doc.guia_env_provincia is not None:
-                            set_clauses.append("ProvinciaEnvio = %(guia_env_provincia)s")
-                            params["guia_env_provincia"] = doc.guia_env_provincia
-                            
-                        if doc.guia_env_departamento is not None:
-                            set_clauses.append("DepartamentoEnvio = %(guia_env_departamento)s")
-                            params["guia_env_departamento"] = doc.guia_env_departamento
-                            
-                        # Si no hay campos a actualizar, saltar
-                        if not set_clauses:
-                            continue
-                        params["fact_num"] = doc.fact_num
-                        params["fact_serie"] = doc.fact_serie
-                        update_query = f"""
-                            UPDATE documentos 
-                            SET {', '.join(set_clauses)}
-                            WHERE NumeroFactura = %(fact_num)s AND SerieFactura = %(fact_serie)s
-                        """
-                        cursor.execute(update_query, params)
-                        if cursor.rowcount == 0:
-                            aviso = f"No se encontro FT {doc.fact_serie}-{doc.fact_num}, o no hay informacion que actualizar."
-                            logger.warning(aviso)
-                            avisos.append(aviso)
+                        if bulk:
+                            actualizados = self._actualizar_en_bloque(cursor, bloque, bloque_avisos, bloque_errores)
                         else:
-                            updated_count += 1
+                            actualizados = self._actualizar_por_fila(cursor, bloque, bloque_avisos, bloque_errores)
                     except Exception as e:
-                        error_msg = f"Error actualizando guia para la FT {doc.fact_serie}-{doc.fact_num}: {e}"
-                        logger.error(error_msg)
-                        errors.append(error_msg)
-                # Commit si no hay errores
-                if len(errors) == 0:
-                    self.db_connection.connection.commit()
-                else:
-                    self.db_connection.connection.rollback()
+                        actualizados = 0
+                        bloque_errores.append(f"Error en la transacción: {e}")
+
+                    # Commit del bloque si no hay errores
+                    if len(bloque_errores) == 0:
+                        cursor.connection.commit()
+                        updated_count += actualizados
+                        estado = "confirmado"
+                    else:
+                        cursor.connection.rollback()
+                        actualizados = 0
+                        estado = "revertido"
+
+                    avisos.extend(bloque_avisos)
+                    errors.extend(bloque_errores)
+                    bloques.append(
+                        {
+                            "desde": inicio,
+                            "hasta": inicio + len(bloque),
+                            "estado": estado,
+                            "actualizados": actualizados,
+                            "avisos": len(bloque_avisos),
+                            "errores": len(bloque_errores),
+                        }
+                    )
+                    if bloque_errores:
+                        reanudar_desde = inicio
+                        break
         except Exception as e:
             logger.error(f"Error en la transacción de actualización masiva: {e}")
             errors.append(f"Error en la transacción: {e}")
+            if reanudar_desde is None:
+                reanudar_desde = bloques[-1]["hasta"] if bloques else desde
         finally:
-            try:
-                self.db_connection.disconnect()
-            except Exception as e:
-                logger.error(f"Error cerrando la conexión a la base de datos: {e}")
+            if updated_count > 0:
+                # los reportes en caché pueden incluir estas guías (los otros
+                # procesos las ven al vencer QUERY_CACHE_TTL_PASADO)
+                self.doc_query_service.invalidate_cache()
+
         if len(errors) == 0 and len(avisos) > 0:
             message = "Actualizacion masiva realizada parcialmente. Algunos documentos no se encontraron."
         elif len(errors) == 0:
             message = "Actualizacion masiva realizada con exito!"
         else:
-            message = "Error en la actualizacion masiva."
+            message = f"Error en la actualizacion masiva. Reintentar desde el registro {reanudar_desde}."
         return {
             "success": len(errors) == 0 and len(avisos) == 0,
-            "data": {"errores": errors, "avisos": avisos},
+            "data": {
+                "errores": errors,
+                "avisos": avisos,
+                "bloques": bloques,
+                "reanudar_desde": reanudar_desde,
+            },
             "message": message,
             "rows_count": updated_count,
         }
 
+    @staticmethod
+    def _aviso_no_encontrado(doc: GuiaUpdateRequest) -> str:
+        aviso = f"No se encontro FT {doc.fact_serie}-{doc.fact_num}, o no hay informacion que actualizar."
+        logger.warning(aviso)
+        return aviso
+
+    def _actualizar_por_fila(self, cursor, requests, avisos: list, errors: list) -> int:
+        """Un UPDATE por guía"""
+        updated_count = 0
+        for doc in requests:
+            try:
+                valores = self._valores_a_actualizar(doc)
+                # Si no hay campos a actualizar, saltar
+                if not valores:
+                    continue
+                set_clauses = [f"{col} = %({col})s" for col in valores]
+                params = dict(valores)
+                params["fact_num"] = doc.fact_num
+                params["fact_serie"] = doc.fact_serie
+                update_query = f"""
+                    UPDATE documentos 
+                    SET {', '.join(set_clauses)}
+                    WHERE NumeroFactura = %(fact_num)s AND SerieFactura = %(fact_serie)s
+                """
+                cursor.execute(update_query, params)
+                if cursor.rowcount == 0:
+                    avisos.append(self._aviso_no_encontrado(doc))
+                else:
+                    updated_count += 1
+            except Exception as e:
+                error_msg = f"Error actualizando guia para la FT {doc.fact_serie}-{doc.fact_num}: {e}"
+                logger.error(error_msg)
+                errors.append(error_msg)
+        return updated_count
+
+    def _actualizar_en_bloque(self, cursor, requests, avisos: list, errors: list) -> int:
+        """Un UPDATE ... JOIN por grupo de requests con las mismas columnas"""
+        updated_count = 0
+        tmp = self._tabla_temporal
+        for columnas, items in self._agrupar_por_campos(requests).items():
+            try:
+                cols_sql = ", ".join(columnas)
+                # Misma definición de columnas que documentos; sin ALTER TABLE
+                # para no provocar un commit implícito
+                cursor.execute(f"DROP TEMPORARY TABLE IF EXISTS {tmp}")
+                cursor.execute(
+                    f"""
+                    CREATE TEMPORARY TABLE {tmp} (INDEX (NumeroFactura, SerieFactura))
+                    AS SELECT SerieFactura, NumeroFactura, {cols_sql} FROM documentos LIMIT 0
+                    """
+                )
+
+                # Si una FT se repite en el grupo, gana la última (como por fila)
+                filas = {}
+                for doc, valores in items:
+                    filas[(str(doc.fact_serie), str(doc.fact_num))] = (
+                        doc.fact_serie,
+                        doc.fact_num,
+                        *valores.values(),
+                    )
+                placeholders = ", ".join(["%s"] * (len(columnas) + 2))
+                cursor.executemany(
+                    f"INSERT INTO {tmp} (SerieFactura, NumeroFactura, {cols_sql}) VALUES ({placeholders})",
+                    list(filas.values()),
+                )
+
+                cursor.execute(
+                    f"""
+                    SELECT DISTINCT t.SerieFactura, t.NumeroFactura
+                    FROM {tmp} AS t
+                    JOIN documentos AS d
+                        ON d.NumeroFactura = t.NumeroFactura AND d.SerieFactura = t.SerieFactura
+                    """
+                )
+                encontrados = {
+                    (str(row["SerieFactura"]), str(row["NumeroFactura"]))
+                    for row in cursor.fetchall()
+                }
+
+                set_sql = ", ".join(f"d.{col} = t.{col}" for col in columnas)
+                cursor.execute(
+                    f"""
+                    UPDATE documentos AS d
+                    JOIN {tmp} AS t
+                        ON d.NumeroFactura = t.NumeroFactura AND d.SerieFactura = t.SerieFactura
+                    SET {set_sql}
+                    """
+                )
+                cursor.execute(f"DROP TEMPORARY TABLE IF EXISTS {tmp}")
+
+                for doc, _ in items:
+                    if (str(doc.fact_serie), str(doc.fact_num)) in encontrados:
+                        updated_count += 1
+                    else:
+                        avisos.append(self._aviso_no_encontrado(doc))
+            except Exception as e:
+                error_msg = f"Error actualizando {len(items)} guias con campos {list(columnas)}: {e}"
+                logger.error(error_msg)
+                errors.append(error_msg)
+        return updated_count
+
     def get_guias_by_fecha_programada(self, filters: dict = None) -> List[dict]:
         """
         Obtiene guías filtradas por fecha programada. Las condiciones pueden incluir
-        por ejemplo: {"DATE(r.fechaProgramada)": "2025-10-20"} o
-        {"DATE(r.fechaProgramada)__eq": "2025-10-20"}.
+        por ejemplo: {"r.fechaProgramada__between_dates": "2025-10-20"}.
         """
         # Preparar condiciones
         motivos = ["VENTA", "VENTA TRANSITO", "TRASLADO E/ESTABLECIMIENTOS"]
         base_where = ["r.id IS NOT NULL"]
         conditions = {
-            "DATE(rd.horaLlegada)__eq": "2025-08-20",
+            "rd.horaLlegada__between_dates": "2025-08-20",
             "d.Motivo__in": motivos,
             "r.lugar_salida__eq": "PLANTA",
         }
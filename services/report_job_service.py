@@ -0,0 +1,147 @@
+import logging
+import os
+import socket
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type
+from pydantic import BaseModel
+from interfaces.report_job_store import IReportJobStore
+from models.report_job import ReportJob
+from models.requests import DashboardJobParams, ProgramadosDelDiaJobParams
+from services.report_render_service import ReportRenderService
+from views.generate_dashboard.image_buffer import encode_image
+
+logger = logging.getLogger(__name__)
+
+# params -> (artefactos, mimetype)
+JobRenderer = Callable[[Dict[str, Any]], Tuple[List[bytes], str]]
+
+# parámetros que acepta cada tipo de trabajo; se validan al encolar
+REPORT_JOB_PARAMS: Dict[str, Type[BaseModel]] = {
+    "programados_del_dia": ProgramadosDelDiaJobParams,
+    "dashboard": DashboardJobParams,
+}
+
+
+def report_job_renderers(report_service: ReportRenderService) -> Dict[str, JobRenderer]:
+    """Tipos de trabajo soportados y cómo se renderiza cada uno"""
+
+    def programados_del_dia(params: Dict[str, Any]) -> Tuple[List[bytes], str]:
+        fecha = params.get("fecha") or date.today().isoformat()
+        pages = report_service.route_report_pages(fecha)
+        if not pages:
+            raise ValueError(f"No hay datos para la fecha {fecha}")
+        return pages, "image/png"
+
+    def dashboard(params: Dict[str, Any]) -> Tuple[List[bytes], str]:
+        img = report_service.build_dashboard(
+            start_date=params["start_date"],
+            end_date=params["end_date"],
+            fecha_programados=params.get("fecha_programados"),
+        )
+        return [encode_image(img).getvalue()], "image/png"
+
+    return {"programados_del_dia": programados_del_dia, "dashboard": dashboard}
+
+
+class ReportJobService:
+    """
+    Ejecuta trabajos de reportes en segundo plano. `submit` solo encola en el
+    store persistente y retorna el trabajo; un pool acotado de hilos toma los
+    trabajos de la cola, los renderiza y guarda los artefactos. Así la
+    petición HTTP no espera el render.
+
+    Cada proceso marca los trabajos que toma con su `worker_id` y les renueva
+    el latido cada `stale_after / 3` segundos; los trabajos `running` sin
+    latido por más de `stale_after` (su proceso murió o se reinició) vuelven
+    a la cola. Un render largo de otro worker vivo no se repite.
+    """
+
+    def __init__(
+        self,
+        store: IReportJobStore,
+        renderers: Dict[str, JobRenderer],
+        max_workers: int = 2,
+        stale_after: float = 60,
+        retention: float = 24 * 60 * 60,
+        param_models: Optional[Dict[str, Type[BaseModel]]] = None,
+    ):
+        self.store = store
+        self.renderers = renderers
+        self.param_models = REPORT_JOB_PARAMS if param_models is None else param_models
+        self.retention = retention
+        self.stale_after = stale_after
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="report-job"
+        )
+        self._stopped = threading.Event()
+        self._maintenance = threading.Thread(
+            target=self._maintenance_loop, name="report-job-heartbeat", daemon=True
+        )
+        self._maintenance.start()
+
+    def submit(self, tipo: str, params: Optional[Dict[str, Any]] = None) -> ReportJob:
+        """Encola el trabajo; lanza ValueError (o ValidationError) si el tipo o los params no son válidos"""
+        if tipo not in self.renderers:
+            raise ValueError(
+                f"Tipo de reporte no soportado: {tipo}. Opciones: {sorted(self.renderers)}"
+            )
+        params = params or {}
+        model = self.param_models.get(tipo)
+        if model is not None:
+            # se guardan normalizados (fechas ISO) para que el render no falle después
+            params = model(**params).model_dump(mode="json", exclude_none=True)
+        self.store.purge(self.retention)
+        job = self.store.enqueue(tipo, params)
+        logger.info(f"📥 Trabajo de reporte {job.id} ({tipo}) encolado")
+        self.executor.submit(self._drain)
+        return job
+
+    def get(self, job_id: str) -> Optional[ReportJob]:
+        return self.store.get(job_id)
+
+    def get_artifact(self, job_id: str, index: int = 0) -> Optional[bytes]:
+        return self.store.get_artifact(job_id, index)
+
+    def maintain(self) -> None:
+        """Latido de los trabajos de este proceso y re-encolado de los abandonados"""
+        try:
+            self.store.heartbeat(self.worker_id)
+            if self.store.requeue_stale(self.stale_after) and not self._stopped.is_set():
+                self.executor.submit(self._drain)
+        except Exception as e:
+            logger.error(f"❌ Error en el mantenimiento de la cola de reportes: {e}")
+
+    def _maintenance_loop(self) -> None:
+        # la primera pasada retoma lo que dejó a medias un reinicio
+        while True:
+            self.maintain()
+            if self._stopped.wait(self.stale_after / 3):
+                return
+
+    def _drain(self) -> None:
+        """Procesa trabajos en cola hasta vaciarla (corre en el pool)"""
+        while True:
+            job = self.store.claim_next(self.worker_id)
+            if job is None:
+                return
+            self._run(job)
+
+    def _run(self, job: ReportJob) -> None:
+        renderer = self.renderers.get(job.tipo)
+        try:
+            if renderer is None:
+                raise ValueError(f"Tipo de reporte no soportado: {job.tipo}")
+            artifacts, mimetype = renderer(job.params)
+            self.store.complete(job.id, artifacts, mimetype)
+            logger.info(f"✅ Trabajo de reporte {job.id} terminado ({len(artifacts)} artefactos)")
+        except Exception as e:
+            logger.error(f"❌ Error en trabajo de reporte {job.id}: {e}")
+            self.store.fail(job.id, str(e))
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._stopped.set()
+        self.executor.shutdown(wait=wait)
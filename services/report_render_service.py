@@ -0,0 +1,145 @@
+import logging
+import os
+from datetime import date
+from typing import List, NamedTuple, Optional, Sequence, Union
+from PIL import Image
+from interfaces.database_interface import IDatabaseConnection
+from services.data_analysis_service import DataAnalysisService
+from services.documento_query_service import DocumentoQueryService
+from stores.report_delivery_cache import ReportDeliveryCache, default_report_delivery_cache
+from views.generate_dashboard.generate_dashboard import GenerateDashboard
+
+logger = logging.getLogger(__name__)
+
+
+class RouteReport(NamedTuple):
+    """Reporte listo para enviar: bytes de cada página o file_id en caché"""
+
+    key: str
+    pages: List[Union[bytes, str]]
+    cached: bool
+
+
+class ReportRenderService:
+    """
+    Arma los reportes diarios (tabla de rutas y dashboard) a partir de la DB.
+    Lo comparten los handlers del bot, el scheduler que pre-calcula la tabla
+    de rutas (las páginas quedan en la caché de entregas, así la primera
+    petición del día ya no consulta ni dibuja desde cero) y los trabajos de
+    reportes de la API. Todos los métodos son bloqueantes.
+    """
+
+    TIPOS_RUTA = ("programados", "despachados")
+
+    def __init__(
+        self,
+        db_connection: IDatabaseConnection,
+        delivery_cache: Optional[ReportDeliveryCache] = None,
+        data_analysis_service: Optional[DataAnalysisService] = None,
+        dashboard_render_workers: int = 0,
+    ):
+        self.db_connection = db_connection
+        self.delivery_cache = (
+            delivery_cache if delivery_cache is not None else default_report_delivery_cache
+        )
+        self.data_analysis_service = data_analysis_service or DataAnalysisService()
+        self.dashboard_render_workers = dashboard_render_workers
+
+    @staticmethod
+    def report_date():
+        """Fecha de los reportes del día (fija en modo DEBUG)"""
+        mode = os.getenv("DEBUG")
+        return "2025-01-02" if mode == "True" else date.today()
+
+    def _query_service(self) -> DocumentoQueryService:
+        return DocumentoQueryService(db_connection=self.db_connection)
+
+    def build_route_report(self, tipo: str, date_value) -> Optional[RouteReport]:
+        """Reporte de rutas del día para enviar por Telegram.
+
+        Si ya se entregó un reporte con los mismos datos se devuelven sus
+        file_id; si ya está pre-renderizado, sus páginas. Retorna None si no
+        hay documentos para la fecha.
+        """
+        df = self._query_service().get_programados_del_dia(date_value)
+        if df.empty:
+            return None
+
+        key = ReportDeliveryCache.make_key(tipo, date_value, df)
+        file_ids = self.delivery_cache.get(key)
+        if file_ids:
+            return RouteReport(key=key, pages=file_ids, cached=True)
+
+        pages = self.delivery_cache.get_pages(key)
+        if pages is None:
+            pages = self._render_route_pages(df, date_value)
+            self.delivery_cache.set_pages(key, pages)
+        return RouteReport(key=key, pages=pages, cached=False)
+
+    def _render_route_pages(self, df, date_value) -> List[bytes]:
+        # páginas codificadas en memoria: sin archivos compartidos en disco
+        buffers = self.data_analysis_service.despachados_del_dia_paginas(
+            df=df, date_programen=date_value
+        )
+        return [buffer.getvalue() for buffer in buffers]
+
+    def route_report_pages(self, date_value, tipo: str = "programados") -> List[bytes]:
+        """Páginas PNG del reporte de rutas ([] si no hay documentos)"""
+        df = self._query_service().get_programados_del_dia(date_value)
+        if df.empty:
+            return []
+        key = ReportDeliveryCache.make_key(tipo, date_value, df)
+        pages = self.delivery_cache.get_pages(key)
+        if pages is None:
+            pages = self._render_route_pages(df, date_value)
+            self.delivery_cache.set_pages(key, pages)
+        return pages
+
+    def warm_route_reports(self, date_value, tipos: Sequence[str] = TIPOS_RUTA) -> int:
+        """Consulta y renderiza una sola vez las páginas de todos los tipos.
+
+        Retorna la cantidad de páginas dejadas en caché por tipo.
+        """
+        df = self._query_service().get_programados_del_dia(date_value)
+        if df.empty:
+            logger.info(f"📭 Sin rutas programadas para {date_value}, nada que pre-calcular")
+            return 0
+
+        pages = None
+        for tipo in tipos:
+            key = ReportDeliveryCache.make_key(tipo, date_value, df)
+            if self.delivery_cache.get(key) or self.delivery_cache.get_pages(key):
+                continue
+            # todos los tipos usan la misma tabla: se renderiza una vez
+            if pages is None:
+                pages = self._render_route_pages(df, date_value)
+            self.delivery_cache.set_pages(key, pages)
+        return len(pages or [])
+
+    def build_dashboard(
+        self,
+        start_date,
+        end_date,
+        fecha_programados=None,
+        ruta_salida: Optional[str] = None,
+    ) -> Image.Image:
+        """Dashboard del rango de fechas (los tiles sin cambios salen de caché)"""
+        df_response = self._query_service().get_delivery_documents_by_date_range(
+            start_date=start_date,
+            end_date=end_date,
+            columns=(
+                DataAnalysisService.COLUMNAS_PROMEDIO_TIEMPO_DESPACHO
+                + DataAnalysisService.COLUMNAS_EXCEPCIONES
+                + DataAnalysisService.COLUMNAS_PROGRAMADOS_DEL_DIA
+            ),
+        )
+        analysis = self.data_analysis_service
+        dashboard = GenerateDashboard(render_workers=self.dashboard_render_workers)
+        return dashboard.init(
+            data_tiempo_promedio=analysis.get_promedio_tiempo_despacho(df_response),
+            data_exceptions=analysis.find_exceptions(df_response),
+            data_programados_del_dia=analysis.find_programados_del_dia(
+                df_response, fecha_programados or end_date
+            ),
+            ruta_salida=ruta_salida,
+        )
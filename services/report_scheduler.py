@@ -0,0 +1,82 @@
+import asyncio
+import logging
+from concurrent.futures import Executor, ThreadPoolExecutor
+from datetime import datetime, time, timedelta
+from typing import Callable, Optional, Sequence
+from services.report_render_service import ReportRenderService
+
+logger = logging.getLogger(__name__)
+
+
+class ReportScheduler:
+    """
+    Pre-calcula los reportes de rutas del día a horas fijas (p.ej. antes de
+    que los operadores pidan /ruta_programada_hoy a primera hora): ejecuta
+    la consulta, renderiza la tabla y deja las páginas en la caché de
+    entregas del bot. Corre como tarea de asyncio junto al bot; el trabajo
+    bloqueante va a su propio executor (por defecto un hilo), no al de los
+    reportes que piden los usuarios.
+    """
+
+    def __init__(
+        self,
+        report_service: ReportRenderService,
+        times: Sequence[time],
+        executor: Optional[Executor] = None,
+        now: Callable[[], datetime] = datetime.now,
+    ):
+        self.report_service = report_service
+        self.times = sorted(times)
+        self._owns_executor = executor is None
+        self.executor = executor or ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="report-precompute"
+        )
+        self._now = now
+        self._task: Optional[asyncio.Task] = None
+
+    def next_run(self, now: datetime) -> datetime:
+        """Próxima hora programada estrictamente posterior a `now`"""
+        for day in (now.date(), now.date() + timedelta(days=1)):
+            for at in self.times:
+                candidate = datetime.combine(day, at)
+                if candidate > now:
+                    return candidate
+        raise ValueError("No hay horas de pre-cálculo configuradas")
+
+    def precompute(self, date_value=None) -> None:
+        """Calienta las cachés de los reportes del día (bloqueante)"""
+        date_value = date_value or self.report_service.report_date()
+        logger.info(f"⏰ Pre-calculando reportes de {date_value}")
+        try:
+            pages = self.report_service.warm_route_reports(date_value)
+            logger.info(f"✅ Reporte de rutas pre-renderizado ({pages} páginas)")
+        except Exception as e:
+            logger.error(f"❌ Error pre-calculando el reporte de rutas: {e}")
+
+    async def run_once(self, date_value=None) -> None:
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self.executor, self.precompute, date_value)
+
+    async def run_forever(self) -> None:
+        while True:
+            now = self._now()
+            wait = (self.next_run(now) - now).total_seconds()
+            logger.info(f"⏰ Próximo pre-cálculo de reportes en {wait:.0f} s")
+            await asyncio.sleep(wait)
+            await self.run_once()
+
+    def start(self) -> Optional[asyncio.Task]:
+        """Lanza el scheduler en el loop actual (nada si no hay horas)"""
+        if not self.times:
+            logger.info("Pre-cálculo de reportes desactivado")
+            return None
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run_forever())
+        return self._task
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        if self._owns_executor:
+            self.executor.shutdown(wait=False, cancel_futures=True)
@@ -1,31 +1,58 @@
 import asyncio
 import logging
+from typing import Optional
 from telegram import BotCommand
 from telegram.ext import Application, CommandHandler, CallbackQueryHandler
 from interfaces.database_interface import IDatabaseConnection
 from interfaces.telegram_authorization_store import ITelegramAuthorizationStore
+from services.report_render_service import ReportRenderService
 from services.telegram_handlers import BotHandlers
 
 logger = logging.getLogger(__name__)
 
 class TelegramBotService:
-    def __init__(self, token: str, admin_id: int, auth_store: ITelegramAuthorizationStore, db_connection: IDatabaseConnection):
+    def __init__(
+        self,
+        token: str,
+        admin_id: int,
+        auth_store: ITelegramAuthorizationStore,
+        db_connection: IDatabaseConnection,
+        concurrent_updates: int = 32,
+        report_workers: int = 4,
+        reports_per_user: int = 1,
+        report_service: Optional[ReportRenderService] = None,
+    ):
         self.token = token
         self.admin_id = admin_id
         self.auth_store =  auth_store
+        self.concurrent_updates = concurrent_updates
 
         self.handlers = BotHandlers(
             admin_id=admin_id, 
             auth_store=self.auth_store, 
-            db_connection=db_connection
+            db_connection=db_connection,
+            max_workers=report_workers,
+            max_reports_per_user=reports_per_user,
+            report_service=report_service,
         )
 
-    async def run(self):
-        app = Application.builder().token(self.token).build()
+    def build_application(self) -> Application:
+        # Sin concurrent_updates PTB procesa un update a la vez: un reporte
+        # lento dejaría en espera a todos los demás usuarios
+        app = (
+            Application.builder()
+            .token(self.token)
+            .concurrent_updates(self.concurrent_updates)
+            .build()
+        )
 
         app.add_handler(CommandHandler("start", self.handlers.start))
         app.add_handler(CommandHandler("ruta_programada_hoy", self.handlers.ruta_programada_hoy))
         app.add_handler(CallbackQueryHandler(self.handlers.button))
+        return app
+
+    async def run(self):
+        app = self.build_application()
 
         # Registrar lista de comandos para autocompletado
         commands = [
@@ -38,5 +65,8 @@ class TelegramBotService:
         await app.start()
         logger.info("🤖 Bot de Telegram iniciado...")
 
-        await app.updater.start_polling()
-        await asyncio.Event().wait()
+        try:
+            await app.updater.start_polling()
+            await asyncio.Event().wait()
+        finally:
+            self.handlers.shutdown()
@@ -1,17 +1,28 @@
+import asyncio
+import functools
 import logging
-from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
+from concurrent.futures import Executor, ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Callable, Dict, List, Optional, Sequence, TypeVar, Union
+from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup, InputMediaPhoto
+from telegram.constants import ChatAction
+from telegram.error import TelegramError
 from telegram.ext import ContextTypes
 from interfaces.database_interface import IDatabaseConnection
 from interfaces.telegram_authorization_store import ITelegramAuthorizationStore
 from interfaces.telegram_handlers_interfce import IBotHandlers
-from services.data_analysis_service import DataAnalysisService
-from services.documento_query_service import DocumentoQueryService
-from datetime import date
-from telegram import InputFile
-import os
+from services.report_render_service import ReportRenderService, RouteReport
+from stores.report_delivery_cache import ReportDeliveryCache
 
 logger = logging.getLogger(__name__)
 
+# Telegram admite hasta 10 fotos por álbum (media group)
+MAX_MEDIA_GROUP = 10
+# La acción de chat ("enviando foto...") dura ~5 s en el cliente
+CHAT_ACTION_INTERVAL = 4
+
+T = TypeVar("T")
+
 
 class BotHandlers(IBotHandlers):
     def __init__(
@@ -19,14 +30,79 @@ class BotHandlers(IBotHandlers):
         admin_id: int,
         auth_store: ITelegramAuthorizationStore,
         db_connection: IDatabaseConnection,
+        executor: Optional[Executor] = None,
+        max_workers: int = 4,
+        auth_executor: Optional[Executor] = None,
+        max_reports_per_user: int = 1,
+        delivery_cache: Optional[ReportDeliveryCache] = None,
+        report_service: Optional[ReportRenderService] = None,
     ):
         self.admin_id = int(admin_id)
         self.auth_store = auth_store
         self.db_connection = db_connection
+        # Consultas SQL y renders bloquean: se ejecutan fuera del event loop
+        # en un pool acotado para que el polling siga atendiendo a otros
+        self.executor = executor or ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="bot-report"
+        )
+        # permisos y altas van aparte: /start no espera detrás de los renders
+        self.auth_executor = auth_executor or ThreadPoolExecutor(
+            max_workers=2, thread_name_prefix="bot-auth"
+        )
+        self.max_reports_per_user = max_reports_per_user
+        self._user_slots: Dict[int, asyncio.Semaphore] = {}
+        self.report_service = report_service or ReportRenderService(
+            db_connection=db_connection, delivery_cache=delivery_cache
+        )
+        self.delivery_cache = self.report_service.delivery_cache
+
+    async def _run_blocking(self, fn: Callable[..., T], *args, **kwargs) -> T:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.executor, functools.partial(fn, *args, **kwargs)
+        )
+
+    async def _run_auth(self, fn: Callable[..., T], *args, **kwargs) -> T:
+        # el store cacheado responde en memoria, pero al vencer el TTL recarga de la DB
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.auth_executor, functools.partial(fn, *args, **kwargs)
+        )
+
+    async def _is_authorized(self, user_id: int) -> bool:
+        return await self._run_auth(self.auth_store.is_authorized, user_id)
+
+    def shutdown(self) -> None:
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.auth_executor.shutdown(wait=False, cancel_futures=True)
+
+    def _user_slot(self, user_id: int) -> asyncio.Semaphore:
+        slot = self._user_slots.get(user_id)
+        if slot is None:
+            slot = self._user_slots[user_id] = asyncio.Semaphore(self.max_reports_per_user)
+        return slot
+
+    @asynccontextmanager
+    async def _chat_action(self, context: ContextTypes.DEFAULT_TYPE, chat_id: int, action: str):
+        """Mantiene visible la acción de chat mientras dura el bloque"""
+
+        async def keep_alive():
+            while True:
+                try:
+                    await context.bot.send_chat_action(chat_id=chat_id, action=action)
+                except Exception as e:
+                    logger.warning(f"⚠️ No se pudo enviar la acción de chat: {e}")
+                await asyncio.sleep(CHAT_ACTION_INTERVAL)
+
+        task = asyncio.create_task(keep_alive())
+        try:
+            yield
+        finally:
+            task.cancel()
 
     async def start(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         user_id = update.effective_user.id
-        if self.auth_store.is_authorized(user_id):
+        if await self._is_authorized(user_id):
             await update.message.reply_text("✅ Bienvenido, ya tienes acceso.")
         else:
             keyboard = [
@@ -58,8 +134,10 @@ class BotHandlers(IBotHandlers):
 
         if query.from_user.id == self.admin_id:
             if action == "accept":
-                self.auth_store.add_user(
-                    user_id, username=update.effective_user.first_name
+                await self._run_auth(
+                    self.auth_store.add_user,
+                    user_id,
+                    username=update.effective_user.first_name,
                 )
                 await query.edit_message_text(f"✅ Usuario {user_id} autorizado.")
                 await context.bot.send_message(
@@ -74,76 +152,112 @@ class BotHandlers(IBotHandlers):
     async def ruta_programada_hoy(
         self, update: Update, context: ContextTypes.DEFAULT_TYPE
     ):
-        user_id = update.effective_user.id
-        if self.auth_store.is_authorized(user_id):
-            mode = os.getenv("DEBUG")
-            date_value = "2025-01-02" if mode == "True" else date.today()
-            documento_query_service = DocumentoQueryService(
-                db_connection=self.db_connection
-            )  # Aquí deberías pasar la conexión real
-            data_analysis_service = DataAnalysisService()
-
-            df = documento_query_service.get_programados_del_dia(date_value)
-            if df.empty:
-                await update.message.reply_text("📭 No hay rutas programadas para hoy.")
-                return
-
-            path_rute_image = data_analysis_service.despachados_del_dia_detallado(
-                df=df,
-                ruta_salida="reporte_programados_hoy.png",
-                date_programen=date_value,
-            )
-            if path_rute_image:
-                with open(path_rute_image, "rb") as photo:
-                    await update.message.reply_photo(
-                        photo=InputFile(photo),
-                        caption=f"📋 Rutas programadas para hoy ({date_value})",
-                    )
-            else:
-                await update.message.reply_text(
-                    "⚠️ No se pudo generar el reporte en imagen."
-                )
-
-        else:
-            await update.message.reply_text(
-                "🚫 No tienes permiso para usar este comando. Usa /start para solicitar acceso."
-            )
+        await self._reply_route_report(
+            update,
+            context,
+            tipo="programados",
+            empty_message="📭 No hay rutas programadas para hoy.",
+            caption="📋 Rutas programadas para hoy",
+        )
 
     async def ruta_despachados(
         self, update: Update, context: ContextTypes.DEFAULT_TYPE
+    ):
+        await self._reply_route_report(
+            update,
+            context,
+            tipo="despachados",
+            empty_message="📭 No hay rutas despachadas para hoy.",
+            caption="📋 Rutas despachadas para hoy",
+        )
+
+    async def _reply_route_report(
+        self,
+        update: Update,
+        context: ContextTypes.DEFAULT_TYPE,
+        tipo: str,
+        empty_message: str,
+        caption: str,
     ):
         user_id = update.effective_user.id
-        if self.auth_store.is_authorized(user_id):
-            mode = os.getenv("DEBUG")
-            date_value = "2025-01-02" if mode == "True" else date.today()
-            # date_value = date.today()
-            documento_query_service = DocumentoQueryService(
-                db_connection=self.db_connection
-            )  # Aquí deberías pasar la conexión real
-            data_analysis_service = DataAnalysisService()
-
-            df = documento_query_service.get_programados_del_dia(date_value)
-            if df.empty:
-                await update.message.reply_text("📭 No hay rutas despachadas para hoy.")
-                return
-
-            path_rute_image = data_analysis_service.generar_reporte_imagen(
-                df=df,
-                ruta_salida="reporte_despachados_hoy.png",
-                date_programen=date_value,
+        if not await self._is_authorized(user_id):
+            await update.message.reply_text(
+                "🚫 No tienes permiso para usar este comando. Usa /start para solicitar acceso."
             )
-            if path_rute_image:
-                with open(path_rute_image, "rb") as photo:
-                    await update.message.reply_photo(
-                        photo=InputFile(photo),
-                        caption=f"📋 Rutas despachadas para hoy ({date_value})",
-                    )
-            else:
-                await update.message.reply_text(
-                    "⚠️ No se pudo generar el reporte en imagen."
-                )
+            return
 
-        else:
+        slot = self._user_slot(user_id)
+        if slot.locked():
             await update.message.reply_text(
-                "🚫 No tienes permiso para usar este comando. Usa /start para solicitar acceso."
+                "⏳ Ya estoy generando un reporte para ti, espera a que termine."
             )
+            return
+
+        date_value = self.report_service.report_date()
+        async with slot:
+            async with self._chat_action(
+                context, update.effective_chat.id, ChatAction.UPLOAD_PHOTO
+            ):
+                report = await self._run_blocking(
+                    self._build_route_report, tipo, date_value
+                )
+                caption = f"{caption} ({date_value})"
+                if report is None:
+                    await update.message.reply_text(empty_message)
+                    return
+
+                if report.cached:
+                    try:
+                        await self._reply_pages(update, report.pages, caption)
+                        return
+                    except TelegramError as e:
+                        # file_id vencido o inválido: se vuelve a renderizar y subir
+                        logger.warning(f"⚠️ file_id en caché no válido ({e}), se regenera")
+                        self.delivery_cache.invalidate(report.key)
+                        report = await self._run_blocking(
+                            self._build_route_report, tipo, date_value
+                        )
+
+                if report is None:
+                    await update.message.reply_text(empty_message)
+                elif report.pages:
+                    file_ids = await self._reply_pages(update, report.pages, caption)
+                    self.delivery_cache.set(report.key, file_ids)
+                else:
+                    await update.message.reply_text(
+                        "⚠️ No se pudo generar el reporte en imagen."
+                    )
+
+    def _build_route_report(self, tipo: str, date_value) -> Optional[RouteReport]:
+        """Consulta y renderiza el reporte (bloqueante, corre en el executor)"""
+        return self.report_service.build_route_report(tipo, date_value)
+
+    async def _reply_pages(
+        self, update: Update, pages: Sequence[Union[bytes, str]], caption: str
+    ) -> List[str]:
+        """Envía un reporte paginado: una foto, o álbumes de hasta 10 páginas.
+
+        Cada página son los bytes del PNG o un file_id ya subido; retorna los
+        file_id de las fotos enviadas.
+        """
+        if len(pages) == 1:
+            message = await update.message.reply_photo(photo=pages[0], caption=caption)
+            return [self._file_id(message)]
+
+        file_ids = []
+        for start in range(0, len(pages), MAX_MEDIA_GROUP):
+            media = [
+                InputMediaPhoto(
+                    media=page,
+                    caption=f"{caption} · {len(pages)} páginas" if i == 0 else None,
+                )
+                for i, page in enumerate(pages[start : start + MAX_MEDIA_GROUP], start=start)
+            ]
+            messages = await update.message.reply_media_group(media=media)
+            file_ids.extend(self._file_id(message) for message in messages)
+        return file_ids
+
+    @staticmethod
+    def _file_id(message) -> str:
+        # la última PhotoSize es la de mayor resolución
+        return message.photo[-1].file_id
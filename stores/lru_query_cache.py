@@ -0,0 +1,112 @@
+import hashlib
+import json
+import logging
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import pandas as pd
+
+from interfaces.query_cache_interface import IQueryCache
+
+logger = logging.getLogger(__name__)
+
+
+class LruQueryCache(IQueryCache):
+    """
+    Caché en memoria del proceso, LRU, acotada por tamaño en bytes y con TTL
+    por entrada. Thread-safe.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = 256 * 1024 * 1024,
+        default_ttl: float = 60,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        # key -> (valor, expira_en, bytes, versión)
+        self._entries: "OrderedDict[str, Tuple[Any, float, int, str]]" = OrderedDict()
+        self._bytes = 0
+
+    @staticmethod
+    def size_of(value: Any) -> int:
+        if isinstance(value, (pd.DataFrame, pd.Series)):
+            return int(value.memory_usage(deep=True).sum())
+        return sys.getsizeof(value)
+
+    @staticmethod
+    def fingerprint(value: Any) -> str:
+        """Huella estable del contenido: igual en todos los procesos para los
+        mismos datos (sirve de versión para ETags)"""
+        digest = hashlib.sha256()
+        if isinstance(value, (pd.DataFrame, pd.Series)):
+            frame = value.to_frame() if isinstance(value, pd.Series) else value
+            digest.update(repr([(str(c), str(t)) for c, t in frame.dtypes.items()]).encode("utf-8"))
+            digest.update(pd.util.hash_pandas_object(frame, index=True).to_numpy().tobytes())
+        else:
+            digest.update(json.dumps(value, default=str, sort_keys=True).encode("utf-8"))
+        return digest.hexdigest()
+
+    @property
+    def current_bytes(self) -> int:
+        return self._bytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at, _, _ = entry
+            if expires_at <= self._clock():
+                self._pop(key)
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def version(self, key: str) -> Optional[str]:
+        """Versión (huella) de la entrada vigente, sin copiar ni tocar el LRU"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] <= self._clock():
+                return None
+            return entry[3]
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        size = self.size_of(value)
+        if size > self.max_bytes:
+            logger.info(f"Resultado de {size} bytes excede la caché, no se guarda")
+            return
+        version = self.fingerprint(value)
+        expires_at = self._clock() + (self.default_ttl if ttl is None else ttl)
+        with self._lock:
+            if key in self._entries:
+                self._pop(key)
+            self._entries[key] = (value, expires_at, size, version)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._pop(oldest)
+
+    def invalidate(self) -> None:
+        """Descarta todas las entradas (p.ej. tras actualizar documentos)"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+        logger.info("🧹 Caché de consultas invalidada")
+
+    def _pop(self, key: str) -> None:
+        _, _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+
+# Instancia compartida por el proceso (Flask, bot y bot_runner)
+default_query_cache = LruQueryCache()
@@ -0,0 +1,113 @@
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _Delivery:
+    # páginas PNG ya renderizadas (aún sin subir) y/o file_id de Telegram
+    pages: Tuple[bytes, ...] = ()
+    file_ids: Tuple[str, ...] = ()
+    expires_at: float = 0.0
+
+
+class ReportDeliveryCache:
+    """
+    Caché de entregas de reportes por Telegram: guarda las páginas ya
+    renderizadas de un reporte y, una vez subidas, los `file_id` que devuelve
+    Telegram para reenviarlas sin volver a renderizar ni subir los bytes. La
+    clave se deriva del tipo de reporte, la fecha y el contenido de los datos.
+    LRU por cantidad de entradas, con TTL. Thread-safe.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        ttl: float = 24 * 60 * 60,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, _Delivery]" = OrderedDict()
+
+    @staticmethod
+    def make_key(tipo: str, fecha: Any, df: pd.DataFrame) -> str:
+        """Clave estable: tipo + fecha + huella de los datos (valores y esquema)"""
+        digest = hashlib.sha256(f"{tipo}|{fecha}|".encode("utf-8"))
+        digest.update(repr([(str(c), str(t)) for c, t in df.dtypes.items()]).encode("utf-8"))
+        digest.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+        return digest.hexdigest()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _lookup(self, key: str) -> Optional[_Delivery]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if self._clock() >= entry.expires_at:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _store(self, key: str, entry: _Delivery) -> None:
+        entry.expires_at = self._clock() + self.ttl
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def get(self, key: str) -> Optional[List[str]]:
+        """file_id de las páginas ya subidas, o None"""
+        with self._lock:
+            entry = self._lookup(key)
+            if entry is None or not entry.file_ids:
+                return None
+            return list(entry.file_ids)
+
+    def set(self, key: str, file_ids: Sequence[str]) -> None:
+        if not file_ids:
+            return
+        with self._lock:
+            # con los file_id ya no hacen falta los bytes de las páginas
+            self._store(key, _Delivery(file_ids=tuple(file_ids)))
+
+    def get_pages(self, key: str) -> Optional[List[bytes]]:
+        """Páginas PNG pre-renderizadas, o None"""
+        with self._lock:
+            entry = self._lookup(key)
+            if entry is None or not entry.pages:
+                return None
+            return list(entry.pages)
+
+    def set_pages(self, key: str, pages: Sequence[bytes]) -> None:
+        if not pages:
+            return
+        with self._lock:
+            entry = self._lookup(key)
+            if entry is not None and entry.file_ids:
+                return  # ya subido: reenviar por file_id es más barato
+            self._store(key, _Delivery(pages=tuple(pages)))
+
+    def invalidate(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+# Instancia compartida por el proceso
+default_report_delivery_cache = ReportDeliveryCache()
@@ -0,0 +1,225 @@
+import json
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from interfaces.report_job_store import IReportJobStore
+from models.report_job import ReportJob, ReportJobStatus
+
+logger = logging.getLogger(__name__)
+
+
+class ReportJobSqliteStore(IReportJobStore):
+    """
+    Cola de trabajos de reportes en un archivo SQLite local. Los trabajos y
+    sus artefactos (PNG) persisten entre reinicios y son visibles para todos
+    los procesos del servidor (workers de gunicorn) que compartan el archivo.
+    Una conexión por operación; el modo WAL deja leer mientras otro escribe.
+    """
+
+    _name_table = "report_jobs"
+    _name_artifacts = "report_job_artifacts"
+
+    def __init__(self, path: str = "report_jobs.sqlite3", clock: Callable[[], float] = time.time):
+        self.path = path
+        self._clock = clock
+        # serializa los claims dentro del proceso (entre procesos: BEGIN IMMEDIATE)
+        self._lock = threading.Lock()
+        self._ensure_tables_exist()
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+    def _ensure_tables_exist(self) -> None:
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                f"""
+                CREATE TABLE IF NOT EXISTS {self._name_table} (
+                    id TEXT PRIMARY KEY,
+                    tipo TEXT NOT NULL,
+                    params TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    error TEXT NULL,
+                    mimetype TEXT NULL,
+                    artifact_count INTEGER NOT NULL DEFAULT 0,
+                    worker TEXT NULL,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+                """
+            )
+            columns = {row["name"] for row in conn.execute(f"PRAGMA table_info({self._name_table})")}
+            if "worker" not in columns:
+                # archivos creados antes del latido por worker
+                conn.execute(f"ALTER TABLE {self._name_table} ADD COLUMN worker TEXT NULL")
+            conn.execute(
+                f"CREATE INDEX IF NOT EXISTS idx_{self._name_table}_status "
+                f"ON {self._name_table} (status, created_at)"
+            )
+            conn.execute(
+                f"""
+                CREATE TABLE IF NOT EXISTS {self._name_artifacts} (
+                    job_id TEXT NOT NULL,
+                    idx INTEGER NOT NULL,
+                    data BLOB NOT NULL,
+                    PRIMARY KEY (job_id, idx)
+                )
+                """
+            )
+
+    @staticmethod
+    def _to_job(row: sqlite3.Row) -> ReportJob:
+        return ReportJob(
+            id=row["id"],
+            tipo=row["tipo"],
+            params=json.loads(row["params"]),
+            status=row["status"],
+            error=row["error"],
+            mimetype=row["mimetype"],
+            artifact_count=row["artifact_count"],
+            created_at=row["created_at"],
+            updated_at=row["updated_at"],
+        )
+
+    def enqueue(self, tipo: str, params: Dict[str, Any]) -> ReportJob:
+        now = self._clock()
+        job = ReportJob(
+            id=uuid.uuid4().hex,
+            tipo=tipo,
+            params=params,
+            created_at=now,
+            updated_at=now,
+        )
+        with self._connect() as conn:
+            conn.execute(
+                f"""
+                INSERT INTO {self._name_table} (id, tipo, params, status, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                (job.id, tipo, json.dumps(params, default=str), job.status, now, now),
+            )
+        return job
+
+    def get(self, job_id: str) -> Optional[ReportJob]:
+        with self._connect() as conn:
+            row = conn.execute(
+                f"SELECT * FROM {self._name_table} WHERE id = ?", (job_id,)
+            ).fetchone()
+        return self._to_job(row) if row else None
+
+    def claim_next(self, worker: Optional[str] = None) -> Optional[ReportJob]:
+        with self._lock, self._transaction() as conn:
+            row = conn.execute(
+                f"""
+                SELECT * FROM {self._name_table}
+                WHERE status = ? ORDER BY created_at LIMIT 1
+                """,
+                (ReportJobStatus.QUEUED,),
+            ).fetchone()
+            if row is None:
+                return None
+            now = self._clock()
+            conn.execute(
+                f"UPDATE {self._name_table} SET status = ?, worker = ?, updated_at = ? WHERE id = ?",
+                (ReportJobStatus.RUNNING, worker, now, row["id"]),
+            )
+        job = self._to_job(row)
+        job.status, job.updated_at = ReportJobStatus.RUNNING, now
+        return job
+
+    def complete(self, job_id: str, artifacts: List[bytes], mimetype: str) -> None:
+        with self._transaction() as conn:
+            conn.execute(f"DELETE FROM {self._name_artifacts} WHERE job_id = ?", (job_id,))
+            conn.executemany(
+                f"INSERT INTO {self._name_artifacts} (job_id, idx, data) VALUES (?, ?, ?)",
+                [(job_id, i, sqlite3.Binary(data)) for i, data in enumerate(artifacts)],
+            )
+            conn.execute(
+                f"""
+                UPDATE {self._name_table}
+                SET status = ?, mimetype = ?, artifact_count = ?, error = NULL, updated_at = ?
+                WHERE id = ?
+                """,
+                (ReportJobStatus.DONE, mimetype, len(artifacts), self._clock(), job_id),
+            )
+
+    def fail(self, job_id: str, error: str) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                f"UPDATE {self._name_table} SET status = ?, error = ?, updated_at = ? WHERE id = ?",
+                (ReportJobStatus.FAILED, error, self._clock(), job_id),
+            )
+
+    def get_artifact(self, job_id: str, index: int = 0) -> Optional[bytes]:
+        with self._connect() as conn:
+            row = conn.execute(
+                f"SELECT data FROM {self._name_artifacts} WHERE job_id = ? AND idx = ?",
+                (job_id, index),
+            ).fetchone()
+        return bytes(row["data"]) if row else None
+
+    def heartbeat(self, worker: str) -> int:
+        with self._connect() as conn:
+            cursor = conn.execute(
+                f"UPDATE {self._name_table} SET updated_at = ? WHERE status = ? AND worker = ?",
+                (self._clock(), ReportJobStatus.RUNNING, worker),
+            )
+        return cursor.rowcount
+
+    def requeue_stale(self, older_than: float) -> int:
+        with self._connect() as conn:
+            cursor = conn.execute(
+                f"""
+                UPDATE {self._name_table} SET status = ?, worker = NULL, updated_at = ?
+                WHERE status = ? AND updated_at < ?
+                """,
+                (
+                    ReportJobStatus.QUEUED,
+                    self._clock(),
+                    ReportJobStatus.RUNNING,
+                    self._clock() - older_than,
+                ),
+            )
+        if cursor.rowcount:
+            logger.warning(f"⚠️ {cursor.rowcount} trabajos de reporte abandonados vuelven a la cola")
+        return cursor.rowcount
+
+    def purge(self, older_than: float) -> int:
+        limite = self._clock() - older_than
+        finished = (ReportJobStatus.DONE, ReportJobStatus.FAILED)
+        with self._transaction() as conn:
+            conn.execute(
+                f"""
+                DELETE FROM {self._name_artifacts} WHERE job_id IN (
+                    SELECT id FROM {self._name_table}
+                    WHERE status IN (?, ?) AND updated_at < ?
+                )
+                """,
+                (*finished, limite),
+            )
+            cursor = conn.execute(
+                f"DELETE FROM {self._name_table} WHERE status IN (?, ?) AND updated_at < ?",
+                (*finished, limite),
+            )
+        return cursor.rowcount
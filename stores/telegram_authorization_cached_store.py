@@ -0,0 +1,100 @@
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, FrozenSet, List
+from interfaces.telegram_authorization_store import ITelegramAuthorizationStore
+
+logger = logging.getLogger(__name__)
+
+
+class TelegramAuthorizationCachedStore(ITelegramAuthorizationStore):
+    """
+    Decorador de un store de autorización: mantiene en memoria el conjunto
+    de user_id autorizados y lo recarga desde el store real cada `ttl`
+    segundos. `is_authorized` es una búsqueda O(1) sin ir a la DB;
+    `add_user` / `remove_user` escriben en el store real y actualizan el
+    conjunto local al instante (serializados con la recarga, así una lista
+    leída antes del cambio no lo pisa). Si la recarga falla se conserva el conjunto
+    vigente y se reintenta a los `retry_after` segundos. Thread-safe.
+    """
+
+    def __init__(
+        self,
+        store: ITelegramAuthorizationStore,
+        ttl: float = 300,
+        clock: Callable[[], float] = time.monotonic,
+        retry_after: float = 30,
+    ):
+        self.store = store
+        self.ttl = ttl
+        self.retry_after = min(retry_after, ttl)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        # conjunto inmutable: los lectores nunca ven una actualización a medias
+        self._user_ids: FrozenSet[int] = frozenset()
+        self._loaded = False
+        self._expires_at = 0.0
+        self.refresh()
+
+    def refresh(self) -> bool:
+        """Recarga el conjunto desde el store real; False si falló"""
+        with self._refresh_lock:
+            return self._reload()
+
+    def _reload(self) -> bool:
+        # con _refresh_lock tomado: add/remove esperan y no se pisan con la lista leída
+        try:
+            users = self.store.list_users()
+        except Exception as e:
+            logger.error(f"❌ Error recargando usuarios autorizados: {e}")
+            # sin reintentar en cada mensaje mientras la DB no responde
+            with self._lock:
+                self._expires_at = self._clock() + self.retry_after
+            return False
+
+        # los stores lanzan ante errores: una lista vacía es "nadie autorizado"
+        user_ids = frozenset(int(user["user_id"]) for user in users)
+        with self._lock:
+            self._user_ids = user_ids
+            self._loaded = True
+            self._expires_at = self._clock() + self.ttl
+        logger.info(f"🔄 {len(self._user_ids)} usuarios autorizados en caché")
+        return True
+
+    def _refresh_if_expired(self) -> None:
+        if self._clock() < self._expires_at:
+            return
+        # un solo hilo recarga; los demás siguen con el conjunto vigente
+        if self._refresh_lock.acquire(blocking=False):
+            try:
+                if self._clock() >= self._expires_at:
+                    self._reload()
+            finally:
+                self._refresh_lock.release()
+
+    def add_user(self, user_id: int, username: str = None) -> None:
+        # una recarga en curso leyó la lista antes del alta: se espera a que publique
+        with self._refresh_lock:
+            self.store.add_user(user_id, username=username)
+            with self._lock:
+                self._user_ids = self._user_ids | {int(user_id)}
+
+    def remove_user(self, user_id: int) -> None:
+        with self._refresh_lock:
+            self.store.remove_user(user_id)
+            with self._lock:
+                self._user_ids = self._user_ids - {int(user_id)}
+
+    def is_authorized(self, user_id: int) -> bool:
+        self._refresh_if_expired()
+        if not self._loaded:
+            # nunca se pudo cargar la lista: se consulta al store real
+            return self.store.is_authorized(user_id)
+        return int(user_id) in self._user_ids
+
+    def list_users(self) -> List[Dict[str, Any]]:
+        return self.store.list_users()
+
+    def __len__(self) -> int:
+        return len(self._user_ids)
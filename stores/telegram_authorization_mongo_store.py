@@ -65,5 +65,6 @@ class TelegramAuthorizationMongoStore(ITelegramAuthorizationStore):
             )
             return users
         except Exception as e:
+            # se propaga: una lista vacía significaría "nadie autorizado"
             logger.error(f"❌ Error listando usuarios en MongoDB: {e}")
-            return []
+            raise
@@ -92,5 +92,6 @@ class TelegramAuthorizationSqlStore(ITelegramAuthorizationStore):
         try:
             return self.db.execute_query(query)
         except Exception as e:
+            # se propaga: una lista vacía significaría "nadie autorizado"
             logger.error(f"❌ Error listando usuarios autorizados: {e}")
-            return []
+            raise
@@ -0,0 +1,120 @@
+import threading
+import time
+import pytest
+from database.connection_pool import ConnectionPool, PoolTimeoutError
+
+
+class FakeConnection:
+    def __init__(self):
+        self.open = True
+        self.server_status = 0
+        self.pings = 0
+        self.rollbacks = 0
+        self.fail_ping = False
+
+    def ping(self, reconnect=False):
+        self.pings += 1
+        if self.fail_ping:
+            raise ConnectionError("server has gone away")
+
+    def rollback(self):
+        self.rollbacks += 1
+        self.server_status = 0
+
+    def close(self):
+        self.open = False
+
+
+class TestConnectionPool:
+    @pytest.fixture
+    def created(self):
+        return []
+
+    @pytest.fixture
+    def factory(self, created):
+        def _factory():
+            conn = FakeConnection()
+            created.append(conn)
+            return conn
+        return _factory
+
+    def test_fill_opens_min_size(self, factory, created):
+        pool = ConnectionPool(factory, min_size=2, max_size=4)
+        pool.fill()
+        assert pool.size == 2
+        assert pool.idle_count == 2
+        assert len(created) == 2
+
+    def test_connection_is_reused(self, factory, created):
+        pool = ConnectionPool(factory, min_size=0, max_size=2)
+        with pool.connection() as first:
+            pass
+        with pool.connection() as second:
+            pass
+        assert first is second
+        assert len(created) == 1
+
+    def test_concurrent_checkouts_get_distinct_connections(self, factory):
+        pool = ConnectionPool(factory, min_size=0, max_size=2)
+        a = pool.acquire()
+        b = pool.acquire()
+        assert a is not b
+        pool.release(a)
+        pool.release(b)
+
+    def test_acquire_blocks_until_timeout_when_exhausted(self, factory):
+        pool = ConnectionPool(factory, min_size=0, max_size=1, timeout=0.05)
+        conn = pool.acquire()
+        with pytest.raises(PoolTimeoutError):
+            pool.acquire()
+        pool.release(conn)
+
+    def test_waiter_gets_released_connection(self, factory):
+        pool = ConnectionPool(factory, min_size=0, max_size=1, timeout=2)
+        conn = pool.acquire()
+        result = {}
+
+        def worker():
+            result["conn"] = pool.acquire()
+
+        t = threading.Thread(target=worker)
+        t.start()
+        time.sleep(0.05)
+        pool.release(conn)
+        t.join(timeout=2)
+        assert result["conn"] is conn
+
+    def test_open_transaction_is_rolled_back_on_release(self, factory):
+        pool = ConnectionPool(factory, min_size=0, max_size=1)
+        conn = pool.acquire()
+        conn.server_status = 1  # SERVER_STATUS_IN_TRANS
+        pool.release(conn)
+        assert conn.rollbacks == 1
+
+    def test_failed_health_check_replaces_connection(self, factory, created):
+        pool = ConnectionPool(factory, min_size=0, max_size=1, health_check_interval=0)
+        conn = pool.acquire()
+        pool.release(conn)
+        conn.fail_ping = True
+        new_conn = pool.acquire()
+        assert new_conn is not conn
+        assert not conn.open
+        assert pool.size == 1
+
+    def test_old_connections_are_recycled(self, factory):
+        pool = ConnectionPool(factory, min_size=0, max_size=1, max_lifetime=0)
+        conn = pool.acquire()
+        pool.release(conn)
+        assert not conn.open
+        assert pool.size == 0
+
+    def test_closed_connection_is_not_returned_to_pool(self, factory):
+        pool = ConnectionPool(factory, min_size=0, max_size=1)
+        conn = pool.acquire()
+        conn.close()
+        pool.release(conn)
+        assert pool.size == 0
+
+    def test_invalid_sizes(self, factory):
+        with pytest.raises(ValueError):
+            ConnectionPool(factory, min_size=3, max_size=2)
@@ -1,3 +1,4 @@
+import os
 import pytest
 import pandas as pd
 from datetime import date, datetime
@@ -39,5 +40,105 @@ class TestDataAnalysisService:
             date(2025, 10, 21),
             ruta_salida
         )
-        assert isinstance(result, str)
-        assert result.endswith('.png')
\ No newline at end of file
+        assert isinstance(result, list)
+        assert len(result) == 1
+        assert result[0].endswith('.png')
+
+    def test_despachados_del_dia_detallado_pagina(self, service, sample_data, tmp_path):
+        data = pd.concat([sample_data] * 30, ignore_index=True)
+        result = service.despachados_del_dia_detallado(
+            data,
+            date(2025, 10, 21),
+            str(tmp_path / "reporte.png"),
+            filas_por_pagina=25,
+        )
+        # 60 detalles + 2 subtotales + 2 separadores + total general = 65 filas
+        assert [os.path.basename(p) for p in result] == [
+            'reporte.png', 'reporte_2.png', 'reporte_3.png'
+        ]
+        assert all(os.path.exists(p) for p in result)
+
+    def test_despachados_del_dia_paginas_en_memoria(self, service, sample_data, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        data = pd.concat([sample_data] * 30, ignore_index=True)
+        buffers = service.despachados_del_dia_paginas(
+            data, date(2025, 10, 21), filas_por_pagina=25
+        )
+        assert len(buffers) == 3
+        assert all(b.getvalue().startswith(b'\x89PNG') for b in buffers)
+        assert list(tmp_path.iterdir()) == []
+
+    def test_tabla_despachados_subtotales(self, service, sample_data):
+        tabla = service._tabla_despachados(sample_data)
+        assert tabla.rows[0][0] == '✓ ABC123'
+        assert tabla.rows[0][3] == '✓✓ Cliente 1'
+        assert tabla.rows[1][:1] + tabla.rows[1][4:] == ('Total ABC123', '100.00', '10.00')
+        assert tabla.rows[3][0] == '◔ XYZ789'
+        assert tabla.rows[-1] == ('Total General', '', '', '', '300.00', '30.00')
+        assert tabla.kinds.count('subtotal') == 2
+
+    @pytest.fixture
+    def dispatch_data(self):
+        return pd.DataFrame({
+            'doc_fec_crea': pd.to_datetime([
+                '2025-10-01 08:00', '2025-10-01 09:00', '2025-10-02 10:00',
+                '2025-10-03 07:30', '2025-10-03 12:00', '2025-10-04 08:00',
+            ]),
+            'rd_hora_sal': pd.to_datetime([
+                '2025-10-02 10:00', None, '2025-10-02 18:00',
+                '2025-10-05 07:30', '2025-10-03 13:15', '2025-10-04 20:00',
+            ]),
+            'doc_con_pag': ['CERC', 'CERC', 'PA72', 'OTRA', 'PA5050', 'CERC'],
+            'doc_excep': ['A', None, 'B', '', 'A', 'A'],
+        })
+
+    def test_get_promedio_tiempo_despacho_accepts_chunks(self, service, dispatch_data):
+        expected = service.get_promedio_tiempo_despacho(dispatch_data)
+        chunks = (dispatch_data.iloc[i:i + 2] for i in range(0, len(dispatch_data), 2))
+        result = service.get_promedio_tiempo_despacho(chunks)
+        pd.testing.assert_frame_equal(result, expected)
+        cerc = result[result['doc_con_pag'] == 'CERC'].iloc[0]
+        assert cerc['cantidad_registros'] == 2
+        assert cerc['promedio_tiempo_despacho'] == '00 Días 19 Hrs 00 Mins'
+
+    def test_find_exceptions_accepts_chunks(self, service, dispatch_data):
+        chunks = iter([dispatch_data.iloc[:3], dispatch_data.iloc[3:]])
+        result = service.find_exceptions(chunks)
+        assert result.to_dict(orient='records') == [
+            {'doc_excep': 'A', 'count': 3},
+            {'doc_excep': 'B', 'count': 1},
+        ]
+
+    @pytest.fixture
+    def programados_data(self):
+        hoy = date(2025, 10, 1)
+        return pd.DataFrame({
+            'doc_fec_ent_gr': [hoy, hoy, hoy, hoy, hoy, hoy, date(2025, 10, 2), None],
+            'doc_ag_trans': [None, '', '  ', 'SHALOM', None, None, None, None],
+            'doc_mot': [' Venta ', 'RECOJO EN PLANTA', 'Traslado Int. Almacen',
+                        'Venta', None, 'Consignación', 'Venta', 'Venta'],
+        })
+
+    def test_find_programados_del_dia_clasifica_por_motivo(self, service, programados_data):
+        result = service.find_programados_del_dia(programados_data, date(2025, 10, 1))
+        assert list(result.index) == [0, 1, 2, 4, 5]
+        assert list(result['type_doc']) == ['Lima', 'Planta', 'Traslado', 'Otros', 'Otros']
+
+    def test_find_programados_del_dia_mapeo_configurable(self, programados_data):
+        service = DataAnalysisService(motivo_tipo_doc={'CONSIGNACIÓN': 'Consignación'})
+        result = service.find_programados_del_dia(programados_data, date(2025, 10, 1))
+        assert list(result['type_doc']) == ['Lima', 'Planta', 'Traslado', 'Otros', 'Consignación']
+
+    def test_find_programados_del_dia_mapeo_configurado_redefine_motivo(self, programados_data):
+        service = DataAnalysisService(motivo_tipo_doc={'VENTA': 'Provincia'})
+        result = service.find_programados_del_dia(programados_data, date(2025, 10, 1))
+        assert list(result['type_doc']) == ['Provincia', 'Planta', 'Traslado', 'Otros', 'Otros']
+
+    def test_get_promedio_tiempo_despacho_incluye_segundos(self, service, dispatch_data):
+        result = service.get_promedio_tiempo_despacho(dispatch_data).set_index('doc_con_pag')
+        assert list(result.index) == ['CERC', 'Otros', 'PA5050', 'PA72']
+        assert result.loc['CERC', 'promedio_tiempo_despacho_seg'] == 19 * 3600
+        assert result.loc['Otros', 'promedio_tiempo_despacho'] == '02 Días 00 Hrs 00 Mins'
+        assert result.loc['Otros', 'promedio_plazo_hrs'] == 0
+        assert result.loc['PA5050', 'promedio_tiempo_despacho_seg'] == 75 * 60
+        assert result.loc['PA72', 'promedio_plazo_hrs'] == 48
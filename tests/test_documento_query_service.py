@@ -1,9 +1,11 @@
+import os
 import pytest
 import pandas as pd
 from datetime import date
 from typing import List, Dict, Any, Optional, Generator
 from services.documento_query_service import DocumentoQueryService
 from interfaces.database_interface import IDatabaseConnection
+from stores.lru_query_cache import LruQueryCache
 import pymysql
 
 class MockDatabaseConnection(IDatabaseConnection):
@@ -16,7 +18,7 @@ class MockDatabaseConnection(IDatabaseConnection):
     def execute_query(self, query: str, params: Optional[Dict] = None) -> List[Dict[str, Any]]:
         return []
     
-    def execute_query_dataframe(self, query: str, params: Optional[Dict] = None) -> pd.DataFrame:
+    def execute_query_dataframe(self, query: str, params: Optional[Dict] = None, dtypes: Optional[Dict] = None) -> pd.DataFrame:
         return pd.DataFrame()
     
     def get_cursor(self, query: str, params: Optional[Dict] = None):
@@ -29,7 +31,7 @@ class TestDocumentoQueryService:
 
     @pytest.fixture
     def service(self, db_connection):
-        return DocumentoQueryService(db_connection)
+        return DocumentoQueryService(db_connection, cache=LruQueryCache())
 
     def test_service_initialization(self, service):
         assert isinstance(service, DocumentoQueryService)
@@ -58,4 +60,144 @@ class TestDocumentoQueryService:
             "v.placa__like": "%ABC%"
         }
         result = service.query_documents(conditions=conditions)
-        assert isinstance(result, pd.DataFrame)
\ No newline at end of file
+        assert isinstance(result, pd.DataFrame)
+
+    def test_build_where_between_dates_is_half_open_on_raw_column(self, service):
+        filters = {"d.createAt__between_dates": ("2025-01-01", date(2025, 1, 31))}
+        where_clauses, params = service._build_where([], filters)
+        assert where_clauses == [
+            "d.createAt >= %(d_createAt_between_dates_start)s "
+            "AND d.createAt < %(d_createAt_between_dates_end)s"
+        ]
+        assert "DATE(" not in where_clauses[0]
+        assert params["d_createAt_between_dates_start"] == date(2025, 1, 1)
+        assert params["d_createAt_between_dates_end"] == date(2025, 2, 1)
+
+    def test_programados_del_dia_defaults_to_today_and_merges_filters(self):
+        class RecordingDatabaseConnection(MockDatabaseConnection):
+            def execute_query_dataframe(self, query, params=None, dtypes=None):
+                self.query, self.params = query, params
+                return pd.DataFrame()
+
+        db = RecordingDatabaseConnection()
+        service = DocumentoQueryService(db, cache=LruQueryCache())
+        service.get_programados_del_dia(filters={"d.Motivo__in": ["VENTA"]})
+        assert db.params["r_fechaProgramada_between_dates_start"] == date.today()
+        assert "d.Motivo IN" in db.query
+        assert "VENTA" in db.params.values()
+
+    def test_build_where_between_dates_single_day(self, service):
+        where_clauses, params = service._build_where(
+            [], {"r.fechaProgramada__between_dates": date(2025, 12, 31)}
+        )
+        assert len(where_clauses) == 1
+        assert params["r_fechaProgramada_between_dates_start"] == date(2025, 12, 31)
+        assert params["r_fechaProgramada_between_dates_end"] == date(2026, 1, 1)
+
+
+@pytest.mark.skipif(
+    not os.getenv("MARIADB_EXPLAIN_TESTS"),
+    reason="Requiere MariaDB real (MARIADB_EXPLAIN_TESTS=1 y variables DB_* del .env)",
+)
+def test_between_dates_is_an_index_range_scan():
+    """EXPLAIN del filtro de rango: debe ser `range` sobre un índice de
+    documentos.createAt (p.ej. CREATE INDEX idx_documentos_createAt
+    ON documentos (createAt))."""
+    from database.mariadb_connection import MariaDBConnection
+
+    db = MariaDBConnection()
+    where_clauses, params = DocumentoQueryService._build_where(
+        [], {"d.createAt__between_dates": (date(2025, 1, 1), date(2025, 1, 31))}
+    )
+    rows = db.execute_query(
+        "EXPLAIN SELECT d.id FROM documentos AS d WHERE " + " AND ".join(where_clauses),
+        params,
+    )
+    plan = rows[0]
+    assert plan["type"] == "range"
+    assert plan["key"] is not None
+
+
+class CountingDatabaseConnection(MockDatabaseConnection):
+    def __init__(self):
+        self.calls = 0
+
+    def execute_query_dataframe(self, query: str, params: Optional[Dict] = None, dtypes: Optional[Dict] = None) -> pd.DataFrame:
+        self.calls += 1
+        return pd.DataFrame({"doc_excep": ["A"]})
+
+
+class TestDocumentoQueryCache:
+    @pytest.fixture
+    def db_connection(self):
+        return CountingDatabaseConnection()
+
+    @pytest.fixture
+    def service(self, db_connection):
+        return DocumentoQueryService(db_connection, cache=LruQueryCache())
+
+    def test_repeated_query_is_served_from_cache(self, service, db_connection):
+        first = service.get_delivery_documents_by_date_range(date(2025, 1, 1), date(2025, 1, 31))
+        first.loc[0, "doc_excep"] = "modificado"
+        second = service.get_delivery_documents_by_date_range("2025-01-01", "2025-01-31")
+        assert db_connection.calls == 1
+        assert second.loc[0, "doc_excep"] == "A"
+
+    def test_invalidate_cache_forces_new_query(self, service, db_connection):
+        service.get_programados_del_dia(date(2025, 1, 2))
+        service.invalidate_cache()
+        service.get_programados_del_dia(date(2025, 1, 2))
+        assert db_connection.calls == 2
+
+    def test_data_version_without_querying(self, service, db_connection):
+        assert service.delivery_documents_version(date(2025, 1, 1), date(2025, 1, 31)) is None
+        service.get_delivery_documents_by_date_range(date(2025, 1, 1), date(2025, 1, 31))
+        version = service.delivery_documents_version("2025-01-01", "2025-01-31")
+        assert version is not None
+        assert version == service.last_data_version
+        assert db_connection.calls == 1
+
+    def test_cache_ttl_for_past_and_current_dates(self, service):
+        assert service.cache_ttl_for(date(2020, 1, 1)) == DocumentoQueryService.CACHE_TTL_PASADO
+        assert service.cache_ttl_for(date(2020, 1, 1), date.today()) == DocumentoQueryService.CACHE_TTL_HOY
+
+    def test_past_ttl_is_configurable(self, db_connection):
+        service = DocumentoQueryService(db_connection, cache=LruQueryCache(), cache_ttl_pasado=30)
+        assert service.cache_ttl_for(date(2020, 1, 1)) == 30
+
+
+class TestDocumentoQueryProjection:
+    def test_full_query_selects_all_columns(self):
+        query = DocumentoQueryService._build_query()
+        for alias in DocumentoQueryService._select_columns:
+            assert f"AS {alias}" in query
+        assert "LEFT JOIN vehiculos AS v" in query
+        assert "WHERE" not in query
+
+    def test_projection_only_emits_needed_joins(self):
+        query = DocumentoQueryService._build_query(
+            ["doc_fec_crea", "rd_hora_sal", "doc_con_pag"]
+        )
+        assert "AS doc_con_pag" in query
+        assert "AS doc_id" not in query
+        # ruta_detalle siempre se une: puede multiplicar filas
+        assert "LEFT JOIN ruta_detalle AS rd" in query
+        for table in ("ruta AS r", "users AS chofer", "enum_estado_pedido", "vehiculos"):
+            assert table not in query
+
+    def test_projection_resolves_join_dependencies(self):
+        query = DocumentoQueryService._build_query(["veh_placa"])
+        assert "LEFT JOIN ruta AS r" in query
+        assert "LEFT JOIN vehiculos AS v" in query
+        assert "users AS chofer" not in query
+
+    def test_where_clauses_add_their_joins(self):
+        query = DocumentoQueryService._build_query(
+            ["doc_excep"], ["r.fechaProgramada >= %(a)s"]
+        )
+        assert "LEFT JOIN ruta AS r" in query
+        assert query.rstrip().endswith("r.fechaProgramada >= %(a)s")
+
+    def test_unknown_column_raises(self):
+        with pytest.raises(ValueError):
+            DocumentoQueryService._build_query(["no_existe"])
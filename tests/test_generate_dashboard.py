@@ -0,0 +1,147 @@
+import random
+from datetime import datetime
+
+import pandas as pd
+import pytest
+from PIL import Image, ImageChops
+from views.generate_dashboard.fonts import get_font
+from views.generate_dashboard.generate_dashboard import (
+    GenerateDashboard,
+    get_template,
+    shutdown_render_pool,
+)
+from views.generate_dashboard.render_cache import RenderCache
+
+
+class TestDashboardTemplate:
+    def test_template_is_built_once(self):
+        assert get_template() is get_template()
+        assert get_template().size == (1920, 1080)
+
+    def test_each_dashboard_starts_from_a_copy(self):
+        template = get_template()
+        before = template.tobytes()
+        dashboard = GenerateDashboard(render_cache=RenderCache())
+        assert dashboard.img is not template
+        dashboard.draw.rectangle([0, 0, 1919, 1079], fill="black")
+        assert get_template().tobytes() == before
+
+    def test_fonts_are_shared(self):
+        assert get_font(30) is get_font(30)
+        assert GenerateDashboard().font_title is get_font(30)
+
+
+class TestDashboardOutput:
+    def test_init_renders_in_memory_by_default(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        dashboard = GenerateDashboard(render_cache=RenderCache())
+        img = dashboard.init(data_exceptions=pd.DataFrame({'doc_excep': ['A'], 'count': [1]}))
+        assert img is dashboard.img
+        assert list(tmp_path.iterdir()) == []
+
+        buffer = dashboard.to_buffer()
+        assert buffer.tell() == 0
+        assert Image.open(buffer).size == (1920, 1080)
+
+    def test_init_saves_when_path_given(self, tmp_path):
+        ruta = tmp_path / "dashboard.png"
+        GenerateDashboard(render_cache=RenderCache()).init(ruta_salida=str(ruta))
+        assert ruta.exists()
+
+
+class TestDashboardRenderCache:
+    def test_second_render_reuses_tiles(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        cache = RenderCache()
+        exceptions = pd.DataFrame({'doc_excep': ['A', 'B'], 'count': [3, 1]})
+
+        first = GenerateDashboard(render_cache=cache)
+        first.init(data_exceptions=exceptions)
+        assert len(cache) == 1
+
+        second = GenerateDashboard(render_cache=cache)
+        second.init(data_exceptions=exceptions.copy())
+        assert len(cache) == 1
+        assert first.img.tobytes() == second.img.tobytes()
+
+        GenerateDashboard(render_cache=cache).init(
+            data_exceptions=exceptions.assign(count=[4, 1])
+        )
+        assert len(cache) == 2
+
+    def test_parallel_mode_renders_same_tiles(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        vehiculos = GenerateDashboard().vehiculos
+        serial_cache, parallel_cache = RenderCache(), RenderCache()
+        try:
+            GenerateDashboard(render_cache=serial_cache).init(data_vehiculos=vehiculos)
+            GenerateDashboard(render_cache=parallel_cache, render_workers=2).init(
+                data_vehiculos=vehiculos,
+                data_exceptions=pd.DataFrame({'doc_excep': ['A'], 'count': [1]}),
+            )
+        finally:
+            shutdown_render_pool()
+        key = RenderCache.make_key(
+            'vehiculos', GenerateDashboard.PANEL_REGIONS['vehiculos'], vehiculos
+        )
+        assert len(parallel_cache) == 2
+        assert parallel_cache.get(key).tobytes() == serial_cache.get(key).tobytes()
+
+
+class TestDashboardTiles:
+    @pytest.fixture
+    def data(self):
+        return {
+            'vehiculos': GenerateDashboard().vehiculos,
+            'carga_laboral': [
+                {'fecha': datetime(2025, 1, d), 'peso': float(d * 1000)} for d in range(1, 31)
+            ],
+            'pedidos_del_dia': pd.DataFrame({'type_doc': ['Lima']}),
+            'excepciones': pd.DataFrame({'doc_excep': ['A', 'B'], 'count': [3, 1]}),
+            'tiempo_promedio': pd.DataFrame({
+                'promedio_plazo_hrs': [24, 48, 72, 0],
+                'cantidad_registros': [5000, 3000, 20, 1],
+            }),
+        }
+
+    @staticmethod
+    def render_full_canvas(panel, data):
+        """Dibuja el panel sobre el lienzo completo, sin recortar a su región"""
+        dashboard = GenerateDashboard(render_cache=RenderCache())
+        canvas = get_template().copy()
+        getattr(dashboard, dashboard.PANEL_RENDERERS[panel])(canvas, data, (0, 0))
+        return canvas
+
+    def test_panels_draw_inside_their_region(self, data):
+        for panel, panel_data in data.items():
+            random.seed(0)
+            canvas = self.render_full_canvas(panel, panel_data)
+            x0, y0, x1, y1 = GenerateDashboard.PANEL_REGIONS[panel]
+            bbox = ImageChops.difference(
+                canvas.convert('RGB'), get_template().convert('RGB')
+            ).getbbox()
+            assert bbox is not None
+            assert x0 <= bbox[0] and y0 <= bbox[1] and bbox[2] <= x1 and bbox[3] <= y1, panel
+
+    def test_tiled_output_matches_full_canvas_render(self, data):
+        random.seed(0)
+        dashboard = GenerateDashboard(render_cache=RenderCache())
+        full = get_template().copy()
+        for panel, panel_data in data.items():
+            getattr(dashboard, dashboard.PANEL_RENDERERS[panel])(full, panel_data, (0, 0))
+
+        random.seed(0)
+        tiled = GenerateDashboard(render_cache=RenderCache()).init(
+            data_vehiculos=data['vehiculos'],
+            data_carga_laboral=data['carga_laboral'],
+            data_programados_del_dia=data['pedidos_del_dia'],
+            data_exceptions=data['excepciones'],
+            data_tiempo_promedio=data['tiempo_promedio'],
+        )
+        assert ImageChops.difference(tiled.convert('RGB'), full.convert('RGB')).getbbox() is None
+
+    def test_regions_do_not_overlap(self):
+        regions = list(GenerateDashboard.PANEL_REGIONS.values())
+        for i, a in enumerate(regions):
+            for b in regions[i + 1:]:
+                assert a[2] <= b[0] or b[2] <= a[0] or a[3] <= b[1] or b[3] <= a[1]
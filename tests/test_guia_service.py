@@ -0,0 +1,185 @@
+import pytest
+import pandas as pd
+from contextlib import contextmanager
+from datetime import date
+from typing import Any, Dict, List, Optional
+from interfaces.database_interface import IDatabaseConnection
+from models.guia_model import GuiaUpdateRequest
+from services.guia_service import GuiaService
+from stores.lru_query_cache import LruQueryCache
+
+
+class FakeConnection:
+    def __init__(self):
+        self.commits = 0
+        self.rollbacks = 0
+
+    def begin(self):
+        pass
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+
+class FakeCursor:
+    """Simula documentos existentes: `existentes` son claves (serie, numero)"""
+
+    def __init__(self, existentes):
+        self.connection = FakeConnection()
+        self.existentes = existentes
+        self.executed: List[str] = []
+        self.inserted: List[tuple] = []
+        self.rowcount = 0
+
+    def execute(self, query, params=None):
+        self.executed.append(" ".join(query.split()))
+        if query.strip().startswith("UPDATE documentos") and "WHERE" in query:
+            key = (params["fact_serie"], params["fact_num"])
+            self.rowcount = 1 if key in self.existentes else 0
+
+    def executemany(self, query, rows):
+        self.executed.append(" ".join(query.split()))
+        self.inserted.extend(rows)
+
+    def fetchall(self):
+        return [
+            {"SerieFactura": serie, "NumeroFactura": num}
+            for serie, num, *_ in self.inserted
+            if (serie, num) in self.existentes
+        ]
+
+
+class FakeDatabaseConnection(IDatabaseConnection):
+    def __init__(self, cursor):
+        self.cursor = cursor
+
+    def connect(self) -> bool:
+        return True
+
+    def disconnect(self) -> None:
+        pass
+
+    def execute_query(self, query: str, params: Optional[Dict] = None) -> List[Dict[str, Any]]:
+        return []
+
+    def execute_query_dataframe(self, query: str, params: Optional[Dict] = None, dtypes: Optional[Dict] = None) -> pd.DataFrame:
+        return pd.DataFrame()
+
+    @contextmanager
+    def get_cursor(self):
+        yield self.cursor
+
+
+class TestGuiaServiceBulkUpdate:
+    @pytest.fixture
+    def requests(self):
+        return [
+            GuiaUpdateRequest(fact_serie="F001", fact_num=1, guia_serie="T001", guia_num=10),
+            GuiaUpdateRequest(fact_serie="F001", fact_num=2, guia_serie="T001", guia_num=11),
+            GuiaUpdateRequest(fact_serie="F001", fact_num=3, guia_program_fecha=date(2025, 1, 2)),
+            GuiaUpdateRequest(fact_serie="F001", fact_num=4),
+        ]
+
+    @pytest.fixture
+    def cursor(self):
+        return FakeCursor(existentes={("F001", 1), ("F001", 3)})
+
+    @pytest.fixture
+    def service(self, cursor):
+        return GuiaService(FakeDatabaseConnection(cursor), cache=LruQueryCache())
+
+    def test_groups_requests_by_updated_columns(self, requests):
+        grupos = GuiaService._agrupar_por_campos(requests)
+        assert list(grupos) == [
+            ("NumeroGR", "SerieGR"),
+            ("FechaEntregaGR", "FechaProgramadaGR"),
+        ]
+        assert len(grupos[("NumeroGR", "SerieGR")]) == 2
+
+    def test_bulk_update_issues_one_update_join_per_group(self, service, cursor, requests):
+        result = service.update_multiple_guias(requests)
+        updates = [q for q in cursor.executed if q.startswith("UPDATE documentos")]
+        assert len(updates) == 2
+        assert all("JOIN tmp_guias_update" in q for q in updates)
+        assert "SET d.NumeroGR = t.NumeroGR, d.SerieGR = t.SerieGR" in updates[0]
+        assert len(cursor.inserted) == 3
+        assert result["rows_count"] == 2
+        assert result["data"]["avisos"] == [
+            "No se encontro FT F001-2, o no hay informacion que actualizar."
+        ]
+        assert cursor.connection.commits == 1
+
+    def test_bulk_and_per_row_modes_report_the_same(self, requests):
+        bulk = GuiaService(
+            FakeDatabaseConnection(FakeCursor({("F001", 1), ("F001", 3)})), cache=LruQueryCache()
+        ).update_multiple_guias(requests, bulk=True)
+        por_fila = GuiaService(
+            FakeDatabaseConnection(FakeCursor({("F001", 1), ("F001", 3)})), cache=LruQueryCache()
+        ).update_multiple_guias(requests, bulk=False)
+        assert bulk == por_fila
+
+
+class FailingCursor(FakeCursor):
+    """Falla al cargar la tabla temporal si el bloque incluye `fallar_en`"""
+
+    def __init__(self, existentes, fallar_en):
+        super().__init__(existentes)
+        self.fallar_en = fallar_en
+
+    def executemany(self, query, rows):
+        if any(num == self.fallar_en for _, num, *_ in rows):
+            raise RuntimeError("Lock wait timeout exceeded")
+        super().executemany(query, rows)
+
+
+class TestGuiaServiceChunkedUpdate:
+    @pytest.fixture
+    def requests(self):
+        return [
+            GuiaUpdateRequest(fact_serie="F001", fact_num=n, guia_num=100 + n)
+            for n in range(1, 6)
+        ]
+
+    def test_commits_each_chunk(self, requests):
+        cursor = FakeCursor(existentes={("F001", n) for n in range(1, 6)})
+        result = GuiaService(FakeDatabaseConnection(cursor), cache=LruQueryCache()).update_multiple_guias(
+            requests, chunk_size=2
+        )
+        assert cursor.connection.commits == 3
+        assert result["rows_count"] == 5
+        assert [(b["desde"], b["hasta"]) for b in result["data"]["bloques"]] == [
+            (0, 2), (2, 4), (4, 5)
+        ]
+        assert result["data"]["reanudar_desde"] is None
+
+    def test_failed_chunk_is_rolled_back_and_reports_resume_cursor(self, requests):
+        cursor = FailingCursor({("F001", n) for n in range(1, 6)}, fallar_en=3)
+        result = GuiaService(FakeDatabaseConnection(cursor), cache=LruQueryCache()).update_multiple_guias(
+            requests, chunk_size=2
+        )
+        assert result["success"] is False
+        assert cursor.connection.commits == 1
+        assert cursor.connection.rollbacks == 1
+        assert result["rows_count"] == 2
+        assert [b["estado"] for b in result["data"]["bloques"]] == ["confirmado", "revertido"]
+        assert result["data"]["reanudar_desde"] == 2
+
+    def test_resume_from_cursor(self, requests):
+        cursor = FakeCursor(existentes={("F001", n) for n in range(1, 6)})
+        result = GuiaService(FakeDatabaseConnection(cursor), cache=LruQueryCache()).update_multiple_guias(
+            requests, chunk_size=2, desde=2
+        )
+        assert result["rows_count"] == 3
+        assert result["data"]["bloques"][0]["desde"] == 2
+
+    @pytest.mark.parametrize("chunk_size, desde", [(0, 0), (-1, 0), (2, -1), (2, 5), (2, 9)])
+    def test_rejects_invalid_chunk_range(self, requests, chunk_size, desde):
+        cursor = FakeCursor(existentes={("F001", n) for n in range(1, 6)})
+        with pytest.raises(ValueError):
+            GuiaService(FakeDatabaseConnection(cursor), cache=LruQueryCache()).update_multiple_guias(
+                requests, chunk_size=chunk_size, desde=desde
+            )
+        assert cursor.executed == []
@@ -0,0 +1,90 @@
+import gzip
+import io
+
+import pytest
+from flask import Flask, jsonify, send_file
+
+import utils.http_cache as http_cache
+from utils.http_cache import init_http_cache
+
+
+class TestHttpCache:
+    @pytest.fixture
+    def calls(self):
+        return {"datos": 0}
+
+    @pytest.fixture
+    def client(self, calls, tmp_path):
+        app = Flask(__name__)
+        archivo = tmp_path / "reporte.json"
+        archivo.write_text('{"filas": [' + ",".join("0" * 2000) + "]}")
+
+        @app.route("/datos", methods=["GET", "POST"])
+        def datos():
+            response = http_cache.not_modified(http_cache.etag_for("/datos", "v1"))
+            if response is not None:
+                return response
+            calls["datos"] += 1
+            return jsonify({"filas": list(range(1000))})
+
+        @app.route("/chico")
+        def chico():
+            return jsonify({"ok": True})
+
+        @app.route("/imagen")
+        def imagen():
+            return send_file(io.BytesIO(b"\x89PNG" + b"0" * 4096), mimetype="image/png")
+
+        @app.route("/archivo")
+        def archivo_en_disco():
+            return send_file(archivo, mimetype="application/json")
+
+        init_http_cache(app, min_size=1024)
+        return app.test_client()
+
+    def test_large_json_is_gzipped_with_encoding_etag(self, client, monkeypatch):
+        monkeypatch.setattr(http_cache, "HAS_BROTLI", False)
+        response = client.get("/datos", headers={"Accept-Encoding": "gzip, br"})
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert "Accept-Encoding" in response.headers["Vary"]
+        assert response.get_etag()[0].endswith("-gzip")
+        assert b'"filas"' in gzip.decompress(response.data)
+
+    def test_small_or_unaccepted_responses_are_not_compressed(self, client):
+        assert "Content-Encoding" not in client.get("/chico", headers={"Accept-Encoding": "gzip"}).headers
+        assert "Content-Encoding" not in client.get("/datos").headers
+
+    def test_route_etag_answers_304_before_building_the_response(self, client, calls):
+        first = client.get("/datos", headers={"Accept-Encoding": "gzip"})
+        etag = first.headers["ETag"]
+        second = client.get("/datos", headers={"If-None-Match": etag})
+        assert second.status_code == 304
+        assert second.data == b""
+        assert second.get_etag()[0] == http_cache.etag_for("/datos", "v1")
+        assert calls["datos"] == 1
+
+    def test_post_is_never_answered_with_304(self, client, calls):
+        etag = client.get("/datos").headers["ETag"]
+        response = client.post("/datos", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert calls["datos"] == 2
+
+    def test_body_hash_etag_for_in_memory_images(self, client):
+        first = client.get("/imagen", headers={"Accept-Encoding": "gzip"})
+        assert first.status_code == 200
+        assert "Content-Encoding" not in first.headers  # PNG ya está comprimido
+        assert first.data.startswith(b"\x89PNG")
+        second = client.get("/imagen", headers={"If-None-Match": first.headers["ETag"]})
+        assert second.status_code == 304
+
+    def test_file_backed_responses_are_not_read(self, client, monkeypatch):
+        def no_leer(*args, **kwargs):
+            raise AssertionError("el cuerpo del archivo no debe leerse")
+
+        monkeypatch.setattr(http_cache.Response, "get_data", no_leer)
+        first = client.get("/archivo", headers={"Accept-Encoding": "gzip"})
+        assert "Content-Encoding" not in first.headers
+        etag = first.headers["ETag"]
+        second = client.get("/archivo", headers={"If-None-Match": etag})
+        assert second.status_code == 304
+        assert second.headers["ETag"] == etag
@@ -0,0 +1,99 @@
+import decimal
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+from flask import Flask, jsonify
+
+import utils.json_response as json_response
+from utils.json_response import FastJSONProvider, dumps
+
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def encoder(request, monkeypatch):
+    if request.param == "orjson":
+        if not json_response.HAS_ORJSON:
+            pytest.skip("orjson no instalado")
+    else:
+        monkeypatch.setattr(json_response, "HAS_ORJSON", False)
+    return request.param
+
+
+@pytest.fixture
+def df():
+    return pd.DataFrame({
+        "doc_con_pag": ["CERC", "Otros"],
+        "cantidad": np.array([3, 1], dtype="int64"),
+        "promedio": [1.5, np.nan],
+        "fecha": pd.to_datetime(["2025-10-01 08:00", None]),
+    })
+
+
+class TestDumps:
+    def test_dataframe_records(self, encoder, df):
+        data = json.loads(dumps({"data": df}))
+        assert data["data"] == [
+            {"doc_con_pag": "CERC", "cantidad": 3, "promedio": 1.5,
+             "fecha": "2025-10-01T08:00:00.000"},
+            {"doc_con_pag": "Otros", "cantidad": 1, "promedio": None, "fecha": None},
+        ]
+
+    def test_dataframe_columnar(self, encoder, df):
+        data = json.loads(dumps({"data": df}, formato="columnar"))
+        assert data["data"]["columns"] == ["doc_con_pag", "cantidad", "promedio", "fecha"]
+        assert data["data"]["data"][1] == ["Otros", 1, None, None]
+
+    def test_columnar_is_smaller(self, df):
+        big = pd.concat([df] * 100, ignore_index=True)
+        assert len(dumps(big, "columnar")) < len(dumps(big)) * 0.6
+
+    def test_numpy_pandas_and_decimal_scalars(self, encoder):
+        data = json.loads(dumps({
+            "n": np.int64(3),
+            "f": np.float32(1.5),
+            "nan": float("nan"),
+            "t": pd.Timestamp("2025-01-02 03:04:05"),
+            "nat": pd.NaT,
+            "d": decimal.Decimal("1.10"),
+            "s": pd.Series([1, 2]),
+        }))
+        assert data == {
+            "n": 3, "f": 1.5, "nan": None, "t": "2025-01-02T03:04:05",
+            "nat": None, "d": "1.10", "s": [1, 2],
+        }
+
+    def test_several_frames(self, encoder, df):
+        data = json.loads(dumps([df.head(1), {"otro": df.tail(1)}]))
+        assert data[0][0]["doc_con_pag"] == "CERC"
+        assert data[1]["otro"][0]["doc_con_pag"] == "Otros"
+
+    def test_unknown_type_fails(self, encoder):
+        with pytest.raises(TypeError):
+            dumps({"x": object()})
+
+
+class TestFastJSONProvider:
+    @pytest.fixture
+    def client(self, df):
+        app = Flask(__name__)
+        app.json = FastJSONProvider(app)
+
+        @app.route("/datos")
+        def datos():
+            return jsonify({"success": True, "data": df}), 200
+
+        return app.test_client()
+
+    def test_jsonify_dataframe(self, client):
+        response = client.get("/datos")
+        assert response.mimetype == "application/json"
+        assert response.get_json()["data"][0]["cantidad"] == 3
+
+    def test_formato_columnar_query_param(self, client):
+        body = client.get("/datos?formato=columnar").get_json()
+        assert body["data"]["columns"][0] == "doc_con_pag"
+
+    def test_invalid_formato_falls_back_to_records(self, client):
+        body = client.get("/datos?formato=xml").get_json()
+        assert isinstance(body["data"], list)
@@ -0,0 +1,67 @@
+import pandas as pd
+from stores.lru_query_cache import LruQueryCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestLruQueryCache:
+    def test_make_key_normalizes_sql_and_param_order(self):
+        a = LruQueryCache.make_key("SELECT  1\n FROM t WHERE a = %(a)s", {"a": 1, "b": 2})
+        b = LruQueryCache.make_key("SELECT 1 FROM t   WHERE a = %(a)s", {"b": 2, "a": 1})
+        c = LruQueryCache.make_key("SELECT 1 FROM t WHERE a = %(a)s", {"a": 2, "b": 2})
+        assert a == b
+        assert a != c
+
+    def test_entries_expire_after_ttl(self):
+        clock = FakeClock()
+        cache = LruQueryCache(clock=clock)
+        cache.set("k", "v", ttl=10)
+        clock.now = 9
+        assert cache.get("k") == "v"
+        clock.now = 10
+        assert cache.get("k") is None
+        assert len(cache) == 0
+
+    def test_evicts_least_recently_used_over_byte_budget(self):
+        df = pd.DataFrame({"a": range(100)})
+        size = LruQueryCache.size_of(df)
+        cache = LruQueryCache(max_bytes=size * 2)
+        cache.set("a", df)
+        cache.set("b", df)
+        cache.get("a")
+        cache.set("c", df)
+        assert cache.get("a") is not None
+        assert cache.get("b") is None
+        assert cache.get("c") is not None
+        assert cache.current_bytes == size * 2
+
+    def test_values_larger_than_budget_are_not_cached(self):
+        cache = LruQueryCache(max_bytes=10)
+        cache.set("k", pd.DataFrame({"a": range(100)}))
+        assert cache.get("k") is None
+
+    def test_invalidate_clears_everything(self):
+        cache = LruQueryCache()
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.invalidate()
+        assert cache.get("a") is None
+        assert cache.current_bytes == 0
+
+    def test_version_is_content_fingerprint_and_expires(self):
+        clock = FakeClock()
+        cache = LruQueryCache(clock=clock)
+        cache.set("a", pd.DataFrame({"x": [1, 2]}), ttl=10)
+        cache.set("b", pd.DataFrame({"x": [1, 2]}))
+        cache.set("c", pd.DataFrame({"x": [1, 3]}))
+        assert cache.version("a") == cache.version("b")
+        assert cache.version("a") != cache.version("c")
+        assert cache.version("missing") is None
+        clock.now = 10
+        assert cache.version("a") is None
@@ -0,0 +1,50 @@
+import os
+import pytest
+from PIL import Image, ImageDraw
+from views.generate_dashboard.r_donut import ChartGenerator, DonutValue, ReportDonut
+
+
+class TestChartGenerator:
+    def test_donut_is_rendered_in_memory(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        img = ChartGenerator.generate_donut_chart([1, 1], ['#FF0000', '#0000FF'])
+        assert isinstance(img, Image.Image)
+        assert img.mode == 'RGBA'
+        assert img.size == (ChartGenerator.SIZE, ChartGenerator.SIZE)
+        assert os.listdir(tmp_path) == []
+
+    def test_slices_start_at_twelve_counterclockwise(self):
+        img = ChartGenerator.generate_donut_chart([1, 3], ['#FF0000', '#0000FF'])
+        c = ChartGenerator.SIZE // 2
+        ring = int(ChartGenerator.RADIUS * (1 - ChartGenerator.RING_WIDTH / 2))
+        # primera porción (25%) entre las 12 y las 9, el resto en las demás
+        assert img.getpixel((c - ring // 2 - 10, c - ring // 2 - 10)) == (255, 0, 0, 255)
+        assert img.getpixel((c + ring, c)) == (0, 0, 255, 255)
+        assert img.getpixel((c, c + ring)) == (0, 0, 255, 255)
+        # centro y esquinas transparentes
+        assert img.getpixel((c, c))[3] == 0
+        assert img.getpixel((0, 0))[3] == 0
+
+    def test_zero_total_draws_empty_ring(self):
+        img = ChartGenerator.generate_donut_chart([0, 0], ['#FF0000', '#0000FF'])
+        c = ChartGenerator.SIZE // 2
+        ring = int(ChartGenerator.RADIUS * (1 - ChartGenerator.RING_WIDTH / 2))
+        assert img.getpixel((c + ring, c))[:3] == (0xE5, 0xE7, 0xEB)
+
+    def test_negative_values_are_rejected(self):
+        with pytest.raises(ValueError):
+            ChartGenerator.generate_donut_chart([-1, 2], ['#FF0000', '#0000FF'])
+
+
+class TestReportDonut:
+    def test_donut_horizontal_draws_on_image(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        img = Image.new('RGB', (700, 300), 'white')
+        ReportDonut(font_path='ARIAL.TTF').donut_horizontal(
+            img,
+            ImageDraw.Draw(img),
+            [DonutValue(value=1, label='Libres'), DonutValue(value=2, label='En ruta')],
+            (0, 0),
+        )
+        assert len(img.getcolors(700 * 300)) > 2
+        assert os.listdir(tmp_path) == []
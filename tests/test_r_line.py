@@ -0,0 +1,53 @@
+import datetime as dt
+from concurrent.futures import ThreadPoolExecutor
+from PIL import Image
+from utils.utils import kg_a_toneladas
+from views.generate_dashboard.r_line import RLine
+
+
+def _data(n, factor=1000):
+    return [
+        {"fecha": dt.datetime(2025, 1, 1) + dt.timedelta(days=d), "peso": factor * (d + 1)}
+        for d in range(n)
+    ]
+
+
+def _render(renderer, data, **kwargs):
+    img = Image.new("RGB", (RLine.WIDTH, RLine.HEIGHT), "white")
+    renderer.generate_line(img, line_data=data, position=(0, 0), **kwargs)
+    return img.tobytes()
+
+
+class TestRLine:
+    def test_figure_is_reused_between_renders(self):
+        renderer = RLine(font_path="")
+        fig, line = renderer.fig, None
+        _render(renderer, _data(5))
+        line = renderer._line
+        _render(renderer, _data(8))
+        assert renderer.fig is fig
+        assert renderer._line is line
+        assert len(renderer.ax.lines) == 3  # serie + 2 metas
+        assert renderer.canvas.get_width_height() == (RLine.WIDTH, RLine.HEIGHT)
+
+    def test_rerender_matches_fresh_renderer(self):
+        reused = RLine(font_path="")
+        _render(reused, _data(20, factor=50), meta_alta=900)
+        assert _render(reused, _data(7)) == _render(RLine(font_path=""), _data(7))
+
+    def test_meta_lines_toggle(self):
+        renderer = RLine(font_path="")
+        _render(renderer, _data(5), meta_alta=3000, meta_media=2000)
+        assert renderer._metas["alta"]["line"].get_visible()
+        assert renderer._metas["media"]["text"].get_text() == "Meta Media: " + kg_a_toneladas(2000)
+        _render(renderer, _data(5))
+        assert not renderer._metas["alta"]["line"].get_visible()
+        assert not renderer._metas["media"]["text"].get_visible()
+
+    def test_concurrent_renders_are_consistent(self):
+        renderer = RLine(font_path="")
+        datasets = [_data(5), _data(9, factor=300), _data(14, factor=700)] * 3
+        expected = [_render(RLine(font_path=""), d) for d in datasets[:3]] * 3
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            results = list(pool.map(lambda d: _render(renderer, d), datasets))
+        assert results == expected
@@ -0,0 +1,63 @@
+import pandas as pd
+from PIL import Image
+from views.generate_dashboard.render_cache import RenderCache
+
+
+def _tile(color="white", size=(10, 10)):
+    return Image.new("RGB", size, color)
+
+
+class TestRenderCacheKey:
+    def test_same_frame_same_key(self):
+        a = pd.DataFrame({'doc_excep': ['A', 'B'], 'count': [3, 1]})
+        b = pd.DataFrame({'doc_excep': ['A', 'B'], 'count': [3, 1]})
+        assert RenderCache.make_key('excepciones', (0, 0), a) == \
+            RenderCache.make_key('excepciones', (0, 0), b)
+
+    def test_data_change_changes_key(self):
+        a = pd.DataFrame({'doc_excep': ['A', 'B'], 'count': [3, 1]})
+        b = pd.DataFrame({'doc_excep': ['A', 'B'], 'count': [3, 2]})
+        assert RenderCache.make_key('excepciones', a) != RenderCache.make_key('excepciones', b)
+
+    def test_dtype_and_layout_are_part_of_key(self):
+        a = pd.DataFrame({'count': [1, 2]})
+        assert RenderCache.make_key('p', a) != RenderCache.make_key('p', a.astype('float64'))
+        assert RenderCache.make_key('p', (0, 0), a) != RenderCache.make_key('p', (0, 10), a)
+        assert RenderCache.make_key('p', a) != RenderCache.make_key('q', a)
+
+    def test_lists_of_dicts_are_hashed_by_content(self):
+        assert RenderCache.make_key('p', [{'a': 1, 'b': 2}]) == \
+            RenderCache.make_key('p', [{'b': 2, 'a': 1}])
+
+
+class TestRenderCache:
+    def test_get_set(self):
+        cache = RenderCache()
+        tile = _tile()
+        cache.set('k', tile)
+        assert cache.get('k') is tile
+        assert cache.get('otra') is None
+        assert cache.current_bytes == 10 * 10 * 3
+
+    def test_lru_eviction_by_bytes(self):
+        cache = RenderCache(max_bytes=2 * 300)
+        cache.set('a', _tile())
+        cache.set('b', _tile())
+        cache.get('a')  # 'b' queda como la menos usada
+        cache.set('c', _tile())
+        assert cache.get('b') is None
+        assert cache.get('a') is not None
+        assert cache.get('c') is not None
+        assert cache.current_bytes == 600
+
+    def test_oversized_tile_is_not_stored(self):
+        cache = RenderCache(max_bytes=100)
+        cache.set('k', _tile())
+        assert len(cache) == 0
+
+    def test_clear(self):
+        cache = RenderCache()
+        cache.set('k', _tile())
+        cache.clear()
+        assert len(cache) == 0
+        assert cache.current_bytes == 0
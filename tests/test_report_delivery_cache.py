@@ -0,0 +1,73 @@
+import pandas as pd
+import pytest
+from stores.report_delivery_cache import ReportDeliveryCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def cache(clock):
+    return ReportDeliveryCache(max_entries=2, ttl=60, clock=clock)
+
+
+@pytest.fixture
+def df():
+    return pd.DataFrame({"placa": ["A1", "B2"], "peso": [10.0, 20.0]})
+
+
+class TestReportDeliveryCache:
+    def test_key_depends_on_type_date_and_data(self, df):
+        key = ReportDeliveryCache.make_key("programados", "2025-01-02", df)
+        assert key == ReportDeliveryCache.make_key("programados", "2025-01-02", df.copy())
+        assert key != ReportDeliveryCache.make_key("despachados", "2025-01-02", df)
+        assert key != ReportDeliveryCache.make_key("programados", "2025-01-03", df)
+        changed = df.assign(peso=[10.0, 21.0])
+        assert key != ReportDeliveryCache.make_key("programados", "2025-01-02", changed)
+
+    def test_get_and_set(self, cache):
+        assert cache.get("k") is None
+        cache.set("k", ["a", "b"])
+        assert cache.get("k") == ["a", "b"]
+
+    def test_entries_expire(self, cache, clock):
+        cache.set("k", ["a"])
+        clock.now = 60
+        assert cache.get("k") is None
+        assert len(cache) == 0
+
+    def test_evicts_least_recently_used(self, cache):
+        cache.set("a", ["1"])
+        cache.set("b", ["2"])
+        cache.get("a")
+        cache.set("c", ["3"])
+        assert cache.get("b") is None
+        assert cache.get("a") == ["1"]
+
+    def test_invalidate_and_empty_set(self, cache):
+        cache.set("k", ["a"])
+        cache.invalidate("k")
+        cache.set("vacio", [])
+        assert len(cache) == 0
+
+    def test_prerendered_pages(self, cache):
+        cache.set_pages("k", [b"p1", b"p2"])
+        assert cache.get_pages("k") == [b"p1", b"p2"]
+        assert cache.get("k") is None
+
+    def test_file_ids_replace_pages(self, cache):
+        cache.set_pages("k", [b"p1"])
+        cache.set("k", ["f1"])
+        assert cache.get_pages("k") is None
+        cache.set_pages("k", [b"p1"])
+        assert cache.get("k") == ["f1"]
@@ -0,0 +1,233 @@
+import threading
+import time
+
+import pytest
+from pydantic import ValidationError
+
+from models.report_job import ReportJobStatus
+from services.report_job_service import ReportJobService
+from stores.report_job_sqlite_store import ReportJobSqliteStore
+
+
+DASHBOARD_PARAMS = {"start_date": "2025-01-01", "end_date": "2025-01-31"}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def store(tmp_path, clock):
+    return ReportJobSqliteStore(str(tmp_path / "jobs.sqlite3"), clock=clock)
+
+
+def wait_finished(service, job_id, timeout=5):
+    limite = time.monotonic() + timeout
+    while time.monotonic() < limite:
+        job = service.get(job_id)
+        if job.finished:
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"el trabajo {job_id} no terminó")
+
+
+class TestReportJobSqliteStore:
+    def test_enqueue_and_claim_in_order(self, store, clock):
+        first = store.enqueue("dashboard", {"start_date": "2025-01-01"})
+        clock.now += 1
+        second = store.enqueue("dashboard", {})
+
+        claimed = store.claim_next()
+        assert claimed.id == first.id
+        assert claimed.params == {"start_date": "2025-01-01"}
+        assert store.get(first.id).status == ReportJobStatus.RUNNING
+        assert store.claim_next().id == second.id
+        assert store.claim_next() is None
+
+    def test_complete_stores_artifacts(self, store):
+        job = store.enqueue("programados_del_dia", {})
+        store.claim_next()
+        store.complete(job.id, [b"p1", b"p2"], "image/png")
+
+        done = store.get(job.id)
+        assert done.status == ReportJobStatus.DONE and done.artifact_count == 2
+        assert store.get_artifact(job.id, 1) == b"p2"
+        assert store.get_artifact(job.id, 2) is None
+
+    def test_jobs_survive_reopening(self, store, tmp_path, clock):
+        job = store.enqueue("dashboard", {})
+        reopened = ReportJobSqliteStore(str(tmp_path / "jobs.sqlite3"), clock=clock)
+        assert reopened.get(job.id).status == ReportJobStatus.QUEUED
+
+    def test_requeue_stale_running_jobs(self, store, clock):
+        job = store.enqueue("dashboard", {})
+        store.claim_next()
+        assert store.requeue_stale(60) == 0
+        clock.now += 61
+        assert store.requeue_stale(60) == 1
+        assert store.get(job.id).status == ReportJobStatus.QUEUED
+
+    def test_heartbeat_keeps_long_running_jobs_claimed(self, store, clock):
+        job = store.enqueue("dashboard", {})
+        store.claim_next("w1")
+        clock.now += 50
+        assert store.heartbeat("w2") == 0
+        assert store.heartbeat("w1") == 1
+        clock.now += 50
+        assert store.requeue_stale(60) == 0
+        clock.now += 11
+        assert store.requeue_stale(60) == 1
+        assert store.get(job.id).status == ReportJobStatus.QUEUED
+
+    def test_adds_worker_column_to_existing_files(self, tmp_path, clock):
+        import sqlite3
+        path = str(tmp_path / "old.sqlite3")
+        with sqlite3.connect(path) as conn:
+            conn.execute(
+                "CREATE TABLE report_jobs (id TEXT PRIMARY KEY, tipo TEXT NOT NULL, "
+                "params TEXT NOT NULL, status TEXT NOT NULL, error TEXT NULL, "
+                "mimetype TEXT NULL, artifact_count INTEGER NOT NULL DEFAULT 0, "
+                "created_at REAL NOT NULL, updated_at REAL NOT NULL)"
+            )
+        store = ReportJobSqliteStore(path, clock=clock)
+        job = store.enqueue("dashboard", {})
+        assert store.claim_next("w1").id == job.id
+        assert store.heartbeat("w1") == 1
+
+    def test_purge_finished_jobs(self, store, clock):
+        done = store.enqueue("dashboard", {})
+        store.claim_next()
+        store.complete(done.id, [b"x"], "image/png")
+        pending = store.enqueue("dashboard", {})
+        clock.now += 100
+        assert store.purge(50) == 1
+        assert store.get(done.id) is None and store.get_artifact(done.id) is None
+        assert store.get(pending.id) is not None
+
+
+class TestReportJobService:
+    def test_submit_returns_before_render(self, store):
+        release = threading.Event()
+
+        def render(params):
+            assert release.wait(5)
+            return [b"png-" + params["fecha"].encode()], "image/png"
+
+        service = ReportJobService(store, {"programados_del_dia": render})
+        try:
+            job = service.submit("programados_del_dia", {"fecha": "2025-01-02"})
+            assert service.get(job.id).status in (ReportJobStatus.QUEUED, ReportJobStatus.RUNNING)
+            release.set()
+            done = wait_finished(service, job.id)
+        finally:
+            service.shutdown()
+        assert done.status == ReportJobStatus.DONE and done.mimetype == "image/png"
+        assert service.get_artifact(job.id) == b"png-2025-01-02"
+
+    def test_failed_render_is_recorded(self, store):
+        def render(params):
+            raise ValueError("No hay datos para la fecha")
+
+        service = ReportJobService(store, {"dashboard": render})
+        try:
+            job = wait_finished(service, service.submit("dashboard", DASHBOARD_PARAMS).id)
+        finally:
+            service.shutdown()
+        assert job.status == ReportJobStatus.FAILED
+        assert job.error == "No hay datos para la fecha"
+
+    def test_unknown_type_is_rejected(self, store):
+        service = ReportJobService(store, {})
+        with pytest.raises(ValueError):
+            service.submit("otro")
+        service.shutdown()
+
+    @pytest.mark.parametrize(
+        "params",
+        [{}, {"start_date": "2025-01-01"}, {"start_date": "ayer", "end_date": "2025-01-31"}],
+    )
+    def test_invalid_params_are_rejected_on_submit(self, store, params):
+        service = ReportJobService(store, {"dashboard": lambda p: ([b"x"], "image/png")})
+        try:
+            with pytest.raises(ValidationError):
+                service.submit("dashboard", params)
+        finally:
+            service.shutdown()
+        assert store.claim_next() is None
+
+    def test_params_are_stored_normalized(self, store):
+        service = ReportJobService(store, {"programados_del_dia": lambda p: ([b"x"], "image/png")})
+        try:
+            job = service.submit("programados_del_dia", {"fecha": "2025-01-02T00:00:00"})
+            assert wait_finished(service, job.id).params == {"fecha": "2025-01-02"}
+        finally:
+            service.shutdown()
+
+    def test_pool_is_bounded(self, store):
+        lock = threading.Lock()
+        running, peak = [0], [0]
+
+        def render(params):
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            time.sleep(0.02)
+            with lock:
+                running[0] -= 1
+            return [b"x"], "image/png"
+
+        service = ReportJobService(store, {"dashboard": render}, max_workers=2)
+        try:
+            jobs = [service.submit("dashboard", DASHBOARD_PARAMS) for _ in range(6)]
+            assert all(wait_finished(service, j.id).status == ReportJobStatus.DONE for j in jobs)
+        finally:
+            service.shutdown()
+        assert peak[0] <= 2
+
+    def test_jobs_of_live_workers_are_not_requeued(self, store, clock):
+        release = threading.Event()
+        renders = []
+
+        def render(params):
+            renders.append(params)
+            assert release.wait(5)
+            return [b"x"], "image/png"
+
+        service = ReportJobService(store, {"dashboard": render}, stale_after=60)
+        other = ReportJobService(store, {"dashboard": render}, stale_after=60)
+        try:
+            job = service.submit("dashboard", DASHBOARD_PARAMS)
+            while store.get(job.id).status != ReportJobStatus.RUNNING:
+                time.sleep(0.01)
+            for _ in range(5):  # render largo: el latido lo mantiene tomado
+                clock.now += 30
+                service.maintain()
+                other.maintain()
+            assert store.get(job.id).status == ReportJobStatus.RUNNING
+            release.set()
+            assert wait_finished(service, job.id).status == ReportJobStatus.DONE
+        finally:
+            service.shutdown()
+            other.shutdown()
+        assert len(renders) == 1
+
+    def test_stale_jobs_are_resumed_on_start(self, store, clock):
+        job = store.enqueue("dashboard", {})
+        store.claim_next()  # el proceso anterior murió a medias
+        clock.now += 3600
+        service = ReportJobService(
+            store, {"dashboard": lambda p: ([b"x"], "image/png")}, stale_after=60
+        )
+        try:
+            assert wait_finished(service, job.id).status == ReportJobStatus.DONE
+        finally:
+            service.shutdown()
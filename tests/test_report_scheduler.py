@@ -0,0 +1,114 @@
+import asyncio
+from datetime import date, datetime, time
+from io import BytesIO
+
+import pandas as pd
+import pytest
+
+import services.report_render_service as report_render_service
+from services.report_render_service import ReportRenderService
+from services.report_scheduler import ReportScheduler
+from stores.report_delivery_cache import ReportDeliveryCache
+
+
+class FakeQueryService:
+    df = pd.DataFrame({"placa": ["A1", "B2"], "peso": [10.0, 20.0]})
+    queries = 0
+
+    def __init__(self, db_connection):
+        pass
+
+    def get_programados_del_dia(self, date_value):
+        FakeQueryService.queries += 1
+        return self.df
+
+
+class FakeAnalysisService:
+    def __init__(self):
+        self.renders = 0
+
+    def despachados_del_dia_paginas(self, df, date_programen):
+        self.renders += 1
+        return [BytesIO(b"p1"), BytesIO(b"p2")]
+
+
+class FakeReportService:
+    def __init__(self, fail_routes=False):
+        self.fail_routes = fail_routes
+        self.calls = []
+
+    def report_date(self):
+        return date(2025, 1, 2)
+
+    def warm_route_reports(self, date_value):
+        self.calls.append(("rutas", date_value))
+        if self.fail_routes:
+            raise ConnectionError("db caída")
+        return 1
+
+
+@pytest.fixture
+def render_service(monkeypatch):
+    monkeypatch.setattr(report_render_service, "DocumentoQueryService", FakeQueryService)
+    FakeQueryService.queries = 0
+    return ReportRenderService(
+        db_connection=None,
+        delivery_cache=ReportDeliveryCache(),
+        data_analysis_service=FakeAnalysisService(),
+    )
+
+
+class TestReportRenderService:
+    def test_warm_renders_once_for_all_types(self, render_service):
+        assert render_service.warm_route_reports("2025-01-02") == 2
+        assert render_service.data_analysis_service.renders == 1
+        assert len(render_service.delivery_cache) == 2
+
+    def test_request_after_warm_uses_prerendered_pages(self, render_service):
+        render_service.warm_route_reports("2025-01-02")
+        report = render_service.build_route_report("despachados", "2025-01-02")
+        assert report.pages == [b"p1", b"p2"] and not report.cached
+        assert render_service.data_analysis_service.renders == 1
+
+    def test_uploaded_report_is_not_rewarmed(self, render_service):
+        report = render_service.build_route_report("programados", "2025-01-02")
+        render_service.delivery_cache.set(report.key, ["f1", "f2"])
+        render_service.warm_route_reports("2025-01-02", tipos=["programados"])
+        assert render_service.data_analysis_service.renders == 1
+        assert render_service.build_route_report("programados", "2025-01-02").cached
+
+
+class TestReportScheduler:
+    def test_next_run_same_day_and_next_day(self):
+        scheduler = ReportScheduler(FakeReportService(), times=[time(12, 0), time(6, 30)])
+        assert scheduler.next_run(datetime(2025, 1, 2, 5, 0)) == datetime(2025, 1, 2, 6, 30)
+        assert scheduler.next_run(datetime(2025, 1, 2, 6, 30)) == datetime(2025, 1, 2, 12, 0)
+        assert scheduler.next_run(datetime(2025, 1, 2, 13, 0)) == datetime(2025, 1, 3, 6, 30)
+
+    def test_precompute_continues_after_errors(self):
+        service = FakeReportService(fail_routes=True)
+        ReportScheduler(service, times=[time(6, 30)]).precompute()
+        assert service.calls == [("rutas", date(2025, 1, 2))]
+
+    def test_run_once_with_explicit_date(self):
+        service = FakeReportService()
+        asyncio.run(ReportScheduler(service, times=[time(6, 30)]).run_once("2025-01-05"))
+        assert service.calls == [("rutas", "2025-01-05")]
+
+    def test_runs_at_scheduled_time(self):
+        service = FakeReportService()
+        now = datetime(2025, 1, 2, 6, 29, 59, 950000)
+        scheduler = ReportScheduler(service, times=[time(6, 30)], now=lambda: now)
+
+        async def scenario():
+            task = scheduler.start()
+            await asyncio.sleep(0.2)
+            scheduler.stop()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(scenario())
+        assert service.calls[0][0] == "rutas"
+
+    def test_start_without_times_is_noop(self):
+        assert ReportScheduler(FakeReportService(), times=[]).start() is None
@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from decimal import Decimal
+from database.result_decoder import rows_to_dataframe
+
+
+class TestRowsToDataFrame:
+    COLUMNS = ["doc_id", "doc_fec_crea", "doc_peso_tot", "doc_con_pag", "doc_raz_soc"]
+    DTYPES = {
+        "doc_fec_crea": "datetime64[ns]",
+        "doc_peso_tot": "float64",
+        "doc_con_pag": "category",
+    }
+
+    def test_decodes_tuples_into_typed_columns(self):
+        rows = [
+            (1, datetime(2025, 1, 2, 8, 30), Decimal("10.50"), "CERC", "Cliente 1"),
+            (2, None, None, "PA72", "Cliente 2"),
+            (3, datetime(2025, 1, 3), Decimal("1"), "CERC", None),
+        ]
+        df = rows_to_dataframe(rows, self.COLUMNS, self.DTYPES)
+
+        assert list(df.columns) == self.COLUMNS
+        assert df["doc_fec_crea"].dtype == np.dtype("datetime64[ns]")
+        assert pd.isna(df["doc_fec_crea"].iloc[1])
+        assert df["doc_peso_tot"].dtype == np.float64
+        assert np.isnan(df["doc_peso_tot"].iloc[1])
+        assert isinstance(df["doc_con_pag"].dtype, pd.CategoricalDtype)
+        assert set(df["doc_con_pag"].cat.categories) == {"CERC", "PA72"}
+        assert df["doc_id"].dtype == np.int64
+
+    def test_untyped_int_column_with_nulls_becomes_float(self):
+        df = rows_to_dataframe([(1,), (None,)], ["rut_id"])
+        assert df["rut_id"].dtype == np.float64
+
+    def test_untyped_decimal_column_becomes_float(self):
+        df = rows_to_dataframe([(Decimal("1.25"),), (None,), (Decimal("3"),)], ["doc_imp_mn"])
+        assert df["doc_imp_mn"].dtype == np.float64
+        assert df["doc_imp_mn"].iloc[0] == 1.25
+        assert np.isnan(df["doc_imp_mn"].iloc[1])
+
+    def test_invalid_dates_become_nat(self):
+        df = rows_to_dataframe(
+            [("0000-00-00 00:00:00",), (datetime(2025, 1, 1),)],
+            ["doc_fec_crea"],
+            self.DTYPES,
+        )
+        assert pd.isna(df["doc_fec_crea"].iloc[0])
+        assert df["doc_fec_crea"].iloc[1] == pd.Timestamp("2025-01-01")
+
+    def test_empty_result_keeps_schema(self):
+        df = rows_to_dataframe([], self.COLUMNS, self.DTYPES)
+        assert df.empty
+        assert list(df.columns) == self.COLUMNS
+        assert df["doc_fec_crea"].dtype == np.dtype("datetime64[ns]")
@@ -0,0 +1,126 @@
+import threading
+
+import pytest
+from typing import Any, Dict, List
+from interfaces.telegram_authorization_store import ITelegramAuthorizationStore
+from stores.telegram_authorization_cached_store import TelegramAuthorizationCachedStore
+
+
+class FakeStore(ITelegramAuthorizationStore):
+    def __init__(self, user_ids):
+        self.user_ids = set(user_ids)
+        self.list_calls = 0
+        self.is_authorized_calls = 0
+        self.fail = False
+
+    def add_user(self, user_id: int, username: str = None):
+        self.user_ids.add(user_id)
+
+    def remove_user(self, user_id: int):
+        self.user_ids.discard(user_id)
+
+    def is_authorized(self, user_id: int) -> bool:
+        self.is_authorized_calls += 1
+        return user_id in self.user_ids
+
+    def list_users(self) -> List[Dict[str, Any]]:
+        self.list_calls += 1
+        if self.fail:
+            raise ConnectionError("db caída")
+        return [{"user_id": u, "username": None} for u in self.user_ids]
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def store():
+    return FakeStore({1, 2})
+
+
+@pytest.fixture
+def cached(store, clock):
+    return TelegramAuthorizationCachedStore(store, ttl=60, clock=clock)
+
+
+class TestTelegramAuthorizationCachedStore:
+    def test_loads_users_at_startup(self, cached, store):
+        assert store.list_calls == 1
+        assert cached.is_authorized(1)
+        assert not cached.is_authorized(3)
+        assert store.is_authorized_calls == 0
+
+    def test_add_and_remove_update_cache_and_store(self, cached, store):
+        cached.add_user(3, username="x")
+        assert cached.is_authorized(3) and 3 in store.user_ids
+        cached.remove_user(1)
+        assert not cached.is_authorized(1) and 1 not in store.user_ids
+        assert store.list_calls == 1
+
+    def test_refreshes_after_ttl(self, cached, store, clock):
+        store.user_ids.add(5)  # alta hecha por otro proceso
+        assert not cached.is_authorized(5)
+        clock.now = 61
+        assert cached.is_authorized(5)
+        assert store.list_calls == 2
+
+    def test_failed_refresh_keeps_previous_users(self, cached, store, clock):
+        store.fail = True
+        clock.now = 61
+        assert cached.is_authorized(1)
+
+    def test_failed_refresh_backs_off(self, cached, store, clock):
+        store.fail = True
+        clock.now = 61
+        cached.is_authorized(1)
+        cached.is_authorized(2)
+        assert store.list_calls == 2
+        clock.now = 61 + cached.retry_after
+        store.fail = False
+        cached.is_authorized(1)
+        assert store.list_calls == 3
+
+    def test_empty_refresh_revokes_everyone(self, cached, store, clock):
+        store.user_ids.clear()  # bajas hechas por otro proceso
+        clock.now = 61
+        assert not cached.is_authorized(1)
+        assert store.is_authorized_calls == 0
+
+    def test_falls_back_to_store_until_first_load(self, clock):
+        store = FakeStore({1})
+        store.fail = True
+        cached = TelegramAuthorizationCachedStore(store, ttl=60, clock=clock)
+        assert cached.is_authorized(1)
+        assert store.is_authorized_calls == 1
+
+    def test_add_during_refresh_is_not_overwritten(self, cached, store):
+        entered, release = threading.Event(), threading.Event()
+        list_users = store.list_users
+
+        def slow_list_users():
+            stale = list_users()  # lista leída antes del alta
+            entered.set()
+            assert release.wait(5)
+            return stale
+
+        store.list_users = slow_list_users
+        refresh = threading.Thread(target=cached.refresh)
+        refresh.start()
+        assert entered.wait(5)
+        add = threading.Thread(target=cached.add_user, args=(99,))
+        add.start()
+        add.join(0.05)
+        release.set()
+        refresh.join(5)
+        add.join(5)
+        assert cached.is_authorized(99)
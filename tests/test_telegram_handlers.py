@@ -0,0 +1,234 @@
+import asyncio
+import threading
+from io import BytesIO
+from types import SimpleNamespace
+from typing import List
+
+import pandas as pd
+import pytest
+from telegram.error import BadRequest
+
+import services.report_render_service as report_render_service
+from services.report_render_service import RouteReport
+from services.telegram_handlers import BotHandlers
+from stores.report_delivery_cache import ReportDeliveryCache
+
+
+class FakeAuthStore:
+    def __init__(self, authorized):
+        self.authorized = set(authorized)
+        self.threads: List[str] = []
+
+    def is_authorized(self, user_id: int) -> bool:
+        self.threads.append(threading.current_thread().name)
+        return user_id in self.authorized
+
+    def add_user(self, user_id: int, username: str = None):
+        self.authorized.add(user_id)
+
+
+def sent_message(file_id: str):
+    sizes = [SimpleNamespace(file_id=f"{file_id}-thumb"), SimpleNamespace(file_id=file_id)]
+    return SimpleNamespace(photo=sizes)
+
+
+class FakeMessage:
+    def __init__(self, reject_file_ids=False):
+        self.texts: List[str] = []
+        self.photos: List = []
+        self.reject_file_ids = reject_file_ids
+
+    async def reply_text(self, text, **kwargs):
+        self.texts.append(text)
+
+    async def reply_photo(self, photo, caption=None):
+        if isinstance(photo, str) and self.reject_file_ids:
+            raise BadRequest("Wrong file identifier")
+        self.photos.append(photo)
+        return sent_message(f"id-{len(self.photos)}")
+
+    async def reply_media_group(self, media):
+        self.photos.extend(item.media for item in media)
+        return [sent_message(f"id-{i}") for i in range(len(media))]
+
+
+class FakeBot:
+    def __init__(self):
+        self.actions: List[str] = []
+        self.messages: List[str] = []
+
+    async def send_chat_action(self, chat_id, action):
+        self.actions.append(action)
+
+    async def send_message(self, chat_id, text, **kwargs):
+        self.messages.append(text)
+
+
+def make_update(user_id: int, **message_kwargs):
+    return SimpleNamespace(
+        effective_user=SimpleNamespace(id=user_id, first_name="u"),
+        effective_chat=SimpleNamespace(id=user_id),
+        message=FakeMessage(**message_kwargs),
+    )
+
+
+class FakeQueryService:
+    df = pd.DataFrame({"placa": ["A1", "B2"], "peso": [10.0, 20.0]})
+
+    def __init__(self, db_connection):
+        pass
+
+    def get_programados_del_dia(self, date_value):
+        return self.df
+
+
+class FakeAnalysisService:
+    renders = 0
+
+    def despachados_del_dia_paginas(self, df, date_programen):
+        FakeAnalysisService.renders += 1
+        return [BytesIO(b"png")]
+
+
+@pytest.fixture
+def handlers():
+    h = BotHandlers(
+        admin_id=1,
+        auth_store=FakeAuthStore({10, 20}),
+        db_connection=None,
+        delivery_cache=ReportDeliveryCache(),
+    )
+    yield h
+    h.executor.shutdown(wait=True)
+    h.auth_executor.shutdown(wait=True)
+
+
+class TestBotHandlers:
+    def test_report_runs_off_the_event_loop(self, handlers, tmp_path, monkeypatch):
+        release = threading.Event()
+        photo = tmp_path / "r.png"
+        photo.write_bytes(b"png")
+
+        def build(tipo, date_value):
+            # bloquea el hilo del executor hasta que el loop lo libere
+            assert release.wait(5)
+            return RouteReport(key="k", pages=[photo.read_bytes()], cached=False)
+
+        monkeypatch.setattr(handlers, "_build_route_report", build)
+        context = SimpleNamespace(bot=FakeBot())
+        update = make_update(10)
+
+        async def scenario():
+            task = asyncio.create_task(handlers.ruta_programada_hoy(update, context))
+            # el loop sigue libre mientras el reporte se genera
+            await asyncio.sleep(0.05)
+            assert not task.done()
+            release.set()
+            await asyncio.wait_for(task, 5)
+
+        asyncio.run(scenario())
+        assert update.message.photos == [b"png"]
+        assert context.bot.actions
+        assert all(name.startswith("bot-auth") for name in handlers.auth_store.threads)
+
+    def test_auth_does_not_wait_behind_running_renders(self, monkeypatch):
+        release = threading.Event()
+        handlers = BotHandlers(
+            admin_id=1,
+            auth_store=FakeAuthStore({10, 20}),
+            db_connection=None,
+            max_workers=1,
+            delivery_cache=ReportDeliveryCache(),
+        )
+
+        def build(tipo, date_value):
+            assert release.wait(5)
+            return None
+
+        monkeypatch.setattr(handlers, "_build_route_report", build)
+        context = SimpleNamespace(bot=FakeBot())
+        start = make_update(30)
+
+        async def scenario():
+            # el único hilo de reportes queda ocupado por el render
+            task = asyncio.create_task(handlers.ruta_programada_hoy(make_update(10), context))
+            await asyncio.sleep(0.05)
+            await asyncio.wait_for(handlers.start(start, context), 1)
+            release.set()
+            await asyncio.wait_for(task, 5)
+
+        try:
+            asyncio.run(scenario())
+        finally:
+            handlers.shutdown()
+        assert start.message.texts == ["⏳ Tu solicitud está pendiente de aprobación..."]
+
+    def test_second_report_for_same_user_is_rejected(self, handlers, monkeypatch):
+        release = threading.Event()
+
+        def build(tipo, date_value):
+            assert release.wait(5)
+            return None
+
+        monkeypatch.setattr(handlers, "_build_route_report", build)
+        context = SimpleNamespace(bot=FakeBot())
+        first, second, other = make_update(10), make_update(10), make_update(20)
+
+        async def scenario():
+            task = asyncio.create_task(handlers.ruta_programada_hoy(first, context))
+            await asyncio.sleep(0.05)
+            await handlers.ruta_programada_hoy(second, context)
+            other_task = asyncio.create_task(handlers.ruta_despachados(other, context))
+            await asyncio.sleep(0.05)
+            release.set()
+            await asyncio.wait_for(asyncio.gather(task, other_task), 5)
+
+        asyncio.run(scenario())
+        assert second.message.texts == [
+            "⏳ Ya estoy generando un reporte para ti, espera a que termine."
+        ]
+        assert first.message.texts == ["📭 No hay rutas programadas para hoy."]
+        assert other.message.texts == ["📭 No hay rutas despachadas para hoy."]
+
+    def test_unauthorized_user_does_not_build_report(self, handlers, monkeypatch):
+        monkeypatch.setattr(
+            handlers, "_build_route_report", lambda *a: pytest.fail("no autorizado")
+        )
+        update = make_update(99)
+        asyncio.run(handlers.ruta_programada_hoy(update, SimpleNamespace(bot=FakeBot())))
+        assert update.message.texts[0].startswith("🚫")
+
+    @pytest.fixture
+    def fake_services(self, handlers, monkeypatch):
+        monkeypatch.setattr(report_render_service, "DocumentoQueryService", FakeQueryService)
+        handlers.report_service.data_analysis_service = FakeAnalysisService()
+        FakeAnalysisService.renders = 0
+
+    def test_identical_report_is_resent_by_file_id(self, handlers, fake_services):
+        context = SimpleNamespace(bot=FakeBot())
+        first, second = make_update(10), make_update(20)
+
+        asyncio.run(handlers.ruta_programada_hoy(first, context))
+        asyncio.run(handlers.ruta_programada_hoy(second, context))
+
+        assert FakeAnalysisService.renders == 1
+        assert first.message.photos == [b"png"]
+        # se reenvía la PhotoSize más grande, sin renderizar ni subir bytes
+        assert second.message.photos == ["id-1"]
+
+    def test_report_type_is_part_of_the_key(self, handlers, fake_services):
+        context = SimpleNamespace(bot=FakeBot())
+        asyncio.run(handlers.ruta_programada_hoy(make_update(10), context))
+        asyncio.run(handlers.ruta_despachados(make_update(10), context))
+        assert FakeAnalysisService.renders == 2
+
+    def test_invalid_file_id_is_regenerated(self, handlers, fake_services):
+        context = SimpleNamespace(bot=FakeBot())
+        asyncio.run(handlers.ruta_programada_hoy(make_update(10), context))
+
+        update = make_update(20, reject_file_ids=True)
+        asyncio.run(handlers.ruta_programada_hoy(update, context))
+
+        assert FakeAnalysisService.renders == 2
+        assert update.message.photos == [b"png"]
+        assert len(handlers.delivery_cache) == 1
@@ -0,0 +1,173 @@
+import gzip
+import hashlib
+import io
+from typing import Any, Optional
+
+from flask import Flask, Response, g, request
+
+try:
+    import brotli
+except ImportError:  # dependencia opcional: sin brotli solo se ofrece gzip
+    brotli = None
+
+HAS_BROTLI = brotli is not None
+
+# PNG/JPEG ya vienen comprimidos: recomprimirlos gasta CPU sin ahorrar bytes
+_COMPRESSIBLE = {
+    "application/json",
+    "application/javascript",
+    "image/svg+xml",
+    "image/bmp",
+    "image/x-icon",
+}
+_CONDITIONAL_METHODS = ("GET", "HEAD")
+
+
+def etag_for(*parts: Any) -> str:
+    """ETag fuerte (sin comillas) a partir de partes estables: ruta,
+    parámetros y versión de los datos"""
+    return hashlib.sha256("|".join(str(p) for p in parts).encode("utf-8")).hexdigest()
+
+
+def _base_etag(tag: str) -> str:
+    """El ETag de una representación comprimida sin el sufijo de codificación"""
+    for suffix in ("-gzip", "-br"):
+        if tag.endswith(suffix):
+            return tag[: -len(suffix)]
+    return tag
+
+
+def _matches(etag: str) -> bool:
+    if_none_match = request.if_none_match
+    if not if_none_match:
+        return False
+    if if_none_match.star_tag:
+        return True
+    return any(_base_etag(tag) == etag for tag in if_none_match.as_set(include_weak=True))
+
+
+def not_modified(etag: str) -> Optional[Response]:
+    """
+    Chequeo temprano para rutas: registra `etag` como ETag de la respuesta y,
+    si el cliente ya tiene esa versión (If-None-Match), devuelve un 304 listo
+    para retornar, sin consultar ni serializar nada. None en caso contrario.
+    """
+    use_etag(etag)
+    if request.method not in _CONDITIONAL_METHODS or not _matches(etag):
+        return None
+    response = Response(status=304)
+    _set_etag(response, etag, None)
+    response.vary.add("Accept-Encoding")
+    response.cache_control.no_cache = True
+    return response
+
+
+def use_etag(etag: str) -> None:
+    """Usa `etag` (p.ej. derivado de la versión de los datos) en vez del hash del cuerpo"""
+    g.http_etag = etag
+
+
+def _set_etag(response: Response, etag: str, encoding: Optional[str]) -> None:
+    response.set_etag(f"{etag}-{encoding}" if encoding else etag)
+
+
+def _negotiate() -> Optional[str]:
+    accept = request.accept_encodings
+    if HAS_BROTLI and accept["br"]:
+        return "br"
+    if accept["gzip"]:
+        return "gzip"
+    return None
+
+
+def _compressible(mimetype: Optional[str]) -> bool:
+    return bool(mimetype) and (mimetype.startswith("text/") or mimetype in _COMPRESSIBLE)
+
+
+def _file_backed(response: Response) -> bool:
+    """send_file de un archivo (no de un buffer en memoria): su cuerpo no se lee aquí"""
+    if not response.direct_passthrough:
+        return False
+    body = response.response
+    # werkzeug FileWrapper (.file) o el wsgi.file_wrapper del servidor (.filelike)
+    wrapped = getattr(body, "file", None) or getattr(body, "filelike", None)
+    return not isinstance(wrapped, io.BytesIO)
+
+
+def _answer_not_modified(response: Response, etag: str, compress: bool) -> Response:
+    close = getattr(response.response, "close", None)
+    if close is not None:
+        close()  # p.ej. el archivo abierto por send_file
+    response.status_code = 304
+    response.set_data(b"")
+    for header in ("Content-Type", "Content-Length"):
+        response.headers.pop(header, None)
+    _set_etag(response, etag, None)
+    if compress:
+        response.vary.add("Accept-Encoding")
+    return response
+
+
+def init_http_cache(app: Flask, min_size: int = 1024, compress_level: int = 6) -> None:
+    """
+    Respuestas condicionales y comprimidas para toda la app:
+
+    - ETag fuerte en las respuestas 200 a GET/HEAD: el que fijó la ruta con
+      `not_modified`/`use_etag` o, si no, el sha256 del cuerpo. Si coincide
+      con If-None-Match se responde 304 sin cuerpo. Los archivos servidos con
+      send_file no se leen: se usa el ETag que ya trae (mtime/tamaño).
+    - JSON/texto de al menos `min_size` bytes se comprime con brotli (si
+      está instalado) o gzip según Accept-Encoding.
+
+    Registrar después de CORS para que sus cabeceras lleguen también al 304.
+    """
+
+    @app.after_request
+    def _conditional_and_compressed(response: Response) -> Response:
+        if response.status_code == 304 or "Content-Encoding" in response.headers:
+            return response
+        if response.is_streamed and not response.direct_passthrough:
+            return response  # generadores: no se materializan
+        conditional = request.method in _CONDITIONAL_METHODS and response.status_code == 200
+        compress = 200 <= response.status_code < 300 and _compressible(response.mimetype)
+        if not (conditional or compress):
+            return response
+
+        if _file_backed(response):
+            # archivos en disco: se sirven tal cual, sin cargarlos en memoria
+            etag = g.get("http_etag") or response.get_etag()[0]
+            if conditional and etag:
+                etag = _base_etag(etag)
+                response.cache_control.no_cache = True
+                _set_etag(response, etag, None)
+                if _matches(etag):
+                    return _answer_not_modified(response, etag, False)
+            return response
+
+        # send_file con buffers en memoria: se lee para hashear/comprimir
+        response.direct_passthrough = False
+        data = response.get_data()
+
+        etag = None
+        if conditional:
+            etag = g.get("http_etag") or response.get_etag()[0] or hashlib.sha256(data).hexdigest()
+            etag = _base_etag(etag)
+            response.cache_control.no_cache = True  # revalidar siempre, barato con 304
+            if _matches(etag):
+                return _answer_not_modified(response, etag, compress)
+
+        encoding = None
+        if compress:
+            response.vary.add("Accept-Encoding")
+            if len(data) >= min_size:
+                encoding = _negotiate()
+        if encoding == "br":
+            response.set_data(brotli.compress(data, quality=min(compress_level, 11)))
+        elif encoding == "gzip":
+            # mtime=0: mismos datos -> mismos bytes comprimidos
+            response.set_data(gzip.compress(data, compresslevel=compress_level, mtime=0))
+        if encoding:
+            response.headers["Content-Encoding"] = encoding
+        if etag:
+            _set_etag(response, etag, encoding)
+        return response
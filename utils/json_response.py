@@ -0,0 +1,145 @@
+import datetime as dt
+import decimal
+import json
+import math
+import uuid
+from typing import Any, Callable, Dict
+
+import numpy as np
+import pandas as pd
+from flask import has_request_context, request
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # dependencia opcional: sin orjson se usa json de la stdlib
+    orjson = None
+
+HAS_ORJSON = orjson is not None
+
+FORMATO_RECORDS = "records"
+FORMATO_COLUMNAR = "columnar"
+FORMATOS = (FORMATO_RECORDS, FORMATO_COLUMNAR)
+
+
+def _frame_json(df: pd.DataFrame, formato: str) -> str:
+    """DataFrame -> JSON en C (pandas), columna por columna, sin dicts por fila.
+
+    - records: ``[{"col": valor, ...}, ...]``
+    - columnar: ``{"columns": [...], "data": [[fila], ...]}``
+    """
+    if formato == FORMATO_COLUMNAR:
+        columns = json.dumps([str(c) for c in df.columns], ensure_ascii=False, separators=(",", ":"))
+        values = df.to_json(orient="values", date_format="iso")
+        return f'{{"columns":{columns},"data":{values}}}'
+    return df.to_json(orient="records", date_format="iso")
+
+
+def _default(obj: Any) -> Any:
+    """Tipos que ni orjson ni json serializan solos"""
+    if obj is pd.NaT:
+        return None
+    if isinstance(obj, (pd.Timestamp, dt.datetime, dt.date, dt.time)):
+        return obj.isoformat()
+    if isinstance(obj, pd.Timedelta):
+        return obj.isoformat()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, decimal.Decimal):
+        # igual que el proveedor JSON por defecto de Flask
+        return str(obj)
+    if isinstance(obj, uuid.UUID):
+        return str(obj)
+    if hasattr(obj, "to_json") and callable(obj.to_json):
+        return obj.to_json()  # DataResponse y modelos con to_json()
+    raise TypeError(f"Tipo no serializable a JSON: {type(obj).__name__}")
+
+
+def _sin_nan(obj: Any) -> Any:
+    """NaN/inf -> null (json de la stdlib escribiría NaN, que no es JSON válido)"""
+    if isinstance(obj, float) and not math.isfinite(obj):
+        return None
+    if isinstance(obj, dict):
+        return {k: _sin_nan(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_sin_nan(v) for v in obj]
+    return obj
+
+
+def _dumps_plain(obj: Any, default: Callable[[Any], Any]) -> bytes:
+    if HAS_ORJSON:
+        return orjson.dumps(
+            obj,
+            default=default,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS,
+        )
+    try:
+        text = json.dumps(obj, default=default, ensure_ascii=False, allow_nan=False,
+                          separators=(",", ":"))
+    except ValueError:
+        text = json.dumps(_sin_nan(obj), default=default, ensure_ascii=False,
+                          separators=(",", ":"))
+    return text.encode("utf-8")
+
+
+def dumps(obj: Any, formato: str = FORMATO_RECORDS) -> bytes:
+    """Serializa a JSON (bytes) con orjson si está disponible.
+
+    Los DataFrame/Series del payload se serializan aparte con `to_json` de
+    pandas y se insertan tal cual en el documento: cada uno se reemplaza
+    por un marcador único que luego se sustituye por su JSON.
+    """
+    frames: Dict[str, bytes] = {}
+    prefix = f"__frame_{uuid.uuid4().hex}_"
+
+    def default(value: Any) -> Any:
+        if isinstance(value, (pd.DataFrame, pd.Series)):
+            token = f"{prefix}{len(frames)}"
+            if isinstance(value, pd.Series):
+                frames[token] = value.to_json(orient="values", date_format="iso").encode("utf-8")
+            else:
+                frames[token] = _frame_json(value, formato).encode("utf-8")
+            return token
+        return _default(value)
+
+    body = _dumps_plain(obj, default)
+    for token, frame in frames.items():
+        body = body.replace(f'"{token}"'.encode("utf-8"), frame, 1)
+    return body
+
+
+def loads(data: Any) -> Any:
+    if HAS_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def request_formato(default: str = FORMATO_RECORDS) -> str:
+    """Formato pedido con ?formato=records|columnar (records si no es válido)"""
+    if not has_request_context():
+        return default
+    formato = request.args.get("formato", default)
+    return formato if formato in FORMATOS else default
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    Proveedor JSON de Flask (`app.json = FastJSONProvider(app)`): `jsonify`
+    en todas las rutas pasa a usar `dumps`, acepta DataFrames en el payload
+    y respeta `?formato=columnar`.
+    """
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return dumps(obj, request_formato()).decode("utf-8")
+
+    def loads(self, s: Any, **kwargs: Any) -> Any:
+        return loads(s)
+
+    def response(self, *args: Any, **kwargs: Any):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            dumps(obj, request_formato()), mimetype=self.mimetype
+        )
+
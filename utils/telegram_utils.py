@@ -1,4 +1,5 @@
 import requests
+from typing import BinaryIO, Union
 from config import settings
 
 def send_message_to_telegram(text: str):
@@ -7,12 +8,15 @@ def send_message_to_telegram(text: str):
     response = requests.post(url, data=data)
     return response.json()
 
-def send_image_to_telegram(image_path: str, caption: str = ""):
+def send_image_to_telegram(image: Union[str, BinaryIO], caption: str = ""):
+    """`image` es una ruta o un buffer en memoria (p.ej. el BytesIO de un reporte)"""
     url = f"https://api.telegram.org/bot{settings.TELEGRAM_BOT_TOKEN}/sendPhoto"
-    with open(image_path, "rb") as img:
-        files = {"photo": img}
-        data = {"chat_id": settings.TELEGRAM_CHAT_ID, "caption": caption}
-        response = requests.post(url, files=files, data=data)
+    data = {"chat_id": settings.TELEGRAM_CHAT_ID, "caption": caption}
+    if isinstance(image, str):
+        with open(image, "rb") as img:
+            response = requests.post(url, files={"photo": img}, data=data)
+    else:
+        response = requests.post(url, files={"photo": ("reporte.png", image)}, data=data)
     return response.json()
 
 # Nueva función para enviar mensaje de texto a un usuario por su chat_id
@@ -0,0 +1,12 @@
+import os
+from functools import lru_cache
+from PIL import ImageFont
+
+BASE_PATH = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_FONT_PATH = os.path.join(BASE_PATH, "ARIAL.TTF")
+
+
+@lru_cache(maxsize=None)
+def get_font(size: int, font_path: str = DEFAULT_FONT_PATH) -> ImageFont.FreeTypeFont:
+    """Registro de fuentes del proceso: cada (tamaño, ruta) se parsea una sola vez"""
+    return ImageFont.truetype(font_path, size)
@@ -1,40 +1,148 @@
-import matplotlib.pyplot as plt
-from PIL import Image, ImageDraw, ImageFont
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from PIL import Image, ImageDraw
+from io import BytesIO
+from .fonts import DEFAULT_FONT_PATH, get_font
+from .image_buffer import encode_image
 from .r_table import RTable
 from .r_line import RLine
 from .r_donut import ReportDonut, DonutValue
-from models.tiempo_despacho_resumen import TiempoDespachoResumen
-import os
+from .render_cache import RenderCache, default_render_cache
 import pandas as pd
 
-from typing import Optional
+from typing import Any, List, Optional, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
 
+WIDTH = 1920
+HEIGHT = 1080
+
+_template: Optional[Image.Image] = None
+_template_lock = threading.Lock()
+_line_renderer: Optional[RLine] = None
+
+
+def _build_template() -> Image.Image:
+    """Fondo con todo lo que no depende de los datos: títulos y marcos de paneles"""
+    img = Image.new("RGB", (WIDTH, HEIGHT), "white")
+    draw = ImageDraw.Draw(img)
+    font_title = get_font(30)
+    font_subtitle = get_font(24)
+    font_small = get_font(18)
+
+    draw.text(
+        (50, 40),
+        "Estado de vehículos",
+        fill="#3A3A3A",
+        font=font_title,
+    )
+    draw.text(
+        (550, 10),
+        "Actualizado 27/11/25 12:30",
+        fill="#555555",
+        font=font_small,
+    )
+
+    draw.rounded_rectangle(
+        [900, 500, 1600, 780],
+        radius=20,
+        fill="#F9FAFB",
+        outline="#E5E7EB",
+        width=2,
+    )
+    draw.text(
+        (920, 520),
+        "Pedidos del día",
+        fill="#555555",
+        font=font_title,
+    )
+    draw.text((920, 545), "27/11/25", fill="#999999", font=font_subtitle)
+
+    draw.rounded_rectangle(
+        [900, 800, 1600, 1050],
+        radius=20,
+        fill="#F9FAFB",
+        outline="#E5E7EB",
+        width=2,
+    )
+    draw.rounded_rectangle(
+        [1630, 470, 1910, 1050],
+        radius=20,
+        fill="#F9FAFB",
+        outline="#E5E7EB",
+        width=2,
+    )
+    return img
+
+
+def get_line_renderer() -> RLine:
+    """RLine compartido: su figura se reutiliza entre renders (tiene su propio lock)"""
+    global _line_renderer
+    if _line_renderer is None:
+        with _template_lock:
+            if _line_renderer is None:
+                _line_renderer = RLine(font_path=DEFAULT_FONT_PATH)
+    return _line_renderer
+
+
+def get_template() -> Image.Image:
+    """Plantilla compartida (se construye una vez); no modificar, usar `.copy()`"""
+    global _template
+    if _template is None:
+        with _template_lock:
+            if _template is None:
+                _template = _build_template()
+    return _template
+
 
 class GenerateDashboard:
-    def __init__(self):
-        self.base_path = os.path.dirname(os.path.abspath(__file__))
-        self.font_path = os.path.join(self.base_path, "ARIAL.ttf")
+    # Región (x0, y0, x1, y1) del lienzo que ocupa cada panel. Cada panel se
+    # rasteriza como un tile independiente y se cachea en `render_cache`:
+    # las regiones no se solapan y contienen todo lo que dibuja su panel
+    PANEL_REGIONS = {
+        "vehiculos": (0, 0, 900, 1080),
+        "carga_laboral": (900, 0, 1920, 450),
+        "pedidos_del_dia": (900, 500, 1630, 800),
+        "excepciones": (900, 800, 1630, 1080),
+        "tiempo_promedio": (1630, 450, 1920, 1080),
+    }
+    # Panel -> método que lo dibuja sobre su tile
+    PANEL_RENDERERS = {
+        "vehiculos": "_render_vehiculos",
+        "carga_laboral": "_render_carga_laboral",
+        "pedidos_del_dia": "_render_pedidos_del_dia",
+        "excepciones": "_render_excepciones",
+        "tiempo_promedio": "_render_tiempo_promedio",
+    }
+
+    def __init__(
+        self,
+        render_cache: Optional[RenderCache] = None,
+        render_workers: int = 0,
+    ):
+        """`render_workers` > 0 dibuja los paneles en un pool de procesos"""
+        self.render_cache = (
+            render_cache if render_cache is not None else default_render_cache
+        )
+        self.render_workers = render_workers
+        self.font_path = DEFAULT_FONT_PATH
 
-        self.WIDTH = 1920
-        self.HEIGHT = 1080
+        self.WIDTH = WIDTH
+        self.HEIGHT = HEIGHT
 
-        self.img = Image.new("RGB", (self.WIDTH, self.HEIGHT), "white")
+        # Cada render parte de la plantilla ya dibujada
+        self.img = get_template().copy()
         self.draw = ImageDraw.Draw(self.img)
 
-        self.font_title = ImageFont.truetype(self.font_path, 30)
-        self.font_subtitle = ImageFont.truetype(self.font_path, 24)
-        self.font_small = ImageFont.truetype(self.font_path, 18)
-        self.font_big = ImageFont.truetype(self.font_path, 48)
+        self.font_title = get_font(30)
+        self.font_subtitle = get_font(24)
+        self.font_small = get_font(18)
+        self.font_big = get_font(48)
 
-        self.draw.text(
-            (50, 40),
-            "Estado de vehículos",
-            fill="#3A3A3A",
-            font=self.font_title,
-        )
         self.vehiculos = [
             {
                 "placa": "BSR-797",
@@ -95,115 +203,218 @@ class GenerateDashboard:
         data_tiempo_promedio: Optional[pd.DataFrame] = None,
         data_exceptions: Optional[pd.DataFrame] = None,
         data_programados_del_dia: Optional[pd.DataFrame] = None,
-    ):
-        self.draw.text(
-            (550, 10),
-            "Actualizado 27/11/25 12:30",
-            fill="#555555",
-            font=self.font_small,
-        )
+        ruta_salida: Optional[str] = None,
+    ) -> Image.Image:
+        """Dibuja el dashboard; solo se escribe a disco si se pasa `ruta_salida`"""
+        panels = []
         if data_vehiculos:
-            tableReport = RTable(font_path=self.font_path)
-            tableReport.generate_table(self.draw, data_vehiculos)
-
+            panels.append(("vehiculos", data_vehiculos))
         if data_carga_laboral:
-            rLine = RLine(font_path=self.font_path)
-            rLine.generate_line(
-                self.img,
-                line_data=data_carga_laboral,
-                position=(900, 20),
-                title_x="Fecha",
-                title_y="Peso",
-            )
+            panels.append(("carga_laboral", data_carga_laboral))
+        if self._has_rows(data_programados_del_dia):
+            panels.append(("pedidos_del_dia", data_programados_del_dia))
+        if self._has_rows(data_exceptions):
+            panels.append(("excepciones", data_exceptions))
+        if self._has_rows(data_tiempo_promedio):
+            panels.append(("tiempo_promedio", data_tiempo_promedio))
+
+        self._paste_panels(panels)
+
+        if ruta_salida:
+            self.img.save(ruta_salida, quality=95)
+        return self.img
+
+    def to_buffer(self, format: str = "PNG") -> BytesIO:
+        """Dashboard codificado en memoria, listo para enviar sin pasar por disco"""
+        return encode_image(self.img, format=format)
+
+    @staticmethod
+    def _has_rows(df: Optional[pd.DataFrame]) -> bool:
+        return df is not None and not df.empty
+
+    def _paste_panels(self, panels: List[Tuple[str, Any]]) -> None:
+        """Pega el tile de cada panel, rasterizando solo los que no están en caché.
+
+        El tile es el recorte de la plantilla en la región del panel con el
+        panel dibujado encima; se guarda con una clave derivada de los datos y
+        de la región, así que con los mismos datos solo cuesta un `paste`.
+        """
+        tiles = {}
+        pending = []
+        for panel, data in panels:
+            key = self.render_cache.make_key(panel, self.PANEL_REGIONS[panel], data)
+            tile = self.render_cache.get(key)
+            if tile is None:
+                pending.append((panel, data, key))
+            else:
+                logger.debug(f"🧩 Panel {panel} servido desde caché")
+                tiles[panel] = tile
 
-        self.draw.rounded_rectangle(
-            [900, 500, 1600, 780],
-            radius=20,
-            fill="#F9FAFB",
-            outline="#E5E7EB",
-            width=2,
+        for (panel, _, key), tile in zip(pending, self._render_tiles(pending)):
+            self.render_cache.set(key, tile)
+            tiles[panel] = tile
+
+        for panel, _ in panels:
+            region = self.PANEL_REGIONS[panel]
+            self.img.paste(tiles[panel], (region[0], region[1]))
+
+    def _render_tiles(self, pending: List[Tuple[str, Any, str]]) -> List[Image.Image]:
+        """Rasteriza los tiles pendientes, en paralelo si `render_workers` > 0"""
+        if self.render_workers > 0 and len(pending) > 1:
+            try:
+                pool = get_render_pool(self.render_workers)
+                futures = [
+                    pool.submit(_render_tile_in_worker, panel, data)
+                    for panel, data, _ in pending
+                ]
+                return [future.result() for future in futures]
+            except BrokenProcessPool as e:
+                logger.warning(f"⚠️ Pool de render caído, se dibuja en serie: {e}")
+                shutdown_render_pool()
+        return [self.render_tile(panel, data) for panel, data, _ in pending]
+
+    def render_tile(self, panel: str, data: Any) -> Image.Image:
+        """Dibuja un panel sobre el recorte de la plantilla en su región"""
+        region = self.PANEL_REGIONS[panel]
+        tile = get_template().crop(region)
+        render = getattr(self, self.PANEL_RENDERERS[panel])
+        render(tile, data, (region[0], region[1]))
+        return tile
+
+    @staticmethod
+    def _at(x: int, y: int, origin: Tuple[int, int]) -> Tuple[int, int]:
+        """Coordenada del lienzo -> coordenada dentro del tile"""
+        return (x - origin[0], y - origin[1])
+
+    def _render_vehiculos(self, tile, data_vehiculos, origin) -> None:
+        # RTable dibuja en coordenadas absolutas: su región empieza en (0, 0)
+        tableReport = RTable(font_path=self.font_path)
+        tableReport.generate_table(ImageDraw.Draw(tile), data_vehiculos)
+
+    def _render_carga_laboral(self, tile, data_carga_laboral, origin) -> None:
+        get_line_renderer().generate_line(
+            tile,
+            line_data=data_carga_laboral,
+            position=self._at(900, 20, origin),
+            title_x="Fecha",
+            title_y="Peso",
         )
 
-        self.draw.text(
-            (920, 520),
-            "Pedidos del día",
+    def _render_pedidos_del_dia(self, tile, data_programados_del_dia, origin) -> None:
+        rr = ReportDonut(font_path=self.font_path)
+        rr.donut_horizontal(
+            tile,
+            ImageDraw.Draw(tile),
+            [
+                DonutValue(value=1, label="Libres"),
+                DonutValue(value=5, label="En comisión"),
+                DonutValue(value=2, label="En ruta"),
+            ],
+            self._at(900, 550, origin),
+        )
+
+    def _render_excepciones(self, tile, data_exceptions, origin) -> None:
+        draw = ImageDraw.Draw(tile)
+        draw.text(
+            self._at(1130, 810, origin),
+            "Excepciones del mes",
             fill="#555555",
             font=self.font_title,
         )
-        self.draw.text((920, 545), "27/11/25", fill="#999999", font=self.font_subtitle)
-        rr = ReportDonut(font_path=self.font_path)
-        if not data_programados_del_dia.empty:
-            logger.info(data_programados_del_dia)
-            rr.donut_horizontal(
-                self.img,
-                self.draw,
-                [
-                    DonutValue(value=1, label="Libres"),
-                    DonutValue(value=5, label="En comisión"),
-                    DonutValue(value=2, label="En ruta"),
-                ],
-                (900, 550),
+        values = [
+            DonutValue(
+                value=row["count"],
+                label=row["doc_excep"],
             )
-
-        self.draw.rounded_rectangle(
-            [900, 800, 1600, 1050],
-            radius=20,
-            fill="#F9FAFB",
-            outline="#E5E7EB",
-            width=2,
+            for _, row in data_exceptions.iterrows()
+        ]
+        rr = ReportDonut(font_path=self.font_path)
+        rr.donut_horizontal(
+            img=tile,
+            draw=draw,
+            values=values,
+            position=self._at(900, 800, origin),
         )
 
-        if not data_exceptions.empty:
-            self.draw.text(
-                (1130, 810),
-                "Excepciones del mes",
-                fill="#555555",
-                font=self.font_title,
-            )
-            values = [
-                DonutValue(
-                    value=row["count"],
-                    label=row["doc_excep"],
-                )
-                for _, row in data_exceptions.iterrows()
-            ]
-            rr.donut_horizontal(
-                img=self.img,
-                draw=self.draw,
-                values=values,
-                position=(900, 800),
-            )
+    def _render_tiempo_promedio(self, tile, data_tiempo_promedio, origin) -> None:
+        # agrupa por promedio_plazo_hrs y suma por cantidad_registros luego convertir a DonutValue
+        grouped = data_tiempo_promedio.groupby(
+            "promedio_plazo_hrs", as_index=False
+        )["cantidad_registros"].sum()
 
-        self.draw.rounded_rectangle(
-            [1630, 470, 1910, 1050],
-            radius=20,
-            fill="#F9FAFB",
-            outline="#E5E7EB",
-            width=2,
+        values = [
+            DonutValue(
+                value=row["cantidad_registros"],
+                label=(
+                    "Otros"
+                    if row["promedio_plazo_hrs"] == 0
+                    else f"{int(row['promedio_plazo_hrs'])} Horas"
+                ),
+            )
+            for _, row in grouped.iterrows()
+        ]
+        rr = ReportDonut(font_path=self.font_path)
+        rr.donut_vertical(
+            img=tile,
+            draw=ImageDraw.Draw(tile),
+            values=values,
+            position=self._at(1630, 450, origin),
         )
 
-        if not data_tiempo_promedio.empty:
-            # agrupa por promedio_plazo_hrs y suma por cantidad_registros luego convertir a DonutValue
-            grouped = data_tiempo_promedio.groupby(
-                "promedio_plazo_hrs", as_index=False
-            )["cantidad_registros"].sum()
-
-            values = [
-                DonutValue(
-                    value=row["cantidad_registros"],
-                    label=(
-                        "Otros"
-                        if row["promedio_plazo_hrs"] == 0
-                        else f"{int(row['promedio_plazo_hrs'])} Horas"
-                    ),
-                )
-                for _, row in grouped.iterrows()
-            ]
-            rr.donut_vertical(
-                img=self.img,
-                draw=self.draw,
-                values=values,
-                position=(1630, 450),
+
+# ==================== Pool de render ====================
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+_worker_dashboard: Optional[GenerateDashboard] = None
+
+# Tamaños usados por el dashboard, la tabla y los donuts
+_PRELOAD_FONT_SIZES = (12, 16, 18, 20, 22, 24, 28, 30, 48)
+
+
+def _init_render_worker() -> None:
+    """Deja el worker caliente: figura de RLine dibujada, fuentes y plantilla cargadas"""
+    global _worker_dashboard
+    # un primer draw carga el font manager de matplotlib y el backend Agg
+    get_line_renderer().canvas.draw()
+
+    for size in _PRELOAD_FONT_SIZES:
+        get_font(size)
+    # sin caché propia: los tiles se cachean en el proceso padre
+    _worker_dashboard = GenerateDashboard(render_cache=RenderCache(max_bytes=0))
+
+
+def _render_tile_in_worker(panel: str, data: Any) -> Image.Image:
+    return _worker_dashboard.render_tile(panel, data)
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+def get_render_pool(workers: int) -> ProcessPoolExecutor:
+    """Pool compartido por el proceso; los workers se arrancan de una vez"""
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is None or _pool_workers != workers:
+            if _pool is not None:
+                _pool.shutdown(wait=False, cancel_futures=True)
+            # spawn: los workers no heredan hilos ni sockets del bot/servidor
+            _pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_render_worker,
             )
+            _pool_workers = workers
+            pids = {f.result() for f in [_pool.submit(_ping) for _ in range(workers)]}
+            logger.info(f"🏭 Pool de render listo con {len(pids)} workers")
+        return _pool
+
 
-        self.img.save("dashboard_1920x1080.png", quality=95)
+def shutdown_render_pool() -> None:
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+        _pool_workers = 0
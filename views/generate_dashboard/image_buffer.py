@@ -0,0 +1,10 @@
+from io import BytesIO
+from PIL import Image
+
+
+def encode_image(image: Image.Image, format: str = "PNG", **params) -> BytesIO:
+    """Codifica la imagen en memoria; el buffer queda posicionado al inicio"""
+    buffer = BytesIO()
+    image.save(buffer, format=format, **params)
+    buffer.seek(0)
+    return buffer
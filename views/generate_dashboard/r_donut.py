@@ -1,11 +1,10 @@
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from typing import Tuple, List
-import matplotlib.pyplot as plt
 from PIL import Image, ImageDraw, ImageFont
 import os
-import random
 from utils.palette_colors import PaletteColors, TypePalette
+from .fonts import DEFAULT_FONT_PATH, get_font
 
 
 # ==================== Value Objects ====================
@@ -48,50 +47,77 @@ class FontProvider:
     
     def __init__(self, font_name: str):
         self.base_path = os.path.dirname(os.path.abspath(__file__))
-        self.font_path = os.path.join(self.base_path, font_name) if font_name else os.path.join(self.base_path, "ARIAL.ttf")
-        self._cache = {}
+        self.font_path = os.path.join(self.base_path, font_name) if font_name else DEFAULT_FONT_PATH
 
     def get_font(self, size: int) -> ImageFont.FreeTypeFont:
-        """Obtiene una fuente con caché"""
-        if size not in self._cache:
-            self._cache[size] = ImageFont.truetype(self.font_path, size)
-        return self._cache[size]
+        """Obtiene una fuente del registro compartido del proceso"""
+        return get_font(size, self.font_path)
 
 
 class ChartGenerator:
-    """SRP: Responsable únicamente de generar gráficos matplotlib"""
-    
-    @staticmethod
+    """SRP: Responsable únicamente de generar gráficos (en memoria, con PIL)"""
+
+    # Misma geometría que el PNG de matplotlib (figsize 3x3, dpi 100, bbox
+    # tight) que se usaba antes, para no mover el layout del dashboard
+    SIZE = 251
+    RADIUS = 92.4
+    RING_WIDTH = 0.30
+    SUPERSAMPLE = 4
+    EMPTY_COLOR = "#E5E7EB"
+
+    @classmethod
     def generate_donut_chart(
+        cls,
         values: List[float],
         colors: List[str],
-        size: Tuple[int, int] = (4, 4)
-    ) -> str:
-        """Genera un gráfico de donut y retorna el nombre del archivo"""
-        filename = f"donut_{random.randint(1, 100000)}.png"
-        
-        fig, ax = plt.subplots(figsize=size, dpi=100)
-        ax.pie(values, colors=colors, wedgeprops={"width": 0.30}, startangle=90)
-        ax.set(aspect="equal")
-        plt.savefig(filename, transparent=True, bbox_inches="tight")
-        plt.close()
-        
-        return filename
+        size: int = SIZE,
+        radius: float = RADIUS,
+    ) -> Image.Image:
+        """Genera un donut RGBA con fondo transparente.
 
+        Las porciones empiezan a las 12 en sentido antihorario (como
+        ``ax.pie(startangle=90)``). Se dibuja a ``SUPERSAMPLE`` veces el tamaño
+        y se reduce para suavizar los bordes: los colores van en una capa RGB
+        y la forma del anillo en una máscara que se usa como canal alfa.
+        """
+        if any(v < 0 for v in values):
+            raise ValueError("Los valores del donut no pueden ser negativos")
 
-class FileManager:
-    """SRP: Responsable únicamente de operaciones de archivo"""
-    
-    @staticmethod
-    def load_image(filepath: str) -> Image.Image:
-        """Carga una imagen"""
-        return Image.open(filepath)
-    
-    @staticmethod
-    def delete_file(filepath: str) -> None:
-        """Elimina un archivo de forma segura"""
-        if os.path.exists(filepath):
-            os.remove(filepath)
+        scale = cls.SUPERSAMPLE
+        big_size = (size * scale, size * scale)
+        center = size * scale / 2
+
+        def circle(r: float) -> List[float]:
+            return [center - r, center - r, center + r, center + r]
+
+        outer = radius * scale
+        inner = outer * (1 - cls.RING_WIDTH)
+
+        # Las porciones se dibujan más grandes que el anillo: el borde lo
+        # define la máscara y así no se mezclan con el fondo al reducir
+        color_layer = Image.new("RGB", big_size, cls.EMPTY_COLOR)
+        draw = ImageDraw.Draw(color_layer)
+        total = float(sum(values))
+        if total > 0:
+            # PIL mide los ángulos en sentido horario desde las 3: la porción
+            # [a, b] antihoraria desde las 12 es [-90 - b, -90 - a]
+            acumulado = 0.0
+            for value, color in zip(values, colors):
+                inicio = acumulado
+                acumulado += value / total * 360
+                if value > 0:
+                    draw.pieslice(
+                        circle(outer + scale), -90 - acumulado, -90 - inicio, fill=color
+                    )
+
+        mask = Image.new("L", big_size, 0)
+        mask_draw = ImageDraw.Draw(mask)
+        mask_draw.ellipse(circle(outer), fill=255)
+        mask_draw.ellipse(circle(inner), fill=0)
+
+        donut = color_layer.reduce(scale)
+        donut.putalpha(mask.reduce(scale))
+        return donut
 
 
 class TextMeasurer:
@@ -274,12 +300,10 @@ class DonutChartBuilder:
     def __init__(
         self,
         font_provider: FontProvider,
-        chart_generator: ChartGenerator,
-        file_manager: FileManager
+        chart_generator: ChartGenerator
     ):
         self.font_provider = font_provider
         self.chart_generator = chart_generator
-        self.file_manager = file_manager
     
     def _create_indicators(
         self,
@@ -338,29 +362,17 @@ class DonutChartBuilder:
         )
         values_list = [v.value for v in values]
         
-        # Generar gráfico
-        chart_file = self.chart_generator.generate_donut_chart(
-            values_list,
-            colors,
-            size=(3, 3)
-        )
-        
-        try:
-            # Cargar y pegar donut
-            donut_img = self.file_manager.load_image(chart_file)
-            img.paste(donut_img, position.as_tuple(), donut_img)
-            
-            # Dibujar total en el centro
-            self._draw_center_total(draw, sum(values_list), position)
-            
-            # Crear y renderizar indicadores
-            indicators = self._create_indicators(values, colors)
-            indicator_pos = position.offset(*indicators_offset)
-            renderer.render(draw, indicators, indicator_pos)
-            
-        finally:
-            # Limpiar archivo temporal
-            self.file_manager.delete_file(chart_file)
+        # Generar y pegar donut
+        donut_img = self.chart_generator.generate_donut_chart(values_list, colors)
+        img.paste(donut_img, position.as_tuple(), donut_img)
+
+        # Dibujar total en el centro
+        self._draw_center_total(draw, sum(values_list), position)
+
+        # Crear y renderizar indicadores
+        indicators = self._create_indicators(values, colors)
+        indicator_pos = position.offset(*indicators_offset)
+        renderer.render(draw, indicators, indicator_pos)
 
 
 # ==================== API Pública ====================
@@ -372,11 +384,9 @@ class ReportDonut:
     def __init__(self, font_path: str):
         self.font_provider = FontProvider(font_path)
         self.chart_generator = ChartGenerator()
-        self.file_manager = FileManager()
         self.builder = DonutChartBuilder(
             self.font_provider,
-            self.chart_generator,
-            self.file_manager
+            self.chart_generator
         )
     
     def donut_horizontal(
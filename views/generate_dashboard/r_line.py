@@ -1,130 +1,86 @@
 from typing import List, Dict, Tuple
-import matplotlib.pyplot as plt
+import threading
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
 from PIL import Image
 from utils.utils import kg_a_toneladas
 import matplotlib.dates as mdates
 import datetime as dt
-import io
 
 
 class RLine:
+    """
+    Gráfico de línea de carga laboral.
+
+    La figura, los ejes y sus artistas se crean una sola vez por instancia
+    (API orientada a objetos + canvas Agg, sin el estado global de pyplot).
+    Cada render solo actualiza los datos con `set_data` y copia el buffer
+    RGBA de tamaño fijo; un lock por instancia la hace segura entre hilos.
+    """
+
+    # Tamaño de salida (px) y márgenes fijos del área de ejes, equivalentes
+    # al PNG con bbox tight que se generaba antes (15x7 pulgadas a 72 dpi)
+    WIDTH = 1011
+    HEIGHT = 435
+    DPI = 72
+    MARGINS = dict(left=0.09, right=0.93, bottom=0.135, top=0.90)
+
+    VERDE_OSCURO = "#22C55E"  # Verde principal
+    VERDE_CLARO = "#86EFAC"
+    NARANJA_SUAVE = "#FDBA74"
+    ROJO_SUAVE = "#FCA5A5"
+    GRIS_FONDO = "#F9FAFB"
+    TEXTO_SECUNDARIO = "#6B7280"
+
     def __init__(self, font_path: str):
         self.font_path = font_path
+        self._lock = threading.Lock()
 
-    def generate_line(
-        self,
-        img: Image,
-        line_data: List[Dict[float, dt.datetime]],
-        position: Tuple[int, int] = (10, 80),
-        title_x: str = "",
-        title_y: str = "",
-        meta_alta: int = 0,
-        meta_media: int = 0,
-    ):
-        # Líneas objetivo
-
-        verde_oscuro = "#22C55E"  # Verde principal
-        verde_claro = "#86EFAC"
-        amarillo_claro = "#FEF08A"
-        naranja_suave = "#FDBA74"
-        rojo_suave = "#FCA5A5"
-        gris_fondo = "#F9FAFB"
-        texto_principal = "#1F2937"
-        texto_secundario = "#6B7280"
-
-        plt.rcParams.update(
-            {
-                "font.family": "Segoe UI",  # o 'Inter', 'SF Pro', 'Arial'
-                "font.size": 14,
-            }
+        self.fig = Figure(
+            figsize=(self.WIDTH / self.DPI, self.HEIGHT / self.DPI),
+            dpi=self.DPI,
+            facecolor="#FFFFFF",
         )
-
-        fig, ax = plt.subplots(figsize=(15, 7))
-        fig.patch.set_facecolor("#FFFFFF")
-        ax.set_facecolor(gris_fondo)
-
-        fechas = [item["fecha"] for item in line_data]
-        pesos = [item["peso"] for item in line_data]
-
-        # Línea principal con degradado visual
-        line = ax.plot(
-            fechas,
-            pesos,
-            color=verde_oscuro,
-            linewidth=4.5,
-            marker="o",
-            markersize=6,
-            markerfacecolor=verde_claro,
-            markeredgecolor=verde_oscuro,
-            markeredgewidth=2,
+        self.canvas = FigureCanvasAgg(self.fig)
+        self.fig.subplots_adjust(**self.MARGINS)
+        self.ax = self.fig.add_subplot()
+        self._style_axes()
+
+        # Los artistas con datos se crean en el primer render (el eje X
+        # necesita fechas para registrar sus unidades)
+        self._line = None
+        self._area = None
+        self._metas = {
+            "alta": self._create_meta(self.ROJO_SUAVE, "#DC2626", "Meta Alta: "),
+            "media": self._create_meta(self.NARANJA_SUAVE, "#F97316", "Meta Media: "),
+        }
+        self._valor_actual = self.ax.annotate(
+            "",
+            xy=(0, 0),
+            xytext=(10, 15),
+            textcoords="offset points",
+            fontsize=14,
+            fontweight="bold",
+            color=self.VERDE_OSCURO,
+            bbox=dict(
+                boxstyle="round,pad=0.5",
+                facecolor=self.VERDE_CLARO,
+                alpha=0.9,
+                edgecolor=self.VERDE_OSCURO,
+            ),
+            visible=False,
         )
 
-        # Área bajo la curva
-        ax.fill_between(fechas, pesos, alpha=0.18, color=verde_oscuro)
-
-        # Líneas de referencia
-        if meta_alta > 0:
-            ax.axhline(
-                meta_alta,
-                color=rojo_suave,
-                linewidth=2.5,
-                alpha=0.8,
-                linestyle="--",
-            )
-            ax.text(
-                fechas[0],
-                meta_alta + 600,
-                "Meta Alta: " + kg_a_toneladas(meta_alta),
-                color="#DC2626",
-                fontsize=11,
-                fontweight="bold",
-            )
-            
-        if meta_media > 0:
-            ax.axhline(
-                meta_media,
-                color=naranja_suave,
-                linewidth=2.5,
-                alpha=0.8,
-                linestyle="--",
-            )
-            ax.text(
-                fechas[0],
-                meta_media + 600,
-                "Meta Media: " + kg_a_toneladas(meta_media),
-                color="#F97316",
-                fontsize=11,
-                fontweight="bold",
-            )
-
-        # # Título grande y limpio
-        # ax.set_title(
-        #     "CARGA LABORAL POR TONELADAS",
-        #     fontsize=18,
-        #     fontweight="bold",
-        #     color=texto_principal,
-        #     pad=30,
-        # )
-
-        # Etiquetas
-        ax.set_ylabel(
-            title_y,
-            fontsize=16,
-            color=texto_secundario,
-            labelpad=15,
-        )
-        ax.set_xlabel(
-            title_x,
-            fontsize=16,
-            color=texto_secundario,
-            labelpad=15,
-        )
+    def _style_axes(self) -> None:
+        """Estilo fijo de ejes, spines y grid (se aplica una vez)"""
+        ax = self.ax
+        ax.set_facecolor(self.GRIS_FONDO)
 
         # Formato del eje X (día + mes abreviado)
         ax.xaxis.set_major_formatter(mdates.DateFormatter("%d %b"))
         ax.xaxis.set_major_locator(mdates.DayLocator(interval=2))
-        ax.tick_params(axis="x", which="major", labelsize=14, colors=texto_secundario)
-        ax.tick_params(axis="y", which="major", labelsize=14, colors=texto_secundario)
+        ax.tick_params(axis="x", which="major", labelsize=14, colors=self.TEXTO_SECUNDARIO)
+        ax.tick_params(axis="y", which="major", labelsize=14, colors=self.TEXTO_SECUNDARIO)
 
         # Quitar bordes superiores y derechos (estilo moderno)
         ax.spines["top"].set_visible(False)
@@ -136,40 +92,109 @@ class RLine:
         ax.grid(True, color="white", linewidth=1.5, alpha=0.7)
         ax.set_axisbelow(True)
 
-        # Valor actual destacado
-        ultimo_peso = pesos[-1]
-        ultimo_fecha = fechas[-1]
-        ax.annotate(
-            kg_a_toneladas(ultimo_peso),
-            xy=(ultimo_fecha, ultimo_peso),
-            xytext=(10, 15),
-            textcoords="offset points",
-            fontsize=14,
+    def _create_meta(self, color: str, text_color: str, prefix: str) -> dict:
+        """Línea de referencia + etiqueta, ocultas hasta que se use la meta"""
+        line = self.ax.axhline(
+            0,
+            color=color,
+            linewidth=2.5,
+            alpha=0.8,
+            linestyle="--",
+            visible=False,
+        )
+        text = self.ax.text(
+            0,
+            0,
+            "",
+            color=text_color,
+            fontsize=11,
             fontweight="bold",
-            color=verde_oscuro,
-            bbox=dict(
-                boxstyle="round,pad=0.5",
-                facecolor=verde_claro,
-                alpha=0.9,
-                edgecolor=verde_oscuro,
-            ),
+            visible=False,
         )
+        return {"line": line, "text": text, "prefix": prefix}
+
+    def _update_meta(self, name: str, valor: int, fecha_inicio: dt.datetime) -> None:
+        meta = self._metas[name]
+        visible = valor > 0
+        meta["line"].set_visible(visible)
+        meta["text"].set_visible(visible)
+        if visible:
+            meta["line"].set_ydata([valor, valor])
+            meta["text"].set_position((mdates.date2num(fecha_inicio), valor + 600))
+            meta["text"].set_text(meta["prefix"] + kg_a_toneladas(valor))
+
+    def _update_series(self, fechas: List[dt.datetime], pesos: List[float]) -> None:
+        if self._line is None:
+            # Línea principal
+            (self._line,) = self.ax.plot(
+                fechas,
+                pesos,
+                color=self.VERDE_OSCURO,
+                linewidth=4.5,
+                marker="o",
+                markersize=6,
+                markerfacecolor=self.VERDE_CLARO,
+                markeredgecolor=self.VERDE_OSCURO,
+                markeredgewidth=2,
+            )
+            # Área bajo la curva
+            self._area = self.ax.fill_between(
+                fechas, pesos, alpha=0.18, color=self.VERDE_OSCURO
+            )
+        else:
+            self._line.set_data(fechas, pesos)
+            self._area.set_data(fechas, pesos, 0)
 
-        # Ajustes finales
-        plt.tight_layout(pad=3.0)
+    def _rescale(self, fechas: List[dt.datetime]) -> None:
+        """Recalcula límites: línea y metas visibles más la base del área (y=0)"""
+        self.ax.relim(visible_only=True)
+        self.ax.update_datalim([(mdates.date2num(fechas[0]), 0)])
+        self.ax.autoscale_view()
 
-        # Guardar con alta calidad
+    def generate_line(
+        self,
+        img: Image,
+        line_data: List[Dict[float, dt.datetime]],
+        position: Tuple[int, int] = (10, 80),
+        title_x: str = "",
+        title_y: str = "",
+        meta_alta: int = 0,
+        meta_media: int = 0,
+    ):
+        fechas = [item["fecha"] for item in line_data]
+        pesos = [item["peso"] for item in line_data]
+
+        with self._lock:
+            self._update_series(fechas, pesos)
+
+            # Líneas de referencia
+            self._update_meta("alta", meta_alta, fechas[0])
+            self._update_meta("media", meta_media, fechas[0])
+
+            # Etiquetas
+            self.ax.set_ylabel(
+                title_y,
+                fontsize=16,
+                color=self.TEXTO_SECUNDARIO,
+                labelpad=15,
+            )
+            self.ax.set_xlabel(
+                title_x,
+                fontsize=16,
+                color=self.TEXTO_SECUNDARIO,
+                labelpad=15,
+            )
+
+            # Valor actual destacado
+            self._valor_actual.set_text(kg_a_toneladas(pesos[-1]))
+            self._valor_actual.xy = (fechas[-1], pesos[-1])
+            self._valor_actual.set_visible(True)
+
+            self._rescale(fechas)
+            self.canvas.draw()
+            # copia del buffer antes de soltar el lock (el siguiente render lo reutiliza)
+            plot_image = Image.frombuffer(
+                "RGBA", self.canvas.get_width_height(), self.canvas.buffer_rgba()
+            ).convert("RGB")
 
-        buf = io.BytesIO()
-        plt.savefig(
-            buf,
-            format="png",
-            dpi=72,
-            bbox_inches="tight",
-            facecolor="#FFFFFF",
-            edgecolor="none",
-        )
-        buf.seek(0)
-        plot_image = Image.open(buf)
         img.paste(plot_image, position)
-        plt.close(fig)
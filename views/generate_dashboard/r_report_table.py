@@ -0,0 +1,149 @@
+import os
+from dataclasses import dataclass
+from typing import List, Sequence
+import matplotlib
+from PIL import Image, ImageDraw
+from .fonts import get_font
+
+# DejaVu Sans (incluida en matplotlib) tiene los glifos ✓ y ◔; Arial no
+_MPL_FONTS = os.path.join(matplotlib.get_data_path(), "fonts", "ttf")
+FONT_REGULAR = os.path.join(_MPL_FONTS, "DejaVuSans.ttf")
+FONT_BOLD = os.path.join(_MPL_FONTS, "DejaVuSans-Bold.ttf")
+
+
+class RowKind:
+    DETALLE = "detalle"
+    SUBTOTAL = "subtotal"
+    SEPARADOR = "separador"
+    TOTAL = "total"
+
+
+@dataclass(frozen=True)
+class ReportTable:
+    """Tabla ya armada: encabezados, filas de texto y tipo de cada fila"""
+
+    columns: Sequence[str]
+    rows: Sequence[Sequence[str]]
+    kinds: Sequence[str]
+    # "left" | "right" | "center" por columna (filas de datos / encabezado)
+    align: Sequence[str]
+    header_align: Sequence[str]
+
+
+class RReportTable:
+    """
+    Renderiza una tabla de reporte con PIL, paginada en imágenes de a lo más
+    `rows_per_page` filas (el encabezado se repite en cada página). Los anchos
+    de columna se calculan una vez para todas las páginas.
+    """
+
+    COLORS = {
+        "header_bg": "#3b3b3b",
+        "header_text": "#FFFFFF",
+        "text": "#000000",
+        "highlight_bg": "#e0e0e0",
+        "grid": "#e0e0e0",
+        "page": "#777777",
+    }
+
+    def __init__(
+        self,
+        rows_per_page: int = 40,
+        font_size: int = 22,
+        row_height: int = 40,
+        padding: int = 12,
+        margin: int = 20,
+    ):
+        if rows_per_page < 1:
+            raise ValueError("rows_per_page debe ser >= 1")
+        self.rows_per_page = rows_per_page
+        self.row_height = row_height
+        self.padding = padding
+        self.margin = margin
+        self.font = get_font(font_size, FONT_REGULAR)
+        self.font_bold = get_font(font_size, FONT_BOLD)
+        self.font_page = get_font(max(font_size - 6, 10), FONT_REGULAR)
+
+    def paginate(self, table: ReportTable) -> List[List[int]]:
+        """Índices de fila por página; un separador no abre una página"""
+        pages: List[List[int]] = []
+        current: List[int] = []
+        for i, kind in enumerate(table.kinds):
+            if kind == RowKind.SEPARADOR and not current:
+                continue
+            current.append(i)
+            if len(current) == self.rows_per_page:
+                pages.append(current)
+                current = []
+        if current:
+            pages.append(current)
+        return pages or [[]]
+
+    def column_widths(self, table: ReportTable) -> List[int]:
+        widths = []
+        for col, header in enumerate(table.columns):
+            # valores distintos: en reportes grandes se repiten mucho (placas, choferes)
+            values = {row[col] for row in table.rows}
+            width = max(
+                [self.font_bold.getlength(header)]
+                + [self.font_bold.getlength(v) for v in values]
+            )
+            widths.append(int(width) + 2 * self.padding)
+        return widths
+
+    def render(self, table: ReportTable) -> List[Image.Image]:
+        widths = self.column_widths(table)
+        pages = self.paginate(table)
+        total_width = sum(widths) + 2 * self.margin
+        footer = self.row_height if len(pages) > 1 else 0
+
+        images = []
+        for number, indices in enumerate(pages, start=1):
+            height = (len(indices) + 1) * self.row_height + 2 * self.margin + footer
+            # todos los colores son grises: en modo L el PNG pesa y tarda la mitad
+            img = Image.new("L", (total_width, height), "white")
+            draw = ImageDraw.Draw(img)
+
+            y = self.margin
+            self._draw_row(
+                draw, y, widths, table.columns, table.header_align,
+                self.font_bold, self.COLORS["header_text"], self.COLORS["header_bg"],
+            )
+            for i in indices:
+                y += self.row_height
+                highlight = table.kinds[i] in (RowKind.SUBTOTAL, RowKind.TOTAL)
+                self._draw_row(
+                    draw, y, widths, table.rows[i], table.align,
+                    self.font_bold if highlight else self.font,
+                    self.COLORS["text"],
+                    self.COLORS["highlight_bg"] if highlight else None,
+                )
+
+            if footer:
+                draw.text(
+                    (total_width - self.margin, height - self.margin - footer / 2),
+                    f"Página {number} de {len(pages)}",
+                    fill=self.COLORS["page"],
+                    font=self.font_page,
+                    anchor="rm",
+                )
+            images.append(img)
+        return images
+
+    def _draw_row(self, draw, y, widths, values, align, font, color, background) -> None:
+        x = self.margin
+        middle = y + self.row_height / 2
+        for width, value, how in zip(widths, values, align):
+            box = [x, y, x + width, y + self.row_height]
+            if background:
+                draw.rectangle(box, fill=background)
+            draw.rectangle(box, outline=self.COLORS["grid"], width=1)
+            if value:
+                if how == "right":
+                    pos, anchor = (x + width - self.padding, middle), "rm"
+                elif how == "center":
+                    pos, anchor = (x + width / 2, middle), "mm"
+                else:
+                    pos, anchor = (x + self.padding, middle), "lm"
+                draw.text(pos, value, fill=color, font=font, anchor=anchor)
+            x += width
@@ -1,8 +1,8 @@
 from typing import List
-import matplotlib.pyplot as plt
 from PIL import Image, ImageDraw, ImageFont
 import numpy as np
 from utils.utils import  kg_a_toneladas
+from .fonts import get_font
  
 class RTable:
     def __init__(self, font_path: str):
@@ -26,10 +26,10 @@ class RTable:
             "En mantenimiento": self.COLORS["en_mantenimiento"],
         }
 
-        self.font_title = ImageFont.truetype(font_path, 24)
-        self.font_normal = ImageFont.truetype(font_path, 20)
-        self.font_badge = ImageFont.truetype(font_path, 16)
-        self.font_small = ImageFont.truetype(font_path, 12)
+        self.font_title = get_font(24, font_path)
+        self.font_normal = get_font(20, font_path)
+        self.font_badge = get_font(16, font_path)
+        self.font_small = get_font(12, font_path)
 
     def generate_table(self, 
     draw: ImageDraw,
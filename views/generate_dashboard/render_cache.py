@@ -0,0 +1,90 @@
+import hashlib
+import json
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+
+import pandas as pd
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+
+class RenderCache:
+    """
+    Caché LRU en memoria de tiles ya rasterizados del dashboard, acotada por
+    tamaño en bytes. La clave se deriva del contenido (datos + parámetros de
+    layout), así que no necesita TTL: si los datos cambian, cambia la clave.
+    Thread-safe.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # key -> (imagen, bytes)
+        self._entries: "OrderedDict[str, Tuple[Image.Image, int]]" = OrderedDict()
+        self._bytes = 0
+
+    @classmethod
+    def make_key(cls, panel: str, *parts: Any) -> str:
+        """Clave estable: nombre del panel + huella de cada parte"""
+        digest = hashlib.sha256(panel.encode("utf-8"))
+        for part in parts:
+            digest.update(b"|")
+            digest.update(cls._fingerprint(part))
+        return digest.hexdigest()
+
+    @staticmethod
+    def _fingerprint(part: Any) -> bytes:
+        if isinstance(part, pd.DataFrame):
+            # hash por fila (valores + índice) más el esquema
+            rows = pd.util.hash_pandas_object(part, index=True).to_numpy()
+            schema = json.dumps([[str(c), str(t)] for c, t in part.dtypes.items()])
+            return schema.encode("utf-8") + rows.tobytes()
+        return json.dumps(part, sort_keys=True, default=str).encode("utf-8")
+
+    @staticmethod
+    def size_of(image: Image.Image) -> int:
+        return image.width * image.height * len(image.getbands())
+
+    @property
+    def current_bytes(self) -> int:
+        return self._bytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[Image.Image]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def set(self, key: str, image: Image.Image) -> None:
+        size = self.size_of(image)
+        if size > self.max_bytes:
+            logger.info(f"Tile de {size} bytes excede la caché, no se guarda")
+            return
+        with self._lock:
+            if key in self._entries:
+                self._pop(key)
+            self._entries[key] = (image, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                self._pop(next(iter(self._entries)))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def _pop(self, key: str) -> None:
+        _, size = self._entries.pop(key)
+        self._bytes -= size
+
+
+# Instancia compartida por el proceso: los tiles sobreviven entre dashboards
+default_render_cache = RenderCache()